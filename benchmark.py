@@ -0,0 +1,1101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+인쇄 자동화 성능 측정 도구
+처리 단계별로 방식에 따른 소요 시간과 결과 파일 크기를 비교
+
+사용법:
+  python benchmark.py normalize [PDF파일들...] [--repeat N]
+  python benchmark.py pixbridge [PDF파일들...] [--repeat N]
+  python benchmark.py blank [PDF파일들...] [--repeat N]
+  python benchmark.py overlay [썸네일PDF] [--repeat N]
+  python benchmark.py resources [썸네일PDF] [--repeat N]
+  python benchmark.py proxy [인쇄데이터PDF들...] [--repeat N]
+  python benchmark.py thumbsource [인쇄데이터PDF들...] [--repeat N]
+  python benchmark.py thumbrender [인쇄데이터PDF들...] [--repeat N]
+  python benchmark.py contactsheet [여러페이지PDF들...] [--repeat N]
+  python benchmark.py effects [인쇄데이터PDF들...] [--repeat N]
+  python benchmark.py qr [QR이미지들...] [--repeat N]
+  python benchmark.py qrgen [의뢰서PDF들...] [--repeat N]
+  python benchmark.py raster [의뢰서PDF] [--repeat N]
+  python benchmark.py rasterenc [PDF파일들...] [--repeat N]
+  python benchmark.py fused [의뢰서PDF들...] [--repeat N]
+  python benchmark.py save [의뢰서PDF들...] [--repeat N]
+  python benchmark.py output [의뢰서PDF들...] [--repeat N]
+
+PDF 파일을 지정하지 않으면 테스트용 의뢰서(세로형/가로형/회전)를 만들어 사용
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def make_sample_pdfs(folder, pages=3):
+    """측정용 의뢰서 PDF 생성 (세로형, 가로형, 회전된 세로형)"""
+    import fitz
+
+    samples = []
+    for name, width, height, rotation in [
+        ('portrait', 595, 842, 0),
+        ('landscape', 842, 595, 0),
+        ('rotated', 595, 842, 90),
+    ]:
+        doc = fitz.open()
+        for page_num in range(pages):
+            page = doc.new_page(width=width, height=height)
+            page.draw_rect(fitz.Rect(30, 30, width - 30, 200), color=(0, 0, 0), width=1)
+            page.insert_text((45, 70), f"ORDER FORM {name} {page_num + 1}", fontsize=20)
+            for line in range(25):
+                page.insert_text((45, 230 + line * 18),
+                                 "line of text " * 6, fontsize=8)
+            # 래스터 이미지 하나 (사진이 붙은 의뢰서 흉내)
+            pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 200, 150), False)
+            pix.set_rect(pix.irect, (200, 120, 60))
+            page.insert_image(fitz.Rect(width - 230, 40, width - 40, 180), pixmap=pix)
+            if rotation:
+                page.set_rotation(rotation)
+        path = os.path.join(folder, f"sample_{name}_의뢰서.pdf")
+        doc.save(path)
+        doc.close()
+        samples.append(path)
+    return samples
+
+
+def _timed(func, repeat):
+    """repeat회 실행한 최소 시간과 마지막 결과 반환"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _page_difference(doc_a, doc_b, zoom=0.5):
+    """두 문서의 첫 페이지 렌더링 결과 평균 픽셀 차이 (0~255)"""
+    import fitz
+
+    pa = doc_a[0].get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY)
+    pb = doc_b[0].get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY)
+    if (pa.width, pa.height) != (pb.width, pb.height):
+        return None
+    total = sum(abs(x - y) for x, y in zip(pa.samples, pb.samples))
+    return total / len(pa.samples)
+
+
+def _peak_memory(func):
+    """func를 새 작업 프로세스(fork)에서 한 번 실행했을 때 늘어난 최대 메모리(MB), 잴 수 없으면 None"""
+    import multiprocessing
+
+    if 'fork' not in multiprocessing.get_all_start_methods() or not os.path.exists('/proc/self/status'):
+        return None
+
+    def status(field):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+        return 0
+
+    def child(queue):
+        start = status('VmRSS')
+        func()
+        queue.put(status('VmHWM') - start)
+
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    process = context.Process(target=child, args=(queue,))
+    process.start()
+    peak = queue.get()
+    process.join()
+    return peak
+
+
+def bench_normalize(files, repeat=3):
+    """정규화 방식별(vector/raster/external) 시간과 크기 비교"""
+    from print_core import normalize
+
+    print(f"{'파일':32} {'방식':9} {'시간(ms)':>10} {'크기(KB)':>10} {'차이':>6}")
+    print("-" * 72)
+
+    for pdf_path in files:
+        name = Path(pdf_path).name[:32]
+        results = {}
+        for mode in normalize.NORMALIZE_MODES:
+            if mode == 'external' and not normalize.NORMALIZE_AVAILABLE:
+                continue
+
+            def run():
+                doc = normalize.open_pdf(pdf_path)
+                # 외부 모듈의 진행 메시지는 표에 섞이지 않도록 숨김
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return doc, normalize.normalize_document(doc, mode=mode)
+
+            elapsed, (source, result) = _timed(run, repeat)
+            if result is source:
+                # 이미 A4 가로형이라 정규화를 생략했거나 실패한 경우
+                print(f"{name:32} {mode:9} {elapsed * 1000:10.1f} {'원본유지':>10}")
+                continue
+
+            size = len(result.tobytes(garbage=4, deflate=True))
+            results[mode] = (elapsed, size, result)
+
+        reference = results.get('raster')
+        for mode, (elapsed, size, result) in results.items():
+            diff = ''
+            if reference and mode != 'raster':
+                value = _page_difference(reference[2], result)
+                diff = f"{value:.1f}" if value is not None else '크기다름'
+            print(f"{name:32} {mode:9} {elapsed * 1000:10.1f} {size / 1024:10.1f} {diff:>6}")
+
+    print("\n크기: 최종 저장 옵션(garbage=4, deflate)으로 직렬화한 크기")
+    print("차이: raster 결과와 비교한 첫 페이지 평균 픽셀 차이 (0=동일, 255=반대)")
+
+
+def bench_pixbridge(files, repeat=3):
+    """렌더링 결과를 PIL/NumPy로 넘기는 방식 비교 (PNG 왕복 vs 버퍼 직접 사용)"""
+    import fitz
+    from PIL import Image
+    from print_core.pixbridge import pixmap_to_array, pixmap_to_image
+
+    # 코드에서 실제로 쓰는 렌더링 배율 (백지 검사, 미리보기/백지 150dpi, 썸네일)
+    zooms = [('백지검사 0.5x', 0.5), ('150dpi', 150 / 72), ('썸네일 2x', 2.0)]
+    repeat = max(repeat, 5)
+
+    print(f"{'렌더링':14} {'크기':>11} {'PNG 왕복':>10} {'PIL 버퍼':>10} {'NumPy':>8} {'절감':>9}")
+    print("-" * 68)
+
+    for label, zoom in zooms:
+        times = {'png': 0.0, 'pil': 0.0, 'numpy': 0.0}
+        pages = 0
+        size = ''
+        for pdf_path in files:
+            with fitz.open(pdf_path) as doc:
+                pix = doc[0].get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            size = f"{pix.width}x{pix.height}"
+            pages += 1
+
+            def png_roundtrip():
+                return Image.open(io.BytesIO(pix.pil_tobytes(format="PNG"))).load()
+
+            def pil_buffer():
+                return pixmap_to_image(pix).load()
+
+            def numpy_view():
+                return pixmap_to_array(pix).mean()
+
+            times['png'] += _timed(png_roundtrip, repeat)[0]
+            times['pil'] += _timed(pil_buffer, repeat)[0]
+            times['numpy'] += _timed(numpy_view, repeat)[0]
+
+        per_page = {key: value / pages * 1000 for key, value in times.items()}
+        print(f"{label:14} {size:>11} {per_page['png']:8.2f}ms {per_page['pil']:8.2f}ms "
+              f"{per_page['numpy']:6.2f}ms {per_page['png'] - per_page['pil']:7.2f}ms")
+
+    print("\n페이지당 시간 (NumPy 열은 평균 계산 포함), 절감: PNG 왕복 - PIL 버퍼")
+
+
+def bench_blank(files, repeat=3):
+    """백지 검사: 모든 페이지 렌더링 vs 구조 사전 판정
+
+    작업마다 페이지를 한 번씩만 검사하므로 매번 문서를 새로 열고 MuPDF 캐시(디코딩한 이미지, 글꼴)를 비움
+    """
+    import fitz
+    from print_core import blank
+
+    # 기본 처리 엔진(0.5배)과 향상된 설정(150dpi) 조건
+    conditions = [('기본 0.5x', blank.make_params()),
+                  ('향상 150dpi', blank.make_params('simple', 0.95, 150 / 72, (0, 0, 0, 0)))]
+
+    print(f"{'파일':32} {'조건':12} {'렌더링(ms)':>11} {'사전판정(ms)':>13} {'생략':>7} {'결과':>4}")
+    print("-" * 86)
+
+    def cold(data, params):
+        fitz.TOOLS.store_shrink(100)
+        with fitz.open("pdf", data) as doc:
+            start = time.perf_counter()
+            result = blank.detect_blank_pages(doc, None, params)
+            return time.perf_counter() - start, result
+
+    def best(data, params):
+        runs = [cold(data, params) for _ in range(repeat)]
+        return min(runs, key=lambda run: run[0])
+
+    for pdf_path in files:
+        name = Path(pdf_path).name[:32]
+        data = Path(pdf_path).read_bytes()
+        for label, params in conditions:
+            render_time, expected = best(data, dict(params, precheck=False))
+            precheck_time, result = best(data, params)
+            avoided = int((result['method'] == 'structure').sum())
+            same = '같음' if (expected['blank'] == result['blank']).all() else '다름'
+            print(f"{name:32} {label:12} {render_time * 1000:11.1f} "
+                  f"{precheck_time * 1000:13.1f} {avoided:3}/{len(result['method']):<3} {same:>4}")
+
+    print("\n생략: 구조 판정으로 렌더링하지 않은 페이지 수 / 전체 페이지 수")
+    print("결과: 모든 페이지를 렌더링한 판정과 같은지")
+
+
+def bench_overlay(files, repeat=3):
+    """썸네일/QR 삽입: 페이지마다 그리기 vs 오버레이 한 번 만들어 얹기 (1/10/100페이지)"""
+    import fitz
+    from print_core.overlay import Overlay
+
+    # 썸네일은 지정한 PDF(없으면 샘플)의 첫 페이지, QR은 생성한 PNG
+    thumb_doc = fitz.open(files[0])
+    qr = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 33, 33), False)
+    qr.set_rect(fitz.IRect(0, 0, 16, 16), (0,))
+    qr_png = qr.tobytes("png")
+
+    overlay = Overlay()
+    for x in (70, 490):
+        overlay.add_background(fitz.Rect(x - 5, 175, x + 165, 411))
+        overlay.add_pdf(fitz.Rect(x, 180, x + 160, 406), thumb_doc, 0)
+    for x in (230, 650):
+        overlay.add_image(fitz.Rect(x, 470, x + 50, 520), qr_png)
+
+    def make_order(pages):
+        doc = fitz.open()
+        for page_num in range(pages):
+            doc.new_page(width=842, height=595).insert_text((50, 60), f"ORDER {page_num + 1}")
+        return doc
+
+    def per_page(pages):
+        doc = make_order(pages)
+        for page in doc:
+            overlay._draw(page)
+        return doc
+
+    def stamped(pages):
+        doc = make_order(pages)
+        overlay.apply_all(doc)
+        return doc
+
+    print(f"{'페이지':>6} {'방식':10} {'시간(ms)':>10} {'크기(KB)':>10} {'객체 수':>8}")
+    print("-" * 50)
+    for pages in (1, 10, 100):
+        for label, func in (('페이지마다', per_page), ('오버레이', stamped)):
+            elapsed, doc = _timed(lambda: func(pages), repeat)
+            data = doc.tobytes(garbage=4, deflate=True)
+            objects = fitz.open("pdf", data).xref_length() - 1
+            print(f"{pages:6} {label:10} {elapsed * 1000:10.1f} {len(data) / 1024:10.1f} {objects:8}")
+
+    overlay.close()
+    thumb_doc.close()
+    print("\n크기/객체 수: 최종 저장 옵션(garbage=4, deflate)으로 직렬화한 결과")
+
+
+def bench_resources(files, repeat=3):
+    """이미지 삽입: 배치마다 인코딩/파일 읽기 vs 한 번 기록하고 xref 재사용 (1/10/100페이지)"""
+    import fitz
+    from print_core.pixbridge import pixmap_to_image
+    from print_core.resources import ImageCache, resource_summary, describe_resources
+
+    # 썸네일은 지정한 PDF(없으면 샘플) 첫 페이지를 2배로 렌더링한 PIL 이미지, QR은 PNG 파일
+    with fitz.open(files[0]) as src:
+        thumbnail = pixmap_to_image(src[0].get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False))
+    qr = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 33, 33), False)
+    qr.set_rect(fitz.IRect(0, 0, 16, 16), (0,))
+    qr_path = os.path.join(os.path.dirname(files[0]), "_bench_qr.png")
+    qr.save(qr_path)
+
+    thumb_rects = [fitz.Rect(x, 180, x + 160, 406) for x in (70, 490)]
+    qr_rects = [fitz.Rect(x, 470, x + 50, 520) for x in (230, 650)]
+
+    def make_order(pages):
+        doc = fitz.open()
+        for page_num in range(pages):
+            doc.new_page(width=842, height=595).insert_text((50, 60), f"ORDER {page_num + 1}")
+        return doc
+
+    def per_placement(pages):
+        # 이전 방식: 배치마다 썸네일을 PNG로 인코딩하고 QR 파일을 다시 읽음
+        doc = make_order(pages)
+        for page in doc:
+            for rect in thumb_rects:
+                buffer = io.BytesIO()
+                thumbnail.save(buffer, format='PNG')
+                page.insert_image(rect, stream=buffer.getvalue())
+            for rect in qr_rects:
+                page.insert_image(rect, filename=qr_path)
+        return doc
+
+    def reused(pages):
+        doc = make_order(pages)
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, format='PNG')
+        thumbnail_png = buffer.getvalue()
+        images = ImageCache(doc)
+        for page in doc:
+            for rect in thumb_rects:
+                images.insert(page, rect, stream=thumbnail_png, key='thumbnail')
+            for rect in qr_rects:
+                images.insert(page, rect, filename=qr_path, key='qr')
+        return doc
+
+    print(f"{'페이지':>6} {'방식':10} {'시간(ms)':>10} {'크기(KB)':>10}  리소스")
+    print("-" * 78)
+    for pages in (1, 10, 100):
+        for label, func in (('배치마다', per_placement), ('xref 재사용', reused)):
+            elapsed, doc = _timed(lambda: func(pages), repeat)
+            summary = describe_resources(resource_summary(doc))
+            data = doc.tobytes(garbage=4, deflate=True)
+            print(f"{pages:6} {label:10} {elapsed * 1000:10.1f} {len(data) / 1024:10.1f}  {summary}")
+
+    os.remove(qr_path)
+    print("\n리소스: 저장 전 문서의 이미지/폼 객체 수")
+    print("크기: 최종 저장 옵션(garbage=4, deflate)으로 직렬화한 크기")
+
+
+def bench_proxy(files, repeat=3):
+    """프록시 썸네일: 원본 페이지 vs 이미지를 줄인 사본 (처음/캐시, 결과 크기)"""
+    import fitz
+    from print_core import proxy
+
+    def order_with(doc, scale):
+        # 썸네일 2개를 얹은 1페이지 의뢰서의 저장 크기
+        order = fitz.open()
+        page = order.new_page(width=842, height=595)
+        rect = doc[0].rect
+        for x in (70, 490):
+            page.show_pdf_page(fitz.Rect(x, 180, x + rect.width * scale, 180 + rect.height * scale), doc, 0)
+        return len(order.tobytes(garbage=4, deflate=True))
+
+    print(f"{'파일':32} {'처음(ms)':>9} {'캐시(ms)':>9} {'원본(KB)':>10} {'프록시(KB)':>11}  결과")
+    print("-" * 100)
+    for pdf_path in files:
+        name = Path(pdf_path).name[:32]
+        with fitz.open(pdf_path) as doc:
+            rect = doc[0].rect
+            scale = min(160 / rect.width, 250 / rect.height)
+            proxy.clear_cache()
+            start = time.perf_counter()
+            proxy_doc, report = proxy.make_proxy(doc, 0, scale)
+            cold = time.perf_counter() - start
+            proxy_doc.close()
+            warm, (proxy_doc, _) = _timed(lambda: proxy.make_proxy(doc, 0, scale), repeat)
+            original_size = order_with(doc, scale)
+            proxy_size = order_with(proxy_doc, scale)
+            proxy_doc.close()
+        print(f"{name:32} {cold * 1000:9.1f} {warm * 1000:9.1f} {original_size / 1024:10.1f} "
+              f"{proxy_size / 1024:11.1f}  {proxy.describe(report)}")
+
+    print("\n원본/프록시: 썸네일 2개를 얹은 의뢰서 1페이지의 저장 크기 (garbage=4, deflate)")
+
+
+def bench_thumbsource(files, repeat=3):
+    """래스터 썸네일: 2배 렌더링 후 축소 vs 원본 선택(/Thumb, 페이지 전체 JPEG/이미지)"""
+    import fitz
+    from PIL import Image
+    from print_core import thumbsource
+    from print_core.pixbridge import pixmap_to_image
+
+    print(f"{'파일':32} {'크기':>11} {'원본':7} {'렌더링(ms)':>11} {'선택(ms)':>9}")
+    print("-" * 76)
+    for pdf_path in files:
+        name = Path(pdf_path).name[:32]
+        with fitz.open(pdf_path) as doc:
+            page = doc[0]
+            # 향상된 처리의 2배 해상도, 기본 처리 대체 방식의 삽입 크기
+            for target in ((int(page.rect.width * 2), int(page.rect.height * 2)), (160, 226)):
+                def rendered():
+                    img = pixmap_to_image(page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False))
+                    if img.size != target:
+                        img = img.resize(target, Image.Resampling.LANCZOS)
+                    return img
+
+                render_time = _timed(rendered, repeat)[0]
+                select_time, (img, kind) = _timed(lambda: thumbsource.make_thumbnail(page, target), repeat)
+                size = f"{target[0]}x{target[1]}"
+                print(f"{name:32} {size:>11} {kind:7} {render_time * 1000:11.1f} {select_time * 1000:9.1f}")
+
+    print("\n원본: thumb(/Thumb), jpeg(draft 축소 디코딩), image(이미지만 디코딩), render(렌더링)")
+
+
+def bench_thumbrender(files, repeat=3):
+    """썸네일 렌더링: 2배 전체 렌더링 후 자르기/축소 vs 필요한 크기로 clip 영역만 렌더링
+
+    버퍼는 만들어지는 픽셀 버퍼 중 가장 큰 것의 크기 (썸네일 하나당 최대 메모리 기준)
+    """
+    import fitz
+    from PIL import Image, ImageOps
+    from print_core import thumbsource
+    from print_core.pixbridge import pixmap_to_image
+
+    box = (160, 250)
+    print(f"{'파일':28} {'방식':6} {'크기':>9} {'기존(ms)':>9} {'버퍼':>7} {'정확(ms)':>9} {'버퍼':>7}")
+    print("-" * 84)
+    for pdf_path in files:
+        name = Path(pdf_path).name[:28]
+        with fitz.open(pdf_path) as doc:
+            page = doc[0]
+            rect = page.rect
+            half = fitz.Rect(rect.x0 + rect.width / 2, rect.y0, rect.x1, rect.y1)
+            for label, clip, gray in (('전체', None, False), ('표지', half, False), ('회색조', None, True)):
+                target = thumbsource.fit_target(clip or rect, box, thumbsource.DEFAULT_DPI)
+
+                def old():
+                    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
+                    peak = len(pix.samples_mv)
+                    img = pixmap_to_image(pix)
+                    if clip is not None:
+                        img = img.crop((img.width // 2, 0, img.width, img.height))
+                    img = img.resize(target, Image.Resampling.LANCZOS)
+                    if gray:
+                        img = ImageOps.grayscale(img)
+                    return peak
+
+                def exact():
+                    pix = thumbsource.render_thumbnail(page, target, clip, gray)
+                    return len(pix.samples_mv)
+
+                old_time, old_peak = _timed(old, repeat)
+                new_time, new_peak = _timed(exact, repeat)
+                size = f"{target[0]}x{target[1]}"
+                print(f"{name:28} {label:6} {size:>9} {old_time * 1000:9.1f} {old_peak / 1024 / 1024:6.1f}M "
+                      f"{new_time * 1000:9.1f} {new_peak / 1024 / 1024:6.1f}M")
+
+    print(f"\n썸네일 칸 {box[0]}x{box[1]}pt, {thumbsource.DEFAULT_DPI}dpi 기준")
+
+
+def bench_contactsheet(files, repeat=3):
+    """여러 페이지 썸네일: 페이지마다 렌더링해 이미지로 모음 vs 벡터 모음 (처음/재사용)
+
+    의뢰서 10페이지에 모음을 2곳씩 넣고 저장한 크기까지 비교
+    """
+    import fitz
+    from PIL import Image
+    from print_core import contactsheet, proxy, thumbsource
+
+    def make_order():
+        doc = fitz.open()
+        for page_num in range(10):
+            doc.new_page(width=842, height=595).insert_text((50, 60), f"ORDER {page_num + 1}")
+        return doc
+
+    rects = [fitz.Rect(x, 180, x + 160, 430) for x in (70, 490)]
+
+    def place(sheet=None, png=None):
+        order = make_order()
+        for page in order:
+            for rect in rects:
+                if sheet is not None:
+                    page.show_pdf_page(rect, sheet, 0)
+                else:
+                    page.insert_image(rect, stream=png)
+        data = order.tobytes(garbage=3, deflate=True)
+        order.close()
+        return len(data)
+
+    print(f"{'파일':28} {'페이지':>6} {'방식':10} {'준비(ms)':>9} {'삽입+저장(ms)':>13} {'저장(KB)':>9}")
+    print("-" * 82)
+    for pdf_path in files:
+        name = Path(pdf_path).name[:28]
+        with fitz.open(pdf_path) as src:
+            pages = list(range(min(len(src), 9)))
+            if len(pages) < 2:
+                print(f"{name:28} 페이지가 2개 이상인 PDF가 필요합니다.")
+                continue
+
+            def raster():
+                # 이전 방식: 페이지마다 2배 렌더링 → 200x280 칸에 붙이기 → PNG
+                cols, rows = contactsheet.grid_shape(len(pages))
+                sheet = Image.new('RGB', (200 * cols, 280 * rows), 'white')
+                for cell, page_num in zip(contactsheet.cell_rects(len(pages)), pages):
+                    page = src[page_num]
+                    img, _ = thumbsource.make_thumbnail(
+                        page, (int(page.rect.width * 2), int(page.rect.height * 2)))
+                    img.thumbnail(contactsheet.CELL_SIZE, Image.Resampling.LANCZOS)
+                    sheet.paste(img, (int(cell.x0), int(cell.y0)))
+                buffer = io.BytesIO()
+                sheet.save(buffer, format='PNG')
+                return {'png': buffer.getvalue()}
+
+            def vector():
+                contactsheet.clear_cache()
+                proxy.clear_cache()
+                return {'sheet': contactsheet.build_sheet(src, pages, placement=(160, 250))}
+
+            def cached():
+                return {'sheet': contactsheet.build_sheet(src, pages, placement=(160, 250))}
+
+            for label, func in (('이미지', raster), ('벡터', vector), ('벡터 재사용', cached)):
+                prep_time, prepared = _timed(func, repeat)
+                place_time, size = _timed(lambda: place(**prepared), repeat)
+                print(f"{name:28} {len(pages):6} {label:10} {prep_time * 1000:9.1f} "
+                      f"{place_time * 1000:13.1f} {size / 1024:9.1f}")
+        contactsheet.clear_cache()
+
+
+def bench_effects(files, repeat=3):
+    """썸네일 효과: PIL 단계별(grayscale → Contrast → Sharpness) vs 변환표/NumPy 한 번에
+
+    파일마다 첫 페이지를 향상된 처리의 썸네일 크기(150dpi)와 미리보기 원본 크기(2배)로 만들어 비교
+    """
+    import fitz
+    import numpy as np
+    from print_core import effects, thumbsource
+    from print_core.pixbridge import pixmap_to_image
+
+    cases = [
+        ('흑백', dict(grayscale=True)),
+        ('대비 1.3', dict(contrast=1.3)),
+        ('흑백+대비', dict(grayscale=True, contrast=1.3)),
+        ('선명도 1.8', dict(sharpness=1.8)),
+        ('전체', dict(grayscale=True, contrast=1.3, sharpness=1.8)),
+        ('대비+선명도', dict(contrast=1.3, sharpness=1.8)),
+    ]
+    print(f"{'파일':24} {'크기':>10} {'효과':10} {'PIL(ms)':>9} {'한번에(ms)':>10} {'차이':>5}")
+    print("-" * 76)
+    for pdf_path in files:
+        name = Path(pdf_path).name[:24]
+        with fitz.open(pdf_path) as doc:
+            page = doc[0]
+            target = thumbsource.fit_target(page.rect, (160, 250), thumbsource.DEFAULT_DPI)
+            images = [pixmap_to_image(thumbsource.render_thumbnail(page, target)),
+                      pixmap_to_image(page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False))]
+        for img in images:
+            size = f"{img.width}x{img.height}"
+            for label, params in cases:
+                params = dict(dict(grayscale=False, contrast=1.0, sharpness=1.0), **params)
+                pil_time, expected = _timed(lambda: effects._pil_effects(img, **params), repeat)
+                fused_time, result = _timed(lambda: effects.apply_effects(img, **params), repeat)
+                diff = np.abs(np.asarray(result, dtype=np.int16) - np.asarray(expected, dtype=np.int16)).max()
+                print(f"{name:24} {size:>10} {label:10} {pil_time * 1000:9.1f} {fused_time * 1000:10.1f} {diff:5}")
+
+    # 여러 페이지 썸네일: 같은 효과를 여러 장에
+    batch = [images[0]] * 8
+    params = dict(grayscale=False, contrast=1.3, sharpness=1.8)
+    pil_time, _ = _timed(lambda: [effects._pil_effects(img, **params) for img in batch], repeat)
+    fused_time, _ = _timed(lambda: effects.apply_effects_batch(batch, **params), repeat)
+    print(f"\n{len(batch)}장 묶음 (대비+선명도): PIL {pil_time * 1000:.1f}ms, 한번에 {fused_time * 1000:.1f}ms")
+    print("차이: 두 방식 결과의 최대 픽셀 값 차이")
+
+
+def _sample_qr_png(version, scale, border=4):
+    """측정용 QR 형태 이미지 (위치 찾기/타이밍 패턴 + 임의의 데이터 모듈, 실제 내용은 없음)"""
+    import numpy as np
+    from PIL import Image
+
+    count = 17 + 4 * version
+    rng = np.random.default_rng(version)
+    modules = rng.random((count, count)) < 0.5
+    finder = np.ones((7, 7), dtype=bool)
+    finder[1:6, 1:6] = False
+    finder[2:5, 2:5] = True
+    for top, left in ((0, 0), (0, count - 7), (count - 7, 0)):
+        modules[max(0, top - 1):top + 8, max(0, left - 1):left + 8] = False
+        modules[top:top + 7, left:left + 7] = finder
+    timing = np.arange(8, count - 8) % 2 == 0
+    modules[6, 8:count - 8] = timing
+    modules[8:count - 8, 6] = timing
+    modules = np.pad(modules, border)
+    pixels = np.where(modules, 0, 255).astype(np.uint8).repeat(scale, 0).repeat(scale, 1)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, 'L').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _place_qr(add):
+    """기본 처리처럼 오버레이 레이어로 의뢰서 10페이지에 QR을 2곳씩 배치 → 저장 크기"""
+    import fitz
+    from print_core.overlay import Overlay
+
+    doc = fitz.open()
+    for page_num in range(10):
+        doc.new_page(width=842, height=595)
+    overlay = Overlay()
+    for x in (230, 650):
+        add(overlay, fitz.Rect(x, 470, x + 50, 520))
+    overlay.apply_all(doc)
+    overlay.close()
+    size = len(doc.tobytes(garbage=3, deflate=True))
+    doc.close()
+    return size
+
+
+def _raster_qr(data):
+    """기존 이미지 방식: NEAREST 50px 축소 + 선명도 2배 + PNG"""
+    from PIL import Image, ImageEnhance
+
+    img = Image.open(io.BytesIO(data))
+    if img.mode not in ('L', 'RGB'):
+        img = img.convert('RGB')  # 팔레트/1비트 PNG는 선명도 필터를 쓸 수 없음
+    img = img.resize((50, 50), Image.Resampling.NEAREST)
+    img = ImageEnhance.Sharpness(img).enhance(2.0)
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def bench_qr(files, repeat=3):
+    """QR 코드: NEAREST 축소 + 선명도 + PNG vs 모듈 격자 인식 → 벡터 사각형
+
+    기본 처리처럼 오버레이 레이어로 의뢰서 10페이지에 2곳씩 배치하고 저장
+    """
+    from PIL import Image
+    from print_core import qrvector
+
+    images = [(Path(path).name, Path(path).read_bytes()) for path in files
+              if path.lower().endswith(('.png', '.jpg', '.jpeg'))]
+    if not images:
+        images = [(f"sample_v{version}_x{scale}", _sample_qr_png(version, scale))
+                  for version, scale in ((1, 10), (3, 10), (10, 8), (25, 6))]
+
+    def raster(data):
+        png = _raster_qr(data)
+        return _place_qr(lambda overlay, rect: overlay.add_image(rect, png))
+
+    def vector(data, cached):
+        if not cached:
+            qrvector.clear_cache()
+        doc = qrvector.vector_qr(data)
+        if doc is None:
+            return None
+        return _place_qr(lambda overlay, rect: overlay.add_vector(rect, doc))
+
+    print(f"{'QR 이미지':24} {'크기':>9} {'방식':10} {'시간(ms)':>9} {'저장(KB)':>9}")
+    print("-" * 68)
+    for name, data in images:
+        size = "x".join(map(str, Image.open(io.BytesIO(data)).size))
+        rows = [('이미지', lambda: raster(data)),
+                ('벡터', lambda: vector(data, False)),
+                ('벡터 재사용', lambda: vector(data, True))]
+        for label, func in rows:
+            elapsed, saved = _timed(func, repeat)
+            if saved is None:
+                print(f"{name[:24]:24} {size:>9} {label:10} {'격자 인식 실패 (이미지 방식 사용)':>20}")
+                break
+            print(f"{name[:24]:24} {size:>9} {label:10} {elapsed * 1000:9.1f} {saved / 1024:9.1f}")
+    qrvector.clear_cache()
+
+
+def bench_qrgen(files, repeat=3):
+    """QR 생성: QR 이미지 파일 읽기 + 기존 이미지 방식 vs 의뢰서 파일명으로 벡터 QR 생성
+
+    이미지 파일은 같은 내용을 segno로 만든 PNG(모듈당 10픽셀)를 사용
+    """
+    from print_core import qrgen
+
+    if not qrgen.available():
+        print("QR 생성 패키지가 없습니다: pip install segno (또는 qrcode)")
+        return
+
+    qr_config = {'generate': True, 'payload_pattern': r'(\d{6,})',
+                 'payload_template': 'https://example.com/order/{0}'}
+    # 파일명에 주문번호가 없으면 (기본 측정용 의뢰서 등) 예시 파일명 사용
+    names = [Path(path).name for path in files if qrgen.order_payload(path, qr_config)]
+    names = names or ['20261017001_의뢰서.pdf', 'A-88123456_의뢰서.pdf', '2026101700123456_의뢰서.pdf']
+
+    print(f"{'의뢰서':28} {'방식':12} {'시간(ms)':>9} {'저장(KB)':>9}")
+    print("-" * 62)
+    with tempfile.TemporaryDirectory() as folder:
+        for name in names:
+            import segno
+            payload = qrgen.order_payload(name, qr_config)
+            image_path = os.path.join(folder, 'qr.png')
+            segno.make_qr(payload, error='m').save(image_path, scale=10)
+
+            def from_image():
+                with open(image_path, 'rb') as f:
+                    png = _raster_qr(f.read())
+                return _place_qr(lambda overlay, rect: overlay.add_image(rect, png))
+
+            def generated(cached):
+                if not cached:
+                    qrgen.clear_cache()
+                doc = qrgen.order_qr(name, qr_config)[1]
+                return _place_qr(lambda overlay, rect: overlay.add_vector(rect, doc))
+
+            rows = [('이미지 파일', from_image),
+                    ('생성', lambda: generated(False)),
+                    ('생성 재사용', lambda: generated(True))]
+            for label, func in rows:
+                elapsed, saved = _timed(func, repeat)
+                print(f"{name[:28]:28} {label:12} {elapsed * 1000:9.1f} {saved / 1024:9.1f}")
+    qrgen.clear_cache()
+
+
+def bench_raster(files, repeat=3):
+    """최종 래스터화: 기존 (렌더링 → insert_image → 저장할 때 압축) vs 래스터화 엔진
+
+    1/8/64페이지 의뢰서를 만들어 저장까지의 시간 비교 (페이지마다 번호를 넣어 내용이 모두 다름)
+    엔진은 본 프로세스만 사용(1)과 작업 프로세스 2개, CPU 수만큼 사용한 경우를 측정
+    압축은 기존과 같은 RGB Flate로 고정 (압축 방식 비교는 rasterenc)
+    """
+    import fitz
+    from print_core import raster
+
+    def make_order(pages):
+        doc = fitz.open()
+        with fitz.open(files[0]) as src:
+            for page_num in range(pages):
+                doc.insert_pdf(src, from_page=page_num % len(src), to_page=page_num % len(src))
+                doc[-1].insert_text((60, 60), f"page {page_num + 1}", fontsize=24)
+        return doc
+
+    def legacy(doc):
+        raster_doc = fitz.open()
+        for page in doc:
+            pix = page.get_pixmap(dpi=raster.RASTER_DPI, alpha=False)
+            new_page = raster_doc.new_page(width=page.rect.width, height=page.rect.height)
+            new_page.insert_image(new_page.rect, pixmap=pix)
+        size = len(raster_doc.tobytes(garbage=4, deflate=True))
+        raster_doc.close()
+        return size
+
+    def engine(doc, workers):
+        raster_doc, used, report = raster.rasterize_document(doc, workers=workers,
+                                                             options={'encoding': 'flate'})
+        size = len(raster_doc.tobytes(garbage=4, deflate=True))
+        raster_doc.close()
+        return size
+
+    cpus = os.cpu_count() or 1
+    print(f"CPU {cpus}개, 래스터화 {raster.RASTER_DPI} DPI, 시간은 저장(garbage=4, deflate)까지 포함")
+    print(f"{'페이지':>6} {'방식':14} {'시간(ms)':>10} {'페이지당(ms)':>12} {'저장(KB)':>10}")
+    print("-" * 58)
+    for pages in (1, 8, 64):
+        doc = make_order(pages)
+        rounds = repeat if pages < 32 else 1  # 64페이지는 한 번만 측정
+        rows = [('기존', lambda: legacy(doc)), ('엔진 1', lambda: engine(doc, 1))]
+        # 페이지가 적으면 엔진이 알아서 본 프로세스만 사용하므로 측정하지 않음
+        for workers in sorted({raster.worker_count(pages, w) for w in (2, cpus)} - {1}):
+            rows.append((f"엔진 {workers}", lambda w=workers: engine(doc, w)))
+        for label, func in rows:
+            elapsed, saved = _timed(func, rounds)
+            print(f"{pages:6} {label:14} {elapsed * 1000:10.1f} {elapsed * 1000 / pages:12.1f} "
+                  f"{saved / 1024:10.1f}")
+        doc.close()
+
+
+def bench_rasterenc(files, repeat=3):
+    """최종 래스터화 압축: RGB Flate(기존) vs 페이지 내용에 맞는 압축 (+ 세밀하지 않은 페이지 절반 DPI)
+
+    시간은 렌더링 + 압축 + 저장(garbage=4, deflate)까지, 본 프로세스에서만 처리
+    """
+    import fitz
+    import numpy as np
+    from print_core import raster
+
+    modes = [
+        ('RGB Flate', {'encoding': 'flate'}),
+        ('내용별', {'encoding': 'adaptive', 'jpeg_quality': 85}),
+        ('내용별+DPI', {'encoding': 'adaptive', 'jpeg_quality': 85, 'reduce_dpi': True}),
+    ]
+
+    def run(doc, options):
+        raster_doc, used, report = raster.rasterize_document(doc, workers=1, options=options)
+        data = raster_doc.tobytes(garbage=4, deflate=True)
+        raster_doc.close()
+        return data, report
+
+    print(f"{'파일':28} {'방식':11} {'시간(ms)':>9} {'저장(KB)':>10} {'차이':>6}  페이지별")
+    print("-" * 100)
+    for pdf_path in files:
+        name = Path(pdf_path).name[:28]
+        with fitz.open(pdf_path) as doc:
+            baseline = None
+            for label, options in modes:
+                elapsed, (data, report) = _timed(lambda: run(doc, options), repeat)
+                # 첫 페이지를 100 DPI로 다시 렌더링한 평균 픽셀 차이 (0~255)
+                with fitz.open("pdf", data) as result:
+                    pixels = np.frombuffer(result[0].get_pixmap(dpi=100).samples, np.uint8)
+                if baseline is None:
+                    baseline = pixels
+                difference = np.abs(pixels.astype(np.int16) - baseline).mean()
+                kinds = ", ".join(f"{raster.KIND_NAMES[item['kind']]} {item['dpi']:g}" for item in report[:4])
+                print(f"{name:28} {label:11} {elapsed * 1000:9.1f} {len(data) / 1024:10.1f} "
+                      f"{difference:6.2f}  {kinds}")
+
+
+def _sample_overlay(thumb_doc):
+    """썸네일 2개(thumb_doc 첫 페이지, 흰색 배경 포함)와 벡터 QR 2개를 얹는 오버레이"""
+    import fitz
+    from print_core import qrvector
+    from print_core.overlay import Overlay
+
+    qr = qrvector.vector_qr(_sample_qr_png(2, 4))
+    overlay = Overlay()
+    for x in (70, 490):
+        overlay.add_background(fitz.Rect(x - 5, 175, x + 165, 411))
+        overlay.add_pdf(fitz.Rect(x, 180, x + 160, 406), thumb_doc, 0)
+    for x in (230, 650):
+        overlay.add_vector(fitz.Rect(x, 470, x + 50, 520), qr)
+    return overlay
+
+
+def bench_fused(files, repeat=3):
+    """정규화 + 썸네일/QR + 래스터화: 기존 경로(벡터/렌더링 정규화) vs 합성 경로
+
+    썸네일 2개(지정한 첫 PDF의 첫 페이지)와 QR 2개를 얹은 의뢰서를 1/8페이지로 만들어 래스터화 후 저장까지
+    정규화하지 않는 경우(skip_norm)도 기존 경로와 합성 경로를 비교 (회전 페이지의 오버레이 위치 확인)
+    메모리: 각 방식을 새 작업 프로세스에서 한 번 실행했을 때 늘어난 최대 메모리
+    차이: 같은 묶음의 기존 경로 결과(정규화는 벡터)와 비교한 페이지 이미지 최대 픽셀 차이 (0~255)
+    """
+    import fitz
+    import numpy as np
+    from print_core import composite, normalize, raster
+
+    thumb_doc = fitz.open(files[0])
+    overlay = _sample_overlay(thumb_doc)
+
+    def legacy(data, mode):
+        doc = fitz.open("pdf", data)
+        normalized = doc
+        if mode is not None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                normalized = normalize.normalize_document(doc, mode=mode)
+        overlay.apply_all(normalized)
+        raster_doc, _, _ = raster.rasterize_document(normalized, workers=1)
+        return raster_doc.tobytes(garbage=4, deflate=True)
+
+    def fused(data, normalize_pages=True):
+        doc = fitz.open("pdf", data)
+        placements = composite.plan_pages(doc, normalize.analyze_geometry(doc) if normalize_pages else None)
+        layers = composite.render_overlays(overlay, placements)
+        raster_doc, _, _ = composite.compose_document(doc, placements, layers, workers=1)
+        return raster_doc.tobytes(garbage=4, deflate=True)
+
+    def images(data):
+        with fitz.open("pdf", data) as doc:
+            for page in doc:
+                pix = fitz.Pixmap(doc, page.get_images()[0][0])
+                if pix.n != 3:
+                    pix = fitz.Pixmap(fitz.csRGB, pix)
+                yield np.frombuffer(pix.samples, np.uint8).astype(np.int16)
+
+    # 묶음마다 첫 방식이 차이의 기준
+    groups = [
+        [('기존 (벡터)', lambda data: legacy(data, 'vector')),
+         ('기존 (렌더링)', lambda data: legacy(data, 'raster')),
+         ('합성', fused)],
+        [('기존 (정규화 X)', lambda data: legacy(data, None)),
+         ('합성 (정규화 X)', lambda data: fused(data, False))],
+    ]
+    print(f"{'파일':28} {'페이지':>4} {'방식':12} {'시간(ms)':>9} {'메모리(MB)':>10} {'저장(KB)':>9} {'차이':>4}")
+    print("-" * 86)
+    for pdf_path in files:
+        name = Path(pdf_path).name[:28]
+        for pages in (1, 8):
+            with fitz.open(pdf_path) as src:
+                order = fitz.open()
+                for page_num in range(pages):
+                    order.insert_pdf(src, from_page=page_num % len(src), to_page=page_num % len(src))
+                data = order.tobytes()
+                order.close()
+            for modes in groups:
+                reference = None
+                for label, func in modes:
+                    elapsed, result = _timed(lambda: func(data), repeat)
+                    memory = _peak_memory(lambda: func(data))
+                    pixels = list(images(result))
+                    reference = reference or pixels
+                    difference = max((int(np.abs(a - b).max()) if a.shape == b.shape else 255)
+                                     for a, b in zip(reference, pixels))
+                    memory = f"{memory:10.0f}" if memory is not None else f"{'-':>10}"
+                    print(f"{name:28} {pages:4} {label:12} {elapsed * 1000:9.1f} {memory} "
+                          f"{len(result) / 1024:9.1f} {difference:4}")
+
+    overlay.close()
+    thumb_doc.close()
+
+
+def bench_save(files, repeat=3):
+    """저장 방식(fast/compact/incremental)별 저장 시간과 파일 크기
+
+    처리 결과 세 가지를 저장 (썸네일 2개와 QR 2개를 얹음):
+    - 벡터 출력   : 정규화(벡터) + 오버레이, 최종 래스터화를 끈 경우
+    - 래스터 출력 : 합성 경로로 래스터화한 새 문서 (기본 처리 결과)
+    - 원본 덧붙임 : 파일에서 연 의뢰서에 오버레이를 얹어 같은 파일에 저장 (향상된 처리와 같음)
+    저장은 문서를 바꾸므로 매번 새로 만든 문서를 저장하고 저장 시간만 잼
+    덧붙이기는 같은 파일을 3번 처리했을 때의 크기 변화도 표시
+    """
+    import shutil
+
+    import fitz
+    from print_core import composite, normalize, saving
+
+    thumb_doc = fitz.open(files[0])
+    overlay = _sample_overlay(thumb_doc)
+
+    def vector_output(path):
+        doc = normalize.open_pdf(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            doc = normalize.normalize_document(doc, mode='vector')
+        overlay.apply_all(doc)
+        return doc
+
+    def raster_output(path):
+        with normalize.open_pdf(path) as doc:
+            placements = composite.plan_pages(doc, normalize.analyze_geometry(doc))
+            layers = composite.render_overlays(overlay, placements)
+            return composite.compose_document(doc, placements, layers, workers=1)[0]
+
+    def save(build, target, profile):
+        """build()로 만든 문서를 target에 저장 → (저장 시간, 크기)"""
+        doc = build()
+        with contextlib.redirect_stdout(io.StringIO()):
+            used, elapsed = saving.save_document(doc, target, profile)
+        doc.close()
+        return elapsed, os.path.getsize(target), used
+
+    print(f"{'파일':28} {'결과':10} {'저장 방식':12} {'시간(ms)':>9} {'크기(KB)':>10}  비고")
+    print("-" * 90)
+    with tempfile.TemporaryDirectory() as folder:
+        target = os.path.join(folder, 'out.pdf')
+        for pdf_path in files:
+            name = Path(pdf_path).name[:28]
+            original = os.path.getsize(pdf_path)
+
+            def reprocess():
+                doc = fitz.open(target)
+                overlay.apply_all(doc)
+                return doc
+
+            outputs = [
+                ('벡터 출력', lambda: vector_output(pdf_path), None),
+                ('래스터 출력', lambda: raster_output(pdf_path), None),
+                ('원본 덧붙임', reprocess, pdf_path),
+            ]
+            for label, build, source in outputs:
+                for profile in saving.PROFILES:
+                    best = None
+                    sizes = []
+                    for _ in range(max(repeat, 3) if source else repeat):
+                        if source and (profile != 'incremental' or not sizes):
+                            shutil.copyfile(source, target)
+                        elapsed, size, used = save(build, target, profile)
+                        best = elapsed if best is None else min(best, elapsed)
+                        sizes.append(size)
+                    note = ''
+                    if used != profile:
+                        note = f"{used}로 저장됨"
+                    elif profile == 'incremental':
+                        note = "원본 " + " → ".join(f"{size / 1024:.0f}"
+                                                   for size in [original] + sizes[:3]) + " KB"
+                    print(f"{name:28} {label:10} {profile:12} {best * 1000:9.1f} "
+                          f"{sizes[0] / 1024:10.1f}  {note}")
+
+    overlay.close()
+    thumb_doc.close()
+
+
+def bench_output(files, repeat=3):
+    """결과 파일 기록과 백업: 기존(바로 저장, shutil.copy2) vs output 모듈
+
+    저장: 래스터화한 결과 문서를 compact 방식으로
+    - 바로 저장 : doc.save(경로) - 중간에 멈추면 원본이 깨진 채로 남음
+    - 바꿔치기  : 임시 파일에 기록 → fsync → os.replace (saving.save_document)
+    백업: 의뢰서 파일 백업 (이 폴더의 파일 시스템에서 가능한 방식)
+    """
+    import shutil
+
+    import fitz
+    from print_core import composite, normalize, output, saving
+
+    thumb_doc = fitz.open(files[0])
+    overlay = _sample_overlay(thumb_doc)
+
+    def raster_output(path):
+        with normalize.open_pdf(path) as doc:
+            placements = composite.plan_pages(doc, normalize.analyze_geometry(doc))
+            layers = composite.render_overlays(overlay, placements)
+            return composite.compose_document(doc, placements, layers, workers=1)[0]
+
+    def direct(doc, target):
+        doc.save(target, **saving.PROFILES['compact'])
+
+    def atomic(doc, target):
+        with contextlib.redirect_stdout(io.StringIO()):
+            saving.save_document(doc, target, 'compact')
+
+    print(f"{'파일':28} {'작업':16} {'시간(ms)':>9} {'크기(KB)':>10}  비고")
+    print("-" * 80)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(files[0])) as folder:
+        target = os.path.join(folder, 'out.pdf')
+        backup = os.path.join(folder, 'out_backup.pdf')
+        for pdf_path in files:
+            name = Path(pdf_path).name[:28]
+            for label, save in (('저장: 바로 저장', direct), ('저장: 바꿔치기', atomic)):
+                best = None
+                for _ in range(repeat):
+                    # 저장은 문서를 바꾸므로 매번 새 문서를 저장하고 저장 시간만 잼
+                    shutil.copyfile(pdf_path, target)
+                    doc = raster_output(pdf_path)
+                    start = time.perf_counter()
+                    save(doc, target)
+                    elapsed = time.perf_counter() - start
+                    doc.close()
+                    best = elapsed if best is None else min(best, elapsed)
+                print(f"{name:28} {label:16} {best * 1000:9.1f} {os.path.getsize(target) / 1024:10.1f}")
+
+            shutil.copyfile(pdf_path, target)
+            size = os.path.getsize(target) / 1024
+            elapsed, _ = _timed(lambda: shutil.copy2(target, backup), repeat)
+            print(f"{name:28} {'백업: copy2':16} {elapsed * 1000:9.1f} {size:10.1f}")
+            elapsed, method = _timed(lambda: output.backup_file(target, backup), repeat)
+            print(f"{name:28} {'백업: output':16} {elapsed * 1000:9.1f} {size:10.1f}  "
+                  f"{output.BACKUP_METHODS[method]}")
+            elapsed, method = _timed(lambda: output.backup_file(target, backup, in_place=True), repeat)
+            print(f"{name:28} {'백업: 덧붙이기용':16} {elapsed * 1000:9.1f} {size:10.1f}  "
+                  f"{output.BACKUP_METHODS[method]} (하드 링크 제외)")
+
+    overlay.close()
+    thumb_doc.close()
+
+
+BENCHMARKS = {
+    'normalize': bench_normalize,
+    'pixbridge': bench_pixbridge,
+    'blank': bench_blank,
+    'overlay': bench_overlay,
+    'resources': bench_resources,
+    'proxy': bench_proxy,
+    'thumbsource': bench_thumbsource,
+    'thumbrender': bench_thumbrender,
+    'contactsheet': bench_contactsheet,
+    'effects': bench_effects,
+    'qr': bench_qr,
+    'qrgen': bench_qrgen,
+    'raster': bench_raster,
+    'rasterenc': bench_rasterenc,
+    'fused': bench_fused,
+    'save': bench_save,
+    'output': bench_output,
+}
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or args[0] not in BENCHMARKS:
+        print(__doc__)
+        print("측정 항목:", ", ".join(BENCHMARKS))
+        return 1
+
+    name = args.pop(0)
+    repeat = 3
+    if '--repeat' in args:
+        index = args.index('--repeat')
+        repeat = int(args[index + 1])
+        del args[index:index + 2]
+
+    files = [os.path.abspath(arg) for arg in args if os.path.exists(arg)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        if not files:
+            files = make_sample_pdfs(folder)
+        BENCHMARKS[name](files, repeat=repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
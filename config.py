@@ -38,7 +38,10 @@ THUMBNAIL_CONFIG = {
             'x': 490,      # 우측 X 좌표
             'y': 180       # 우측 Y 좌표 (적절한 위치로 조정)
         }
-    ]
+    ],
+    'proxy_images': True,  # 인쇄데이터의 고해상도 사진을 썸네일 크기에 맞게 줄여 사용 (글자/선은 벡터 유지)
+    'proxy_dpi': 300,      # 줄인 사진이 썸네일 안에서 가질 해상도
+    'render_dpi': 150      # 래스터 썸네일 해상도 (삽입 크기 기준, 그보다 크게 렌더링하지 않음)
 }
 
 # QR 코드 설정
@@ -54,7 +57,16 @@ QR_CONFIG = {
             'x': 650,      # 우측 X 좌표 (외주 박스 우측)
             'y': 470       # 우측 Y 좌표 (하단)
         }
-    ]
+    ],
+    'vector': True,        # QR 이미지의 모듈 격자를 읽어 벡터 사각형으로 그림 (인식 실패 시 이미지)
+    # QR 이미지가 없을 때 의뢰서 정보로 QR 생성 (segno 또는 qrcode 패키지 필요)
+    'generate': False,
+    'payload_pattern': r'(\d{6,})',  # 의뢰서 파일명에서 찾을 값 (정규식)
+    'payload_template': '{0}',       # QR 내용 형식 ({0}: 첫 번째 괄호 그룹, {name}: 파일명)
+    'manifest': '',                  # 주문 목록 CSV/JSON (의뢰서 폴더 기준), 있으면 정규식보다 우선
+    'manifest_key': 'file',          # 주문 목록에서 의뢰서 파일명이 들어 있는 열
+    'manifest_field': 'qr',          # 주문 목록에서 QR 내용이 들어 있는 열
+    'error': 'M'                     # 오류 정정 수준 (L, M, Q, H)
 }
 
 # GUI 설정
@@ -71,7 +83,15 @@ PROCESSING_CONFIG = {
     'backup_before_save': False,   # 저장 전 백업 생성
     'backup_suffix': '_backup',    # 백업 파일 접미사
     'auto_normalize': True,        # PDF 자동 정규화 (세로형을 가로형으로 변환)
-    'rasterize_final': True        # 최종 PDF 래스터화 (품질 유지 + 용량 최적화)
+    'normalize_mode': 'vector',    # 정규화 방식: 'vector'(벡터 유지), 'raster'(6배 렌더링), 'external'(normalize_pdf.py)
+    'normalize_raster_fallback': True,  # 벡터 배치에 실패한 페이지만 렌더링 방식으로 처리
+    'rasterize_final': True,       # 최종 PDF 래스터화 (품질 유지 + 용량 최적화)
+    'fused_raster': True,          # 래스터화할 때 정규화/썸네일/QR을 렌더링 한 번으로 합성 (외부 정규화 제외)
+    'raster_workers': 0,           # 래스터화 작업 프로세스 수 (0: CPU 수, 1: 사용 안 함)
+    'raster_encoding': 'adaptive', # 래스터화 압축: 'adaptive'(흑백 1비트/회색조/사진 JPEG/컬러 Flate), 'flate'(모두 RGB Flate)
+    'raster_jpeg_quality': 85,     # 사진 페이지 JPEG 품질
+    'raster_reduce_dpi': False,    # 세밀한 부분이 없는 페이지는 절반 DPI로
+    'save_profile': 'compact'      # 저장 방식: 'fast'(그대로 기록), 'compact'(정리+압축), 'incremental'(원본 끝에 덧붙임, 래스터화를 끈 원본 덮어쓰기만)
 }
 
 # 디버그 모드
@@ -1,16 +1,27 @@
 import fitz
-from PIL import Image, ImageEnhance, ImageOps
+from PIL import Image
 from pathlib import Path
 import json
 import os
 from io import BytesIO
-import numpy as np
 import threading
 import queue
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
 from datetime import datetime
-import hashlib
+
+from print_core import blank
+from print_core import contactsheet
+from print_core import effects
+from print_core import qrgen
+from print_core import output
+from print_core import qrvector
+from print_core import saving
+from print_core import settings as cfg
+from print_core import thumbsource
+from print_core.cache import DiskCache, BLANK_CACHE_PATH
+from print_core.fingerprint import page_fingerprint
+from print_core.resources import ImageCache, resource_summary, describe_resources
 
 class EnhancedPrintProcessor:
     """향상된 PDF 처리 엔진"""
@@ -23,7 +34,8 @@ class EnhancedPrintProcessor:
         }
         self.temp_normalized_file = None
         self.settings = self.load_enhanced_settings()
-        self.blank_detection_cache = {}
+        self.blank_detection_cache = DiskCache(
+            BLANK_CACHE_PATH, self.settings["performance"].get("cache_size_mb", 100))
         self.processing_queue = queue.Queue()
         
         # 멀티스레딩 설정
@@ -62,7 +74,9 @@ class EnhancedPrintProcessor:
                 "page_selection": "1",
                 "grayscale": False,
                 "contrast": 1.0,
-                "sharpness": 1.0
+                "sharpness": 1.0,
+                "render_dpi": 150,
+                "grid": "auto"
             },
             "qr": {
                 "max_width": 50,
@@ -70,7 +84,15 @@ class EnhancedPrintProcessor:
                 "positions": [
                     {"x": 230, "y": 470},
                     {"x": 650, "y": 470}
-                ]
+                ],
+                "vector": True,
+                "generate": False,
+                "payload_pattern": r"(\d{6,})",
+                "payload_template": "{0}",
+                "manifest": "",
+                "manifest_key": "file",
+                "manifest_field": "qr",
+                "error": "M"
             },
             "blank_detection": {
                 "enabled": False,
@@ -91,7 +113,8 @@ class EnhancedPrintProcessor:
             "performance": {
                 "multithreading": True,
                 "max_concurrent_files": 3,
-                "cache_size_mb": 100
+                "cache_size_mb": 100,
+                "save_profile": "compact"
             }
         }
     
@@ -137,91 +160,31 @@ class EnhancedPrintProcessor:
         if not self.settings["blank_detection"]["enabled"]:
             return False
         
-        # 캐시 확인
-        page_hash = self._get_page_hash(page)
-        if self.settings["blank_detection"]["cache_enabled"] and page_hash in self.blank_detection_cache:
-            return self.blank_detection_cache[page_hash]
-        
-        algorithm = self.settings["blank_detection"]["algorithm"]
-        threshold = self.settings["blank_detection"]["threshold"]
-        
-        # 페이지를 이미지로 변환
-        pix = page.get_pixmap(dpi=150)
-        img_data = pix.pil_tobytes(format="PNG")
-        img = Image.open(BytesIO(img_data))
-        
-        # 제외 영역 적용
-        exclude = self.settings["blank_detection"]["exclude_areas"]
-        width, height = img.size
-        crop_box = (
-            exclude["left_margin"],
-            exclude["header"],
-            width - exclude["right_margin"],
-            height - exclude["footer"]
-        )
+        params = blank.enhanced_params(self.settings["blank_detection"])
+        use_cache = self.settings["blank_detection"]["cache_enabled"]
         
-        if crop_box[2] > crop_box[0] and crop_box[3] > crop_box[1]:
-            img = img.crop(crop_box)
+        # 캐시 확인 (페이지 내용 + 리소스 + 검사 조건으로 만든 지문)
+        if use_cache:
+            page_key = page_fingerprint(page, params)
+            cached = self.blank_detection_cache.get(page_key)
+            if cached is not None:
+                return cached
         
-        # 알고리즘별 처리
-        is_blank = False
-        if algorithm == "simple":
-            is_blank = self._simple_blank_detection(img, threshold)
-        elif algorithm == "entropy":
-            is_blank = self._entropy_blank_detection(img, threshold)
-        else:  # histogram
-            is_blank = self._histogram_blank_detection(img, threshold)
+        # 공용 백지 감지 엔진 사용 (150 DPI 그레이스케일, 제외 영역 적용)
+        result = blank.detect_blank_pages(page.parent, [page.number], params)
+        is_blank = bool(result['blank'][0])
         
         # 캐시 저장
-        if self.settings["blank_detection"]["cache_enabled"]:
-            self.blank_detection_cache[page_hash] = is_blank
+        if use_cache:
+            self.blank_detection_cache.put(page_key, is_blank)
         
         return is_blank
     
-    def _get_page_hash(self, page):
-        """페이지 해시 생성 (캐싱용)"""
-        page_content = page.get_text().encode('utf-8')
-        return hashlib.md5(page_content).hexdigest()
-    
-    def _simple_blank_detection(self, img, threshold):
-        """단순 백지 감지"""
-        gray = img.convert('L')
-        pixels = np.array(gray)
-        white_ratio = np.sum(pixels > 250) / pixels.size * 100
-        return white_ratio > threshold
-    
-    def _entropy_blank_detection(self, img, threshold):
-        """엔트로피 기반 백지 감지"""
-        gray = img.convert('L')
-        histogram = gray.histogram()
-        histogram = [h for h in histogram if h > 0]
-        
-        if not histogram:
-            return True
-        
-        total = sum(histogram)
-        entropy = -sum((h/total) * np.log2(h/total) for h in histogram if h > 0)
-        
-        # 낮은 엔트로피는 백지를 의미
-        return entropy < (100 - threshold) / 10
-    
-    def _histogram_blank_detection(self, img, threshold):
-        """히스토그램 기반 백지 감지"""
-        gray = img.convert('L')
-        histogram = gray.histogram()
-        
-        # 백색 영역의 비율 계산
-        white_pixels = sum(histogram[250:])
-        total_pixels = sum(histogram)
-        
-        if total_pixels == 0:
-            return True
-        
-        white_ratio = white_pixels / total_pixels * 100
-        return white_ratio > threshold
-    
     def create_enhanced_thumbnail(self, pdf_path):
-        """향상된 썸네일 생성"""
+        """향상된 썸네일 생성
+
+        반환값: PIL 이미지, 또는 여러 페이지를 벡터로 모은 한 페이지짜리 문서 (효과가 없을 때)
+        """
         doc = fitz.open(pdf_path)
         
         # 페이지 선택 파싱
@@ -230,7 +193,12 @@ class EnhancedPrintProcessor:
             len(doc)
         )
         
+        # 여러 페이지이고 이미지 효과가 없으면 래스터화하지 않고 벡터로 모음
+        vector_sheet = (self.settings["thumbnail"]["multi_page"] and len(pages_to_use) > 1
+                        and not self._has_image_effects())
+        
         thumbnails = []
+        sheet_pages = []
         
         for page_num in pages_to_use:
             if page_num >= len(doc):
@@ -243,17 +211,52 @@ class EnhancedPrintProcessor:
                 print(f"페이지 {page_num + 1}은 백지입니다. 건너뜁니다.")
                 continue
             
-            # 페이지를 이미지로 변환
-            mat = fitz.Matrix(2.0, 2.0)  # 2배 해상도
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            img_data = pix.pil_tobytes(format="PNG")
-            img = Image.open(BytesIO(img_data))
+            if vector_sheet:
+                sheet_pages.append(page_num)
+                continue
+            
+            # 표지 처리 규칙이면 오른쪽 절반만 사용 (그 영역만 렌더링)
+            clip = self._thumbnail_clip(page)
+            
+            # 삽입 크기와 해상도에 맞는 픽셀 크기 (이미지 한 장짜리 페이지나 /Thumb은 렌더링 없이 디코딩)
+            thumb_settings = self.settings["thumbnail"]
+            target = thumbsource.fit_target(
+                clip or page.rect,
+                (thumb_settings["max_width"], thumb_settings["max_height"]),
+                thumb_settings.get("render_dpi", thumbsource.DEFAULT_DPI)
+            )
+            source = thumbsource.select_source(page, target, clip)
+            img, kind = thumbsource.make_thumbnail(
+                page, target, clip, gray=thumb_settings["grayscale"], source=source)
+            if kind != thumbsource.SOURCE_RENDER:
+                print(f"페이지 {page_num + 1} 썸네일 원본: {kind} {source['size'][0]}x{source['size'][1]}")
             
-            # 이미지 처리 적용
-            img = self._apply_image_effects(img)
+            # 효과가 없으면 원본 JPEG을 다시 압축하지 않고 삽입
+            passthrough = None
+            if clip is None and not self._has_image_effects():
+                passthrough = thumbsource.jpeg_passthrough(page, source, target)
+            if passthrough:
+                img.info['source_jpeg'] = passthrough
             
             thumbnails.append(img)
         
+        # 이미지 처리 적용 (선택한 페이지 전체를 한 번에)
+        thumbnails = self._apply_image_effects(thumbnails)
+        
+        if sheet_pages:
+            thumb_settings = self.settings["thumbnail"]
+            grid = thumb_settings.get("grid", "auto")
+            # 고해상도 사진은 썸네일 칸 크기에 맞게 줄여서 모음
+            placement = None
+            if thumb_settings.get("proxy_images", True):
+                placement = (thumb_settings["max_width"], thumb_settings["max_height"])
+            sheet = contactsheet.build_sheet(doc, sheet_pages, grid=grid, clip=self._thumbnail_clip,
+                                             placement=placement)
+            doc.close()
+            placed = len(contactsheet.cell_rects(len(sheet_pages), grid))
+            print(f"썸네일: {placed}페이지 벡터 모음")
+            return sheet
+        
         doc.close()
         
         # 다중 페이지 처리
@@ -264,6 +267,18 @@ class EnhancedPrintProcessor:
         else:
             return None
     
+    def _thumbnail_clip(self, page):
+        """표지 처리 규칙이면 페이지 오른쪽 절반, 아니면 None"""
+        if not getattr(self, '_crop_right_half', False):
+            return None
+        rect = page.rect
+        return fitz.Rect(rect.x0 + rect.width / 2, rect.y0, rect.x1, rect.y1)
+    
+    def _has_image_effects(self):
+        """흑백/대비/선명도 중 하나라도 설정되어 있는지"""
+        thumb = self.settings["thumbnail"]
+        return thumb["grayscale"] or thumb["contrast"] != 1.0 or thumb["sharpness"] != 1.0
+    
     def _parse_page_selection(self, selection_str, total_pages):
         """페이지 선택 문자열 파싱"""
         pages = []
@@ -296,36 +311,26 @@ class EnhancedPrintProcessor:
         
         return pages if pages else [0]
     
-    def _apply_image_effects(self, img):
-        """이미지 효과 적용"""
-        # 흑백 변환
-        if self.settings["thumbnail"]["grayscale"]:
-            img = ImageOps.grayscale(img)
-        
-        # 대비 조정
-        contrast = self.settings["thumbnail"]["contrast"]
-        if contrast != 1.0:
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(contrast)
-        
-        # 선명도 조정
-        sharpness = self.settings["thumbnail"]["sharpness"]
-        if sharpness != 1.0:
-            enhancer = ImageEnhance.Sharpness(img)
-            img = enhancer.enhance(sharpness)
-        
-        return img
+    def _apply_image_effects(self, images):
+        """이미지 효과 적용 (흑백/대비/선명도, 회색조로 렌더링한 이미지는 이미 'L' 모드)"""
+        if not self._has_image_effects():
+            return images
+        thumb = self.settings["thumbnail"]
+        return effects.apply_effects_batch(
+            images, thumb["grayscale"], thumb["contrast"], thumb["sharpness"])
     
     def _combine_thumbnails(self, thumbnails):
         """여러 썸네일을 하나로 결합"""
         if not thumbnails:
             return None
         
-        # 2x2 그리드로 결합 (최대 4개)
-        thumbnails = thumbnails[:4]
+        # 벡터 모음과 같은 격자 (2개는 가로로, 3~4개는 2x2)
+        thumb_size = contactsheet.CELL_SIZE  # 개별 썸네일 크기
+        cells = contactsheet.cell_rects(
+            len(thumbnails), self.settings["thumbnail"].get("grid", "auto"), thumb_size)
+        thumbnails = thumbnails[:len(cells)]
         
         # 각 썸네일 크기 조정
-        thumb_size = (200, 280)  # 개별 썸네일 크기
         resized = []
         for thumb in thumbnails:
             thumb_resized = thumb.copy()
@@ -335,23 +340,16 @@ class EnhancedPrintProcessor:
         # 결합 이미지 생성
         if len(resized) == 1:
             return resized[0]
-        elif len(resized) == 2:
-            # 가로로 배치
-            combined = Image.new('RGB', (thumb_size[0] * 2, thumb_size[1]), 'white')
-            combined.paste(resized[0], (0, 0))
-            combined.paste(resized[1], (thumb_size[0], 0))
-        else:
-            # 2x2 그리드
-            combined = Image.new('RGB', (thumb_size[0] * 2, thumb_size[1] * 2), 'white')
-            positions = [(0, 0), (thumb_size[0], 0), (0, thumb_size[1]), (thumb_size[0], thumb_size[1])]
-            for i, thumb in enumerate(resized):
-                if i < 4:
-                    combined.paste(thumb, positions[i])
+        cols, rows = contactsheet.grid_shape(len(resized), self.settings["thumbnail"].get("grid", "auto"))
+        combined = Image.new('RGB', (thumb_size[0] * cols, thumb_size[1] * rows), 'white')
+        for thumb, cell in zip(resized, cells):
+            combined.paste(thumb, (int(cell.x0), int(cell.y0)))
         
         return combined
     
     def process_files_enhanced(self):
         """향상된 파일 처리"""
+        blank.reset_stats()
         try:
             # 처리 규칙 적용
             if self.dropped_files['print_pdf']:
@@ -414,8 +412,50 @@ class EnhancedPrintProcessor:
             return False
         
         try:
-            # PDF 열기
-            doc = fitz.open(self.dropped_files['order_pdf'])
+            # 이전 실행이 남긴 임시 파일 정리
+            removed = output.cleanup(os.path.dirname(os.path.abspath(self.dropped_files['order_pdf'])))
+            if removed:
+                print(f"이전 작업의 임시 파일 {len(removed)}개 삭제")
+            
+            # PDF 열기 (덧붙이기 저장이 아니면 메모리로 열어 저장할 때 원본을 바꿔치기할 수 있도록)
+            requested_profile = self.settings["performance"].get("save_profile")
+            save_profile = saving.profile_name(requested_profile)
+            if save_profile == 'incremental':
+                # 덧붙이기 저장은 원본을 제자리에서 고치므로 먼저 백업 (중간에 멈추면 백업으로 복구)
+                original = Path(self.dropped_files['order_pdf'])
+                backup = original.with_name(
+                    original.stem + cfg.PROCESSING_CONFIG.get('backup_suffix', '_backup') + original.suffix)
+                method = output.backup_file(original, backup, in_place=True)
+                print(f"백업 생성 ({output.BACKUP_METHODS[method]}): {backup.name}")
+                doc = fitz.open(self.dropped_files['order_pdf'])
+            else:
+                doc = fitz.open(stream=Path(self.dropped_files['order_pdf']).read_bytes(), filetype="pdf")
+            before = resource_summary(doc)
+            images = ImageCache(doc)
+            
+            # 썸네일은 한 번만 PNG로 인코딩(원본 JPEG이면 그대로)하고 QR 파일은 한 번만 읽음
+            # 벡터 페이지 모음은 인코딩 없이 페이지 그대로 배치
+            thumbnail_png = None
+            sheet = thumbnail if isinstance(thumbnail, fitz.Document) else None
+            if thumbnail and sheet is None:
+                thumbnail_png = thumbnail.info.get('source_jpeg')
+                if thumbnail_png is None:
+                    img_buffer = BytesIO()
+                    thumbnail.save(img_buffer, format='PNG')
+                    thumbnail_png = img_buffer.getvalue()
+            qr_png = None
+            qr_doc = None
+            if self.dropped_files['qr_image']:
+                with open(self.dropped_files['qr_image'], 'rb') as f:
+                    qr_png = f.read()
+                # 모듈 격자를 읽을 수 있으면 벡터 사각형으로 (인식하지 못하면 이미지)
+                if self.settings["qr"].get("vector", True):
+                    qr_doc = qrvector.vector_qr(qr_png)
+            elif self.settings["qr"].get("generate", False):
+                # QR 이미지가 없으면 의뢰서 파일명/주문 목록으로 생성 (벡터, 같은 내용은 재사용)
+                payload, qr_doc = qrgen.order_qr(self.dropped_files['order_pdf'], self.settings["qr"])
+                if qr_doc is not None:
+                    print(f"QR 코드 생성: {payload}")
             
             for page_num, page in enumerate(doc):
                 # 백지 건너뛰기
@@ -423,8 +463,8 @@ class EnhancedPrintProcessor:
                     print(f"페이지 {page_num + 1}은 백지입니다. 건너뜁니다.")
                     continue
                 
-                # 썸네일 삽입
-                if thumbnail:
+                # 썸네일 삽입 (두 번째 배치부터는 같은 이미지/폼 객체 참조)
+                if thumbnail_png or sheet is not None:
                     for position in self.settings["thumbnail"]["positions"]:
                         rect = fitz.Rect(
                             position["x"],
@@ -432,16 +472,13 @@ class EnhancedPrintProcessor:
                             position["x"] + self.settings["thumbnail"]["max_width"],
                             position["y"] + self.settings["thumbnail"]["max_height"]
                         )
-                        
-                        # PIL 이미지를 PDF에 삽입
-                        img_buffer = BytesIO()
-                        thumbnail.save(img_buffer, format='PNG')
-                        img_buffer.seek(0)
-                        
-                        page.insert_image(rect, stream=img_buffer.getvalue())
+                        if sheet is not None:
+                            page.show_pdf_page(rect, sheet, 0)
+                        else:
+                            images.insert(page, rect, stream=thumbnail_png, key='thumbnail')
                 
                 # QR 코드 삽입
-                if self.dropped_files['qr_image']:
+                if qr_png or qr_doc is not None:
                     for position in self.settings["qr"]["positions"]:
                         rect = fitz.Rect(
                             position["x"],
@@ -449,12 +486,19 @@ class EnhancedPrintProcessor:
                             position["x"] + self.settings["qr"]["max_width"],
                             position["y"] + self.settings["qr"]["max_height"]
                         )
-                        
-                        page.insert_image(rect, filename=self.dropped_files['qr_image'])
+                        if qr_doc is not None:
+                            page.show_pdf_page(rect, qr_doc, 0)
+                        else:
+                            images.insert(page, rect, stream=qr_png, key='qr')
+            
+            print(f"리소스: {images.describe()}")
+            print(f"  - 처리 전: {describe_resources(before)}")
+            print(f"  - 처리 후: {describe_resources(resource_summary(doc))}")
             
             # 저장
-            doc.save(self.dropped_files['order_pdf'], incremental=True, encryption=0)
+            profile, elapsed = saving.save_document(doc, self.dropped_files['order_pdf'], requested_profile)
             doc.close()
+            print(f"저장 방식: {saving.describe(profile, elapsed)}")
             
             print("처리 완료!")
             return True
@@ -463,6 +507,12 @@ class EnhancedPrintProcessor:
             print(f"PDF 처리 중 오류: {e}")
             return False
     
+    def can_generate_qr(self):
+        """QR 이미지 없이 의뢰서 정보로 QR을 만들 수 있는지 (qr.generate)"""
+        if not self.settings["qr"].get("generate", False) or not qrgen.available():
+            return False
+        return qrgen.order_payload(self.dropped_files['order_pdf'], self.settings["qr"]) is not None
+    
     def clear_cache(self):
         """캐시 비우기"""
         self.blank_detection_cache.clear()
@@ -470,11 +520,18 @@ class EnhancedPrintProcessor:
     
     def get_performance_stats(self):
         """성능 통계 반환"""
+        cache_stats = self.blank_detection_cache.stats()
         stats = {
-            "cache_size": len(self.blank_detection_cache),
-            "cache_memory_mb": sys.getsizeof(self.blank_detection_cache) / 1024 / 1024,
+            "cache_size": cache_stats["entries"],
+            "cache_memory_mb": cache_stats["size_mb"],
+            "cache_limit_mb": cache_stats["limit_mb"],
+            "cache_hits": cache_stats["hits"],
+            "cache_misses": cache_stats["misses"],
+            "cache_hit_rate": cache_stats["hit_rate"],
             "multithreading": self.settings["performance"]["multithreading"],
-            "max_concurrent": self.settings["performance"]["max_concurrent_files"]
+            "max_concurrent": self.settings["performance"]["max_concurrent_files"],
+            "blank_pages_checked": blank.stats['pages'],
+            "blank_renders_avoided": blank.stats['structure_blank'] + blank.stats['structure_inked']
         }
         return stats
 
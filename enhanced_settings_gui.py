@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, colorchooser
 import fitz
-from PIL import Image, ImageTk, ImageDraw, ImageEnhance, ImageOps
+from PIL import Image, ImageTk, ImageDraw
 import json
 import os
 from pathlib import Path
@@ -11,6 +11,12 @@ from collections import defaultdict
 import threading
 import queue
 
+from print_core import blank
+from print_core import effects
+from print_core import saving
+from print_core.cache import DiskCache, BLANK_CACHE_PATH
+from print_core.pixbridge import pixmap_to_image
+
 class EnhancedSettingsGUI:
     def __init__(self, parent=None):
         self.parent = parent
@@ -28,8 +34,9 @@ class EnhancedSettingsGUI:
         self.selected_item = None
         self.selected_index = 0
         
-        # 백지 감지 캐시
-        self.blank_detection_cache = {}
+        # 백지 감지 캐시 (처리 엔진과 같은 파일)
+        self.blank_detection_cache = DiskCache(
+            BLANK_CACHE_PATH, self.settings["performance"].get("cache_size_mb", 100))
         
         # 처리 큐
         self.processing_queue = queue.Queue()
@@ -58,6 +65,7 @@ class EnhancedSettingsGUI:
                 ],
                 "multi_page": False,
                 "page_selection": "1",  # "1", "1-3", "1,3,5" 등
+                "grid": "auto",  # 여러 페이지 배치: "auto" 또는 "열x행"
                 "grayscale": False,
                 "contrast": 1.0,  # 0.5 ~ 2.0
                 "sharpness": 1.0  # 0.5 ~ 2.0
@@ -106,7 +114,8 @@ class EnhancedSettingsGUI:
             "performance": {
                 "multithreading": True,
                 "max_concurrent_files": 3,
-                "cache_size_mb": 100
+                "cache_size_mb": 100,
+                "save_profile": "compact"
             }
         }
     
@@ -407,6 +416,11 @@ class EnhancedSettingsGUI:
         
         ttk.Label(page_frame, text="예: 1 (첫 페이지), 1-3 (1~3페이지), 1,3,5 (선택 페이지)").grid(row=2, column=0, columnspan=2, sticky=tk.W)
         
+        ttk.Label(page_frame, text="격자:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.grid_var = tk.StringVar(value=self.settings["thumbnail"].get("grid", "auto"))
+        ttk.Entry(page_frame, textvariable=self.grid_var, width=30).grid(row=3, column=1, padx=10)
+        ttk.Label(page_frame, text="예: auto (자동), 3x2 (3열 2행)").grid(row=4, column=0, columnspan=2, sticky=tk.W)
+        
         # 이미지 처리 옵션
         image_frame = ttk.LabelFrame(main_frame, text="이미지 처리", padding="10")
         image_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=10)
@@ -558,9 +572,22 @@ class EnhancedSettingsGUI:
         
         ttk.Button(cache_frame, text="캐시 비우기", command=self.clear_cache).grid(row=0, column=2, padx=10)
         
+        # 저장
+        save_frame = ttk.LabelFrame(main_frame, text="저장", padding="10")
+        save_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=10)
+        
+        ttk.Label(save_frame, text="저장 방식:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        self.save_profile_var = tk.StringVar(
+            value=self.settings["performance"].get("save_profile", saving.DEFAULT_PROFILE))
+        ttk.Combobox(save_frame, textvariable=self.save_profile_var, values=list(saving.PROFILES),
+                    state="readonly", width=12).grid(row=0, column=1, padx=10)
+        ttk.Label(save_frame, text="fast: 그대로 기록, compact: 정리+압축 (작은 파일), "
+                                   "incremental: 원본 끝에 덧붙임 (처리할 때마다 커짐)").grid(
+            row=1, column=0, columnspan=3, sticky=tk.W)
+        
         # 성능 모니터
         monitor_frame = ttk.LabelFrame(main_frame, text="성능 모니터", padding="10")
-        monitor_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=10)
+        monitor_frame.grid(row=3, column=0, sticky=(tk.W, tk.E), pady=10)
         
         self.monitor_text = tk.Text(monitor_frame, width=60, height=10)
         self.monitor_text.pack()
@@ -590,10 +617,7 @@ class EnhancedSettingsGUI:
                 # 이미지 생성
                 mat = fitz.Matrix(scale, scale)
                 pix = page.get_pixmap(matrix=mat, alpha=False)
-                img_data = pix.pil_tobytes(format="PNG")
-                
-                from io import BytesIO
-                img = Image.open(BytesIO(img_data))
+                img = pixmap_to_image(pix)
                 
                 self.preview_image = img
                 doc.close()
@@ -703,11 +727,10 @@ class EnhancedSettingsGUI:
         if file_path:
             try:
                 doc = fitz.open(file_path)
-                blank_pages = []
                 
-                for i, page in enumerate(doc):
-                    if self.is_page_blank(page):
-                        blank_pages.append(i + 1)
+                # 전체 페이지를 한 번에 검사
+                result = blank.detect_blank_pages(doc, None, self._blank_params())
+                blank_pages = [int(page_num) + 1 for page_num in result['pages'][result['blank']]]
                 
                 doc.close()
                 
@@ -719,73 +742,18 @@ class EnhancedSettingsGUI:
             except Exception as e:
                 self.test_result_label.config(text=f"오류: {str(e)}")
     
-    def is_page_blank(self, page):
-        """페이지가 백지인지 확인"""
-        algorithm = self.algorithm_var.get()
-        threshold = self.threshold_var.get()
-        
-        # 페이지를 이미지로 변환
-        pix = page.get_pixmap(dpi=150)
-        img_data = pix.pil_tobytes(format="PNG")
-        
-        from io import BytesIO
-        img = Image.open(BytesIO(img_data))
-        
-        # 제외 영역 적용
-        exclude = self.settings["blank_detection"]["exclude_areas"]
-        width, height = img.size
-        crop_box = (
-            exclude["left_margin"],
-            exclude["header"],
-            width - exclude["right_margin"],
-            height - exclude["footer"]
-        )
-        img = img.crop(crop_box)
-        
-        # 알고리즘별 처리
-        if algorithm == "simple":
-            return self._simple_blank_detection(img, threshold)
-        elif algorithm == "entropy":
-            return self._entropy_blank_detection(img, threshold)
-        else:  # histogram
-            return self._histogram_blank_detection(img, threshold)
-    
-    def _simple_blank_detection(self, img, threshold):
-        """단순 백지 감지"""
-        gray = img.convert('L')
-        pixels = np.array(gray)
-        white_ratio = np.sum(pixels > 250) / pixels.size * 100
-        return white_ratio > threshold
-    
-    def _entropy_blank_detection(self, img, threshold):
-        """엔트로피 기반 백지 감지"""
-        gray = img.convert('L')
-        histogram = gray.histogram()
-        histogram = [h for h in histogram if h > 0]
-        
-        if not histogram:
-            return True
-        
-        total = sum(histogram)
-        entropy = -sum((h/total) * np.log2(h/total) for h in histogram if h > 0)
-        
-        # 낮은 엔트로피는 백지를 의미
-        return entropy < (100 - threshold) / 10
+    def _blank_params(self):
+        """현재 탭의 알고리즘/임계값을 적용한 백지 감지 엔진 설정"""
+        return blank.enhanced_params(dict(
+            self.settings["blank_detection"],
+            algorithm=self.algorithm_var.get(),
+            threshold=self.threshold_var.get()
+        ))
     
-    def _histogram_blank_detection(self, img, threshold):
-        """히스토그램 기반 백지 감지"""
-        gray = img.convert('L')
-        histogram = gray.histogram()
-        
-        # 백색 영역의 비율 계산
-        white_pixels = sum(histogram[250:])
-        total_pixels = sum(histogram)
-        
-        if total_pixels == 0:
-            return True
-        
-        white_ratio = white_pixels / total_pixels * 100
-        return white_ratio > threshold
+    def is_page_blank(self, page):
+        """페이지가 백지인지 확인 (공용 백지 감지 엔진 사용)"""
+        result = blank.detect_blank_pages(page.parent, [page.number], self._blank_params())
+        return bool(result['blank'][0])
     
     def load_presets(self):
         """프리셋 목록 로드"""
@@ -907,21 +875,15 @@ class EnhancedSettingsGUI:
             messagebox.showwarning("경고", "먼저 샘플 이미지를 로드하세요")
             return
         
-        img = self.sample_image.copy()
-        
-        # 흑백 변환
-        if self.grayscale_var.get():
-            img = ImageOps.grayscale(img)
-        
-        # 대비 조정
-        if self.contrast_var.get() != 1.0:
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(self.contrast_var.get())
-        
-        # 선명도 조정
-        if self.sharpness_var.get() != 1.0:
-            enhancer = ImageEnhance.Sharpness(img)
-            img = enhancer.enhance(self.sharpness_var.get())
+        # 흑백/대비/선명도 (처리 엔진과 같은 계산, 효과가 없으면 원본 그대로)
+        img = effects.apply_effects(
+            self.sample_image,
+            grayscale=self.grayscale_var.get(),
+            contrast=self.contrast_var.get(),
+            sharpness=self.sharpness_var.get()
+        )
+        if img is self.sample_image:
+            img = img.copy()
         
         # 캔버스에 표시
         img.thumbnail((400, 300), Image.Resampling.LANCZOS)
@@ -1024,6 +986,10 @@ class EnhancedSettingsGUI:
             self.monitor_text.insert(tk.END, f"동시 처리 파일: {self.concurrent_files_var.get()}\n")
             self.monitor_text.insert(tk.END, f"캐시 크기: {self.cache_size_var.get()}MB\n")
             
+            cache_stats = self.blank_detection_cache.stats()
+            self.monitor_text.insert(tk.END, f"백지 감지 캐시: {cache_stats['entries']}개 항목, "
+                                             f"{cache_stats['size_mb']:.2f}MB 사용\n")
+            
             time.sleep(1)  # 시뮬레이션
             
             elapsed = time.time() - start_time
@@ -1046,6 +1012,7 @@ class EnhancedSettingsGUI:
         # 썸네일 옵션 업데이트
         self.settings["thumbnail"]["multi_page"] = self.multi_page_var.get()
         self.settings["thumbnail"]["page_selection"] = self.page_selection_var.get()
+        self.settings["thumbnail"]["grid"] = self.grid_var.get().strip() or "auto"
         self.settings["thumbnail"]["grayscale"] = self.grayscale_var.get()
         self.settings["thumbnail"]["contrast"] = self.contrast_var.get()
         self.settings["thumbnail"]["sharpness"] = self.sharpness_var.get()
@@ -1057,6 +1024,8 @@ class EnhancedSettingsGUI:
         self.settings["performance"]["multithreading"] = self.multithreading_var.get()
         self.settings["performance"]["max_concurrent_files"] = self.concurrent_files_var.get()
         self.settings["performance"]["cache_size_mb"] = self.cache_size_var.get()
+        self.settings["performance"]["save_profile"] = self.save_profile_var.get()
+        self.blank_detection_cache.set_limit(self.cache_size_var.get())
         
         messagebox.showinfo("적용", "설정이 적용되었습니다")
     
@@ -10,18 +10,37 @@ import fitz
 import sys
 from pathlib import Path
 
-def normalize_pdf(input_path, output_path=None):
-    """PDF를 정규화하여 실제 가로형으로 변환"""
+def normalize_pdf(input_path, output_path=None, return_type="path"):
+    """PDF를 정규화하여 실제 가로형으로 변환
     
-    if output_path is None:
-        p = Path(input_path)
+    input_path: PDF 경로, PDF 바이트, 또는 열려 있는 fitz.Document
+    return_type:
+      - "path"     : output_path에 저장하고 경로 반환 (기본)
+      - "document" : 저장하지 않고 새 fitz.Document 반환
+      - "bytes"    : 저장하지 않고 PDF 바이트 반환
+    """
+    if return_type not in ("path", "document", "bytes"):
+        raise ValueError(f"지원하지 않는 return_type: {return_type}")
+    
+    # 입력 열기 (열려 있는 문서는 호출한 쪽에서 닫음)
+    owns_doc = not isinstance(input_path, fitz.Document)
+    if not owns_doc:
+        doc = input_path
+    elif isinstance(input_path, (bytes, bytearray)):
+        doc = fitz.open(stream=input_path, filetype="pdf")
+    else:
+        doc = fitz.open(input_path)
+    
+    if return_type == "path" and output_path is None:
+        if not doc.name:
+            raise ValueError("메모리 문서를 저장하려면 output_path가 필요합니다.")
+        p = Path(doc.name)
         output_path = p.parent / f"{p.stem}_normalized{p.suffix}"
     
-    print(f"입력 파일: {input_path}")
-    print(f"출력 파일: {output_path}")
+    print(f"입력 파일: {doc.name or '(메모리)'}")
+    if return_type == "path":
+        print(f"출력 파일: {output_path}")
     
-    # PDF 열기
-    doc = fitz.open(input_path)
     new_doc = fitz.open()  # 새 문서
     
     for page_num, page in enumerate(doc):
@@ -44,13 +63,12 @@ def normalize_pdf(input_path, output_path=None):
                 # 회전된 세로형을 가로형으로
                 new_page = new_doc.new_page(width=rect.height, height=rect.width)
                 
-                # 페이지 내용을 PDF로 변환
+                # 페이지 내용을 렌더링
                 pix = page.get_pixmap(dpi=150)
-                img_data = pix.pil_tobytes(format="PDF")
                 
-                # 새 페이지에 삽입
+                # 새 페이지에 삽입 (PIL을 거치지 않고 픽스맵 그대로)
                 img_rect = new_page.rect
-                new_page.insert_image(img_rect, stream=img_data)
+                new_page.insert_image(img_rect, pixmap=pix)
                 
             else:
                 # 이미 가로형인 경우
@@ -63,12 +81,22 @@ def normalize_pdf(input_path, output_path=None):
             
         print(f"  변환 후: {new_page.rect.width}x{new_page.rect.height}")
     
+    if owns_doc:
+        doc.close()
+    
+    print(f"\n정규화 완료!")
+    
+    if return_type == "document":
+        return new_doc
+    
+    if return_type == "bytes":
+        data = new_doc.tobytes(garbage=3, deflate=True)
+        new_doc.close()
+        return data
+    
     # 저장
     new_doc.save(output_path)
     new_doc.close()
-    doc.close()
-    
-    print(f"\n정규화 완료!")
     return output_path
 
 def main():
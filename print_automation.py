@@ -1,3 +1,27 @@
+import os
+import sys
+
+# 실행 파일(PyInstaller)에서 래스터화 작업 프로세스로 시작된 경우 여기서 작업만 처리
+if __name__ == "__main__" and getattr(sys, 'frozen', False):
+    from multiprocessing import freeze_support
+    freeze_support()
+
+# CLI 모드: GUI 모듈을 불러오기 전에 GUI 없는 핵심 모듈(print_core)로 바로 처리
+# (상주 작업자가 실행 중이면 작업자에게 넘김)
+if __name__ == "__main__" and "--cli" in sys.argv:
+    from print_core.cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
+# 상주 작업자 모드: F3 작업을 초기화 비용 없이 처리 (GUI 모듈은 로드하지 않음)
+if __name__ == "__main__" and "--daemon" in sys.argv:
+    from print_core.cli import check_dependencies as check_core_dependencies
+    if not check_core_dependencies():
+        sys.exit(1)
+    import print_daemon
+    print_daemon.serve()
+    sys.exit(0)
+
+
 class PrintAutomationGUI:
     def __init__(self):
         self.root = TkinterDnD.Tk()
@@ -26,18 +50,7 @@ class PrintAutomationGUI:
     
     def reload_settings(self):
         """설정 다시 로드"""
-        global settings, PAGE_WIDTH, PAGE_HEIGHT, THUMBNAIL_CONFIG, QR_CONFIG, DEBUG_MODE, PROCESSING_CONFIG, BLANK_DETECTION
-        settings = load_settings()
-        PAGE_WIDTH = settings['PAGE_WIDTH']
-        PAGE_HEIGHT = settings['PAGE_HEIGHT']
-        THUMBNAIL_CONFIG = settings['THUMBNAIL_CONFIG']
-        QR_CONFIG = settings['QR_CONFIG']
-        PROCESSING_CONFIG = settings['PROCESSING_CONFIG']
-        BLANK_DETECTION = settings['BLANK_DETECTION']
-        DEBUG_MODE = settings['DEBUG_MODE']
-        
-        if DEBUG_MODE:
-            print("설정이 다시 로드되었습니다.")
+        reload_settings()
         
     def setup_ui(self):
         # 메인 프레임
@@ -145,7 +158,9 @@ class PrintAutomationGUI:
         self.update_file_list()
         
         # 의뢰서 PDF가 있고, 인쇄데이터 PDF 또는 QR 이미지 중 하나라도 있으면 실행
-        if self.dropped_files['order_pdf'] and (self.dropped_files['print_pdf'] or self.dropped_files['qr_image']):
+        # (QR 생성을 켠 경우 의뢰서 파일명/주문 목록으로 QR을 만들 수 있으면 의뢰서만으로 실행)
+        if self.dropped_files['order_pdf'] and (self.dropped_files['print_pdf'] or self.dropped_files['qr_image']
+                                                or self.processor.can_generate_qr(self.dropped_files['order_pdf'])):
             self.status_label.config(text="처리 중...", fg="#0066cc")
             # 별도 스레드에서 실행하여 GUI가 멈추지 않도록 함
             threading.Thread(target=self.process_files, daemon=True).start()
@@ -244,7 +259,8 @@ def check_dependencies():
     required_packages = {
         'tkinterdnd2': 'tkinterdnd2',
         'fitz': 'PyMuPDF',
-        'PIL': 'Pillow'
+        'PIL': 'Pillow',
+        'numpy': 'numpy'
     }
     
     missing_packages = []
@@ -268,15 +284,10 @@ def check_dependencies():
 import tkinter as tk
 from tkinterdnd2 import DND_FILES, TkinterDnD
 import fitz  # PyMuPDF
-from PIL import Image, ImageEnhance, ImageFilter
-import os
+from PIL import Image
 from pathlib import Path
 import threading
-import shutil
 import json
-from io import BytesIO
-import time  # 시간 측정용
-import sys  # 명령줄 인자 처리용
 from tkinter import ttk, filedialog, messagebox  # 프리셋 GUI용
 
 # 설정 GUI 모듈 import
@@ -287,148 +298,24 @@ except ImportError:
     SETTINGS_GUI_AVAILABLE = False
     print("settings_gui.py 파일이 없습니다. 설정 기능이 비활성화됩니다.")
 
-# 정규화 모듈 import
-try:
-    from normalize_pdf import normalize_pdf as normalize_pdf_external
-    NORMALIZE_AVAILABLE = True
-except ImportError:
-    NORMALIZE_AVAILABLE = False
-
-# 설정 파일에서 로드 (settings.json 우선, 없으면 config.py, 그것도 없으면 기본값)
-def load_settings():
-    # 1. settings.json 확인
-    settings_path = Path("settings.json")
-    if settings_path.exists():
-        try:
-            with open(settings_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # 기존 config.py 설정과 병합
-                thumbnail_config = data.get('thumbnail', {})
-                qr_config = data.get('qr', {})
-                
-                # config.py의 기본값 적용
-                if 'white_background' not in thumbnail_config:
-                    thumbnail_config['white_background'] = True
-                if 'background_padding' not in thumbnail_config:
-                    thumbnail_config['background_padding'] = 5
-                
-                # 백지 감지 설정 추가
-                blank_detection = data.get('blank_detection', {
-                    'enabled': True,
-                    'threshold': 0.99,
-                    'edge_margin': 20,
-                    'max_pages': 10
-                })
-                
-                return {
-                    'PAGE_WIDTH': 842,
-                    'PAGE_HEIGHT': 595,
-                    'THUMBNAIL_CONFIG': thumbnail_config,
-                    'QR_CONFIG': qr_config,
-                    'GUI_CONFIG': data.get('gui', {
-                        'window_width': 500, 'window_height': 400,
-                        'always_on_top': True, 'resizable': False
-                    }),
-                    'PROCESSING_CONFIG': data.get('processing', {
-                        'overwrite_original': True,
-                        'backup_before_save': False,
-                        'backup_suffix': '_backup',
-                        'auto_normalize': True,
-                        'rasterize_final': True
-                    }),
-                    'BLANK_DETECTION': blank_detection,
-                    'DEBUG_MODE': data.get('debug', False)
-                }
-        except:
-            pass
-    
-    # 2. config.py 확인
-    try:
-        import config
-        thumbnail_config = getattr(config, 'THUMBNAIL_CONFIG', {
-            'max_width': 160, 'max_height': 250,
-            'positions': [{'x': 70, 'y': 180}, {'x': 490, 'y': 180}]
-        })
-        # 흰색 배경 옵션 추가 (기존 config.py와 호환성 유지)
-        if 'white_background' not in thumbnail_config:
-            thumbnail_config['white_background'] = True
-        if 'background_padding' not in thumbnail_config:
-            thumbnail_config['background_padding'] = 5
-            
-        return {
-            'PAGE_WIDTH': getattr(config, 'PAGE_WIDTH', 842),
-            'PAGE_HEIGHT': getattr(config, 'PAGE_HEIGHT', 595),
-            'THUMBNAIL_CONFIG': thumbnail_config,
-            'QR_CONFIG': getattr(config, 'QR_CONFIG', {
-                'max_width': 50, 'max_height': 50,
-                'positions': [{'x': 230, 'y': 470}, {'x': 650, 'y': 470}]
-            }),
-            'GUI_CONFIG': getattr(config, 'GUI_CONFIG', {
-                'window_width': 500, 'window_height': 400,
-                'always_on_top': True, 'resizable': False
-            }),
-            'PROCESSING_CONFIG': getattr(config, 'PROCESSING_CONFIG', {
-                'overwrite_original': True,
-                'backup_before_save': False,
-                'backup_suffix': '_backup',
-                'auto_normalize': True,
-                'rasterize_final': True
-            }),
-            'BLANK_DETECTION': {
-                'enabled': True,
-                'threshold': 0.99,
-                'edge_margin': 20,
-                'max_pages': 10
-            },
-            'DEBUG_MODE': getattr(config, 'DEBUG_MODE', False)
-        }
-    except ImportError:
-        pass
-    
-    # 3. 기본값 사용
-    return {
-        'PAGE_WIDTH': 842,
-        'PAGE_HEIGHT': 595,
-        'THUMBNAIL_CONFIG': {
-            'max_width': 160, 'max_height': 250,
-            'positions': [{'x': 70, 'y': 180}, {'x': 490, 'y': 180}],
-            'white_background': True,  # 흰색 배경 기본값
-            'background_padding': 5     # 배경 여백 기본값
-        },
-        'QR_CONFIG': {
-            'max_width': 50, 'max_height': 50,
-            'positions': [{'x': 230, 'y': 470}, {'x': 650, 'y': 470}]
-        },
-        'GUI_CONFIG': {
-            'window_width': 500, 'window_height': 400,
-            'always_on_top': True, 'resizable': False
-        },
-        'PROCESSING_CONFIG': {
-            'overwrite_original': True,
-            'backup_before_save': False,
-            'backup_suffix': '_backup',
-            'auto_normalize': True,
-            'rasterize_final': True
-        },
-        'BLANK_DETECTION': {
-            'enabled': True,
-            'threshold': 0.99,
-            'edge_margin': 20,
-            'max_pages': 10
-        },
-        'DEBUG_MODE': False
-    }
+# 처리 엔진과 설정 로드는 GUI 없는 핵심 모듈에 있음 (기존 import 경로 호환용 재노출)
+from print_core import settings as core_settings
+from print_core.settings import load_settings
+from print_core.processor import PrintProcessor
+from print_core.normalize import NORMALIZE_AVAILABLE
+from print_core.pixbridge import pixmap_to_image
 
 # 전역 설정 변수
-settings = load_settings()
-PAGE_WIDTH = settings['PAGE_WIDTH']
-PAGE_HEIGHT = settings['PAGE_HEIGHT']
-THUMBNAIL_CONFIG = settings['THUMBNAIL_CONFIG']
-QR_CONFIG = settings['QR_CONFIG']
-GUI_CONFIG = settings['GUI_CONFIG']
-PROCESSING_CONFIG = settings['PROCESSING_CONFIG']
-BLANK_DETECTION = settings['BLANK_DETECTION']
-DEBUG_MODE = settings['DEBUG_MODE']
+settings = core_settings.settings
+GUI_CONFIG = core_settings.GUI_CONFIG
+DEBUG_MODE = core_settings.DEBUG_MODE
+
+def reload_settings():
+    """설정 다시 로드 (GUI 설정 창, 상주 작업자에서 사용)"""
+    global settings, DEBUG_MODE
+    core_settings.reload_settings()
+    settings = core_settings.settings
+    DEBUG_MODE = core_settings.DEBUG_MODE
 
 # 좌표 프리셋 관리 클래스
 class CoordPresetManager:
@@ -1047,10 +934,7 @@ TooltipDuration={tooltip_duration}
                 # 이미지 생성
                 mat = fitz.Matrix(scale, scale)
                 pix = page.get_pixmap(matrix=mat, alpha=False)
-                img_data = pix.pil_tobytes(format="PNG")
-                
-                from io import BytesIO
-                img = Image.open(BytesIO(img_data))
+                img = pixmap_to_image(pix)
                 self.preview_image = img
                 doc.close()
                 
@@ -1177,787 +1061,10 @@ TooltipDuration={tooltip_duration}
             self.root.mainloop()
 
 
-class PrintProcessor:
-    """GUI 없이 파일 처리를 담당하는 클래스"""
-    
-    def __init__(self):
-        self.dropped_files = {
-            'order_pdf': None,
-            'print_pdf': None,
-            'qr_image': None
-        }
-        self.temp_normalized_file = None
-    
-    def classify_files(self, files):
-        """파일 목록을 분류"""
-        for file_path in files:
-            if not file_path or file_path == '""':  # 빈 문자열 처리
-                continue
-                
-            ext = Path(file_path).suffix.lower()
-            filename = os.path.basename(file_path)
-            
-            if ext == '.pdf':
-                if '의뢰서' in filename:
-                    self.dropped_files['order_pdf'] = file_path
-                else:
-                    self.dropped_files['print_pdf'] = file_path
-            elif ext in ['.jpg', '.jpeg', '.png']:
-                self.dropped_files['qr_image'] = file_path
-    
-    def process_files_cli(self, files):
-        """명령줄 모드에서 파일 처리"""
-        self.classify_files(files)
-        
-        # 필수 파일 확인
-        if not self.dropped_files['order_pdf']:
-            print("오류: 의뢰서 PDF가 없습니다.")
-            return False
-        
-        if not (self.dropped_files['print_pdf'] or self.dropped_files['qr_image']):
-            print("오류: 인쇄데이터 PDF 또는 QR 이미지가 필요합니다.")
-            return False
-        
-        # 파일 처리
-        try:
-            self.process_files()
-            return True
-        except Exception as e:
-            print(f"처리 중 오류: {e}")
-            if DEBUG_MODE:
-                import traceback
-                traceback.print_exc()
-            return False
-    
-    def calculate_fit_size(self, original_width, original_height, max_width, max_height):
-        """비율을 유지하면서 최대 크기 안에 맞는 크기 계산"""
-        ratio = min(max_width / original_width, max_height / original_height)
-        new_width = int(original_width * ratio)
-        new_height = int(original_height * ratio)
-        return new_width, new_height
-    
-    def is_blank_page(self, page, threshold=0.99, edge_margin=20):
-        """페이지가 백지인지 확인"""
-        if not BLANK_DETECTION.get('enabled', True):
-            return False
-            
-        try:
-            # 페이지를 이미지로 변환 (낮은 해상도로 빠르게 확인)
-            mat = fitz.Matrix(0.5, 0.5)  # 50% 크기로 렌더링
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            
-            # PIL 이미지로 변환
-            img_data = pix.pil_tobytes(format="PNG")
-            img = Image.open(BytesIO(img_data))
-            
-            # 그레이스케일로 변환
-            img_gray = img.convert('L')
-            
-            # 재단선 영역 제외하고 크롭
-            width, height = img_gray.size
-            if edge_margin > 0:
-                crop_box = (edge_margin, edge_margin, 
-                           width - edge_margin, height - edge_margin)
-                img_cropped = img_gray.crop(crop_box)
-            else:
-                img_cropped = img_gray
-            
-            # 픽셀 값 분석
-            pixels = list(img_cropped.getdata())
-            total_pixels = len(pixels)
-            
-            # 흰색 픽셀 수 계산 (250 이상을 흰색으로 간주)
-            white_pixels = sum(1 for pixel in pixels if pixel >= 250)
-            white_ratio = white_pixels / total_pixels
-            
-            if DEBUG_MODE:
-                print(f"  백지 검사: 흰색 픽셀 비율 {white_ratio:.2%}")
-            
-            return white_ratio >= threshold
-            
-        except Exception as e:
-            if DEBUG_MODE:
-                print(f"  백지 검사 실패: {e}")
-            return False
-    
-    def find_non_blank_page(self, pdf_path, max_pages=10):
-        """백지가 아닌 첫 페이지 찾기"""
-        if not BLANK_DETECTION.get('enabled', True):
-            return 0
-            
-        try:
-            doc = fitz.open(pdf_path)
-            threshold = BLANK_DETECTION.get('threshold', 0.99)
-            edge_margin = BLANK_DETECTION.get('edge_margin', 20)
-            max_search = min(BLANK_DETECTION.get('max_pages', 10), len(doc))
-            
-            for page_num in range(max_search):
-                page = doc[page_num]
-                
-                if DEBUG_MODE:
-                    print(f"\n  페이지 {page_num + 1} 검사 중...")
-                
-                if not self.is_blank_page(page, threshold, edge_margin):
-                    if DEBUG_MODE and page_num > 0:
-                        print(f"  -> 백지가 아닌 페이지 발견! (페이지 {page_num + 1})")
-                    doc.close()
-                    return page_num
-            
-            doc.close()
-            
-            # 모든 페이지가 백지인 경우
-            if DEBUG_MODE:
-                print(f"  -> 처음 {max_search}페이지가 모두 백지입니다. 첫 페이지 사용.")
-            return 0
-            
-        except Exception as e:
-            if DEBUG_MODE:
-                print(f"백지 검사 중 오류: {e}")
-            return 0
-    
-    def normalize_pdf_to_landscape(self, input_path):
-        """PDF를 아크로뱃에서 보이는 그대로 가로형으로 재생성 (렌더링 방식)"""
-        # 외부 normalize_pdf 모듈이 있으면 우선 사용
-        if NORMALIZE_AVAILABLE:
-            try:
-                if DEBUG_MODE:
-                    print("외부 normalize_pdf 모듈을 사용합니다.")
-                temp_path = Path(input_path).parent / f"temp_normalized_{Path(input_path).name}"
-                result = normalize_pdf_external(input_path, str(temp_path))
-                self.temp_normalized_file = str(temp_path)
-                return str(temp_path)
-            except Exception as e:
-                if DEBUG_MODE:
-                    print(f"외부 모듈 실패, 내장 방식 사용: {e}")
-        
-        # 내장 정규화 방식
-        try:
-            doc = fitz.open(input_path)
-            
-            # 표준 A4 가로형 크기
-            A4_LANDSCAPE_WIDTH = 842
-            A4_LANDSCAPE_HEIGHT = 595
-            
-            # 임시 파일로 정규화
-            temp_path = Path(input_path).parent / f"temp_normalized_{Path(input_path).name}"
-            new_doc = fitz.open()
-            
-            for page_num, page in enumerate(doc):
-                # 원본 페이지 정보
-                rect = page.rect
-                rotation = page.rotation
-                
-                if DEBUG_MODE:
-                    print(f"\n원본 페이지 {page_num + 1}:")
-                    print(f"  - 크기: {rect.width:.1f}x{rect.height:.1f}")
-                    print(f"  - 회전: {rotation}도")
-                
-                # 페이지를 아크로뱃에서 보이는 그대로 렌더링
-                # get_pixmap()은 회전이 적용된 상태로 렌더링함
-                mat = fitz.Matrix(6.0, 6.0)  # 6배 해상도로 렌더링 (고품질)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                
-                # 렌더링된 이미지의 실제 크기
-                img_width = pix.width / 6.0  # 6배로 렌더링했으므로 원래 크기로 환산
-                img_height = pix.height / 6.0
-                
-                if DEBUG_MODE:
-                    print(f"  - 렌더링된 크기: {img_width:.1f}x{img_height:.1f}")
-                    print(f"  - 6배 고해상도 렌더링")
-                
-                # 가로형인지 확인
-                is_landscape = img_width > img_height
-                
-                # 새 가로형 페이지 생성
-                new_page = new_doc.new_page(width=A4_LANDSCAPE_WIDTH, height=A4_LANDSCAPE_HEIGHT)
-                
-                # 최종 크기와 위치 변수 초기화
-                final_width = 0
-                final_height = 0
-                x_offset = 0
-                y_offset = 0
-                
-                if is_landscape:
-                    # 이미 가로형인 경우
-                    # A4 가로형에 맞게 크기 조정
-                    scale_x = A4_LANDSCAPE_WIDTH / img_width
-                    scale_y = A4_LANDSCAPE_HEIGHT / img_height
-                    scale = min(scale_x, scale_y)
-                    
-                    # 중앙 정렬을 위한 위치 계산
-                    final_width = img_width * scale
-                    final_height = img_height * scale
-                    x_offset = (A4_LANDSCAPE_WIDTH - final_width) / 2
-                    y_offset = (A4_LANDSCAPE_HEIGHT - final_height) / 2
-                    
-                    # 대상 영역
-                    target_rect = fitz.Rect(x_offset, y_offset, 
-                                           x_offset + final_width, 
-                                           y_offset + final_height)
-                    
-                    # 가로형은 렌더링된 픽스맵을 직접 삽입
-                    new_page.insert_image(target_rect, pixmap=pix)
-                else:
-                    # 세로형인 경우 - 90도 회전하여 가로로 만들기
-                    # 회전 후 크기로 계산
-                    scale_x = A4_LANDSCAPE_WIDTH / img_height
-                    scale_y = A4_LANDSCAPE_HEIGHT / img_width
-                    scale = min(scale_x, scale_y)
-                    
-                    # 중앙 정렬을 위한 위치 계산
-                    final_width = img_height * scale
-                    final_height = img_width * scale
-                    x_offset = (A4_LANDSCAPE_WIDTH - final_width) / 2
-                    y_offset = (A4_LANDSCAPE_HEIGHT - final_height) / 2
-                    
-                    # 픽스맵을 PIL 이미지로 변환
-                    img_data = pix.pil_tobytes(format="PNG")
-                    img = Image.open(BytesIO(img_data))
-                    
-                    # 90도 회전
-                    img = img.rotate(-90, expand=True)
-                    
-                    # 다시 바이트로 변환
-                    img_buffer = BytesIO()
-                    img.save(img_buffer, format="PNG", optimize=True)
-                    img_bytes = img_buffer.getvalue()
-                    
-                    # 대상 영역
-                    target_rect = fitz.Rect(x_offset, y_offset, 
-                                           x_offset + final_width, 
-                                           y_offset + final_height)
-                    
-                    # 회전된 이미지 삽입
-                    new_page.insert_image(target_rect, stream=img_bytes)
-                    
-                    if DEBUG_MODE:
-                        print(f"  - 세로형 → 가로형 변환 완료")
-                
-                if DEBUG_MODE:
-                    print(f"  - 최종 크기: {final_width:.1f}x{final_height:.1f}")
-                    print(f"  - 위치: ({x_offset:.1f}, {y_offset:.1f})")
-            
-            # 저장
-            new_doc.save(str(temp_path))
-            new_doc.close()
-            doc.close()
-            
-            self.temp_normalized_file = str(temp_path)
-            
-            if DEBUG_MODE:
-                print(f"\nPDF 정규화 완료: {temp_path}")
-            
-            return str(temp_path)
-            
-        except Exception as e:
-            if DEBUG_MODE:
-                print(f"PDF 정규화 실패: {e}")
-                import traceback
-                traceback.print_exc()
-            return input_path
-    
-    def create_pdf_thumbnail(self, pdf_path, page_num=0, crop_right_half=False):
-        """PDF 페이지를 직접 사용하여 고품질 삽입용 데이터 생성"""
-        try:
-            # 백지가 아닌 페이지 찾기
-            if BLANK_DETECTION.get('enabled', True) and page_num == 0:
-                non_blank_page = self.find_non_blank_page(pdf_path)
-                if non_blank_page > 0:
-                    print(f"  - 백지 감지: 페이지 {non_blank_page + 1}을 썸네일로 사용")
-                    page_num = non_blank_page
-            
-            doc = fitz.open(pdf_path)
-            page = doc[page_num]
-            
-            # 표지 크롭 처리를 위한 임시 PDF 생성
-            if crop_right_half:
-                # 오른쪽 50%만 사용하는 임시 PDF 생성
-                temp_doc = fitz.open()
-                # 페이지 크기의 절반으로 새 페이지 생성
-                new_width = page.rect.width / 2
-                new_height = page.rect.height
-                temp_page = temp_doc.new_page(width=new_width, height=new_height)
-                
-                # 오른쪽 절반만 복사
-                source_rect = fitz.Rect(page.rect.width/2, 0, page.rect.width, page.rect.height)
-                temp_page.show_pdf_page(temp_page.rect, doc, page_num, clip=source_rect)
-                
-                # 임시 PDF를 메모리에 저장
-                pdf_bytes = temp_doc.tobytes()
-                
-                # 크기 정보 저장
-                width = new_width
-                height = new_height
-                
-                temp_doc.close()
-                doc.close()
-                
-                return pdf_bytes, width, height
-            else:
-                # 전체 페이지 사용
-                # 단일 페이지 PDF를 메모리에 저장
-                temp_doc = fitz.open()
-                temp_page = temp_doc.new_page(width=page.rect.width, height=page.rect.height)
-                temp_page.show_pdf_page(temp_page.rect, doc, page_num)
-                
-                pdf_bytes = temp_doc.tobytes()
-                
-                # 크기 정보 저장
-                width = page.rect.width
-                height = page.rect.height
-                
-                temp_doc.close()
-                doc.close()
-                
-                return pdf_bytes, width, height
-                
-        except Exception as e:
-            if DEBUG_MODE:
-                print(f"PDF 썸네일 생성 실패: {e}")
-                import traceback
-                traceback.print_exc()
-            raise e
-    
-    def get_normalized_rect(self, x, y, width, height, page):
-        """정규화된 가로형 PDF에서는 좌표 변환이 필요 없음"""
-        return fitz.Rect(x, y, x + width, y + height)
-    
-    def draw_white_background(self, page, x, y, width, height, padding=0):
-        """썸네일 뒤에 흰색 배경 그리기"""
-        # 패딩을 포함한 사각형 좌표
-        rect = fitz.Rect(
-            x - padding,
-            y - padding,
-            x + width + padding,
-            y + height + padding
-        )
-        
-        # 흰색 배경 그리기
-        shape = page.new_shape()
-        shape.draw_rect(rect)
-        shape.finish(
-            fill=(1, 1, 1),  # 흰색 (RGB: 1, 1, 1)
-            stroke_opacity=0  # 테두리 없음
-        )
-        shape.commit()
-        
-        if DEBUG_MODE:
-            print(f"    - 흰색 배경 추가: {rect.width:.1f}x{rect.height:.1f} (패딩: {padding})")
-    
-    def process_files(self):
-        """파일 처리 메인 로직"""
-        try:
-            start_time = time.time()
-            
-            print("\n" + "="*60)
-            print("인쇄 의뢰서 자동화 처리 시작")
-            print("="*60)
-            
-            if DEBUG_MODE:
-                print("\n[디버그 모드 활성화]")
-                print(f"의뢰서 PDF: {self.dropped_files['order_pdf']}")
-                print(f"인쇄데이터 PDF: {self.dropped_files['print_pdf']}")
-                print(f"QR 이미지: {self.dropped_files['qr_image']}")
-            
-            # PDF 썸네일과 QR 데이터 초기화
-            pdf_thumb_data = None
-            thumb_pdf_w = thumb_pdf_h = 0
-            thumbnail_data = None  # 대체 이미지 방식용
-            thumb_w = thumb_h = 0
-            qr_data = None
-            qr_w = qr_h = 0
-            
-            # 1. 인쇄데이터 PDF가 있으면 PDF 직접 삽입용 데이터 생성
-            if self.dropped_files['print_pdf']:
-                print("\n1. 인쇄 데이터 PDF 처리 중...")
-                
-                try:
-                    # 파일명에 '표지' 포함 여부 확인
-                    filename = os.path.basename(self.dropped_files['print_pdf'])
-                    crop_right_half = '표지' in filename
-                    
-                    if crop_right_half:
-                        print("  - 표지 파일 감지: 오른쪽 50%만 사용")
-                    
-                    # PDF 파일 확인
-                    if not os.path.exists(self.dropped_files['print_pdf']):
-                        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {self.dropped_files['print_pdf']}")
-                    
-                    # PDF 직접 삽입용 데이터 생성
-                    pdf_thumb_data, thumb_pdf_w, thumb_pdf_h = self.create_pdf_thumbnail(
-                        self.dropped_files['print_pdf'],
-                        page_num=0,
-                        crop_right_half=crop_right_half
-                    )
-                    
-                    print(f"  - PDF 썸네일 준비 완료: {thumb_pdf_w:.1f}x{thumb_pdf_h:.1f}")
-                    print(f"  - 벡터 형식 유지 (품질 손실 없음)")
-                    
-                except Exception as e:
-                    print(f"  - PDF 처리 실패: {e}")
-                    print("  - 대체 방법: 이미지로 변환하여 처리합니다.")
-                    
-                    # 실패 시 기존 이미지 방식으로 대체
-                    try:
-                        # 백지가 아닌 페이지 찾기
-                        page_num = 0
-                        if BLANK_DETECTION.get('enabled', True):
-                            page_num = self.find_non_blank_page(self.dropped_files['print_pdf'])
-                        
-                        print_doc = fitz.open(self.dropped_files['print_pdf'])
-                        first_page = print_doc[page_num]
-                        
-                        # 이미지로 변환
-                        mat = fitz.Matrix(2, 2)  # 2배 스케일
-                        pix = first_page.get_pixmap(matrix=mat, alpha=False)
-                        img = Image.open(BytesIO(pix.pil_tobytes(format="PNG")))
-                        
-                        # 표지 크롭 처리
-                        if crop_right_half:
-                            crop_left = img.width // 2
-                            img = img.crop((crop_left, 0, img.width, img.height))
-                        
-                        # 최종 크기 계산
-                        thumb_w, thumb_h = self.calculate_fit_size(
-                            img.width, img.height,
-                            THUMBNAIL_CONFIG['max_width'],
-                            THUMBNAIL_CONFIG['max_height']
-                        )
-                        
-                        # 리사이즈
-                        img = img.resize((thumb_w, thumb_h), Image.Resampling.LANCZOS)
-                        
-                        # PNG로 저장
-                        thumb_buffer = BytesIO()
-                        img.save(thumb_buffer, format='PNG')
-                        thumbnail_data = thumb_buffer.getvalue()
-                        
-                        print_doc.close()
-                        
-                        print(f"  - 대체 이미지 썸네일 생성 완료: {thumb_w}x{thumb_h}")
-                        
-                    except Exception as e2:
-                        print(f"  - 대체 방법도 실패: {e2}")
-                        thumbnail_data = None
-            
-            # 2. QR 이미지가 있으면 로드 및 리사이즈 (개선된 방식)
-            if self.dropped_files['qr_image']:
-                print("\n2. QR 이미지 처리 중...")
-                qr_img = Image.open(self.dropped_files['qr_image'])
-                print(f"  - 원본 QR 크기: {qr_img.width}x{qr_img.height}")
-                
-                qr_max_w = QR_CONFIG['max_width']
-                qr_max_h = QR_CONFIG['max_height']
-                qr_w, qr_h = self.calculate_fit_size(
-                    qr_img.width, qr_img.height, qr_max_w, qr_max_h
-                )
-                
-                print(f"  - 목표 QR 크기: {qr_max_w}x{qr_max_h}")
-                print(f"  - 조정된 크기: {qr_w}x{qr_h}")
-                
-                # QR 코드에 최적화된 리사이즈 (NEAREST + 샤프닝)
-                qr_img = qr_img.resize((qr_w, qr_h), Image.Resampling.NEAREST)
-                
-                # 샤프닝 필터 적용으로 경계선 강화
-                enhancer = ImageEnhance.Sharpness(qr_img)
-                qr_img = enhancer.enhance(2.0)  # 샤프니스 2배 증가
-                
-                print("  - QR 코드 최적화: NEAREST 리샘플링 + 샤프닝 적용")
-                
-                # PIL 이미지를 바이트로 변환
-                qr_buffer = BytesIO()
-                qr_img.save(qr_buffer, format='PNG')
-                qr_data = qr_buffer.getvalue()
-            
-            # 3. 백업 생성 (설정된 경우)
-            if PROCESSING_CONFIG['backup_before_save']:
-                backup_path = Path(self.dropped_files['order_pdf'])
-                backup_name = backup_path.stem + PROCESSING_CONFIG['backup_suffix'] + backup_path.suffix
-                backup_full_path = backup_path.parent / backup_name
-                shutil.copy2(self.dropped_files['order_pdf'], backup_full_path)
-                if DEBUG_MODE:
-                    print(f"\n백업 생성: {backup_full_path}")
-            
-            # 4. 의뢰서 PDF 정규화 (자동 정규화 설정된 경우)
-            order_pdf_path = self.dropped_files['order_pdf']
-            is_normalized = False
-            
-            # 파일명으로 정규화 필요 여부 추가 체크
-            filename = os.path.basename(order_pdf_path)
-            skip_normalize = 'skip_norm' in filename.lower()
-            
-            if PROCESSING_CONFIG.get('auto_normalize', True) and not skip_normalize:
-                print("\n3. PDF 정규화 중...")
-                print("  - 벡터 방식으로 페이지 재구성")
-                normalized_path = self.normalize_pdf_to_landscape(order_pdf_path)
-                if normalized_path != order_pdf_path:
-                    order_pdf_path = normalized_path
-                    is_normalized = True
-                    print("  - PDF 정규화 완료!")
-            elif skip_normalize:
-                print("\n파일명에 'skip_norm'이 포함되어 정규화를 건너뜁니다.")
-            
-            # 5. 의뢰서 PDF 열기 및 수정
-            print("\n4. 의뢰서 PDF 처리 중...")
-            order_doc = fitz.open(order_pdf_path)
-            
-            # 흰색 배경 설정 확인
-            use_white_bg = THUMBNAIL_CONFIG.get('white_background', True)
-            bg_padding = THUMBNAIL_CONFIG.get('background_padding', 5)
-            
-            if use_white_bg and DEBUG_MODE:
-                print(f"  - 썸네일 흰색 배경 활성화 (패딩: {bg_padding}px)")
-            
-            for page_num in range(len(order_doc)):
-                page = order_doc[page_num]
-                
-                print(f"\n  페이지 {page_num + 1}/{len(order_doc)}:")
-                print(f"    - 크기: {page.rect.width:.1f}x{page.rect.height:.1f}")
-                print(f"    - 회전: {page.rotation}도")
-                
-                # 썸네일 삽입 (PDF 또는 이미지)
-                if pdf_thumb_data:
-                    # PDF 직접 삽입
-                    inserted_count = 0
-                    
-                    try:
-                        # 임시 PDF 문서 생성
-                        thumb_doc = fitz.open(stream=pdf_thumb_data, filetype="pdf")
-                        thumb_page = thumb_doc[0]
-                        
-                        for pos in THUMBNAIL_CONFIG['positions']:
-                            # 목표 크기 계산
-                            thumb_w, thumb_h = self.calculate_fit_size(
-                                thumb_pdf_w, thumb_pdf_h,
-                                THUMBNAIL_CONFIG['max_width'],
-                                THUMBNAIL_CONFIG['max_height']
-                            )
-                            
-                            # 중앙 정렬을 위한 오프셋 계산
-                            x_offset = (THUMBNAIL_CONFIG['max_width'] - thumb_w) // 2
-                            y_offset = (THUMBNAIL_CONFIG['max_height'] - thumb_h) // 2
-                            
-                            # 실제 위치
-                            actual_x = pos['x'] + x_offset
-                            actual_y = pos['y'] + y_offset
-                            
-                            # 흰색 배경 그리기 (설정된 경우)
-                            if use_white_bg:
-                                self.draw_white_background(
-                                    page, actual_x, actual_y, 
-                                    thumb_w, thumb_h, bg_padding
-                                )
-                            
-                            # 대상 위치와 크기
-                            target_rect = fitz.Rect(
-                                actual_x, actual_y,
-                                actual_x + thumb_w,
-                                actual_y + thumb_h
-                            )
-                            
-                            # PDF 페이지 직접 삽입 (벡터 유지)
-                            page.show_pdf_page(target_rect, thumb_doc, 0)
-                            inserted_count += 1
-                        
-                        thumb_doc.close()
-                        print(f"    - PDF 썸네일 {inserted_count}개 삽입 (벡터 품질)")
-                        
-                    except Exception as e:
-                        print(f"    - PDF 삽입 실패: {e}")
-                        print(f"    - 이미지 방식으로 재시도합니다.")
-                        # 이미지 방식으로 대체
-                        if thumbnail_data:
-                            inserted_count = 0
-                            for pos in THUMBNAIL_CONFIG['positions']:
-                                x_offset = (THUMBNAIL_CONFIG['max_width'] - thumb_w) // 2
-                                y_offset = (THUMBNAIL_CONFIG['max_height'] - thumb_h) // 2
-                                
-                                actual_x = pos['x'] + x_offset
-                                actual_y = pos['y'] + y_offset
-                                
-                                # 흰색 배경 그리기 (설정된 경우)
-                                if use_white_bg:
-                                    self.draw_white_background(
-                                        page, actual_x, actual_y,
-                                        thumb_w, thumb_h, bg_padding
-                                    )
-                                
-                                rect = self.get_normalized_rect(
-                                    actual_x, actual_y,
-                                    thumb_w, thumb_h,
-                                    page
-                                )
-                                page.insert_image(rect, stream=thumbnail_data)
-                                inserted_count += 1
-                            print(f"    - 이미지 썸네일 {inserted_count}개 삽입")
-                
-                elif thumbnail_data:
-                    # 이미지 방식 (대체)
-                    inserted_count = 0
-                    for pos in THUMBNAIL_CONFIG['positions']:
-                        x_offset = (THUMBNAIL_CONFIG['max_width'] - thumb_w) // 2
-                        y_offset = (THUMBNAIL_CONFIG['max_height'] - thumb_h) // 2
-                        
-                        actual_x = pos['x'] + x_offset
-                        actual_y = pos['y'] + y_offset
-                        
-                        # 흰색 배경 그리기 (설정된 경우)
-                        if use_white_bg:
-                            self.draw_white_background(
-                                page, actual_x, actual_y,
-                                thumb_w, thumb_h, bg_padding
-                            )
-                        
-                        rect = self.get_normalized_rect(
-                            actual_x, actual_y,
-                            thumb_w, thumb_h,
-                            page
-                        )
-                        page.insert_image(rect, stream=thumbnail_data)
-                        inserted_count += 1
-                    print(f"    - 이미지 썸네일 {inserted_count}개 삽입")
-                
-                # QR 코드 삽입 (QR 이미지가 있는 경우)
-                if qr_data:
-                    inserted_count = 0
-                    for pos in QR_CONFIG['positions']:
-                        # 중앙 정렬을 위한 오프셋 계산
-                        x_offset = (QR_CONFIG['max_width'] - qr_w) // 2
-                        y_offset = (QR_CONFIG['max_height'] - qr_h) // 2
-                        
-                        # 정규화된 PDF는 좌표 변환 불필요
-                        rect = self.get_normalized_rect(
-                            pos['x'] + x_offset,
-                            pos['y'] + y_offset,
-                            qr_w,
-                            qr_h,
-                            page
-                        )
-                        page.insert_image(rect, stream=qr_data)
-                        inserted_count += 1
-                    print(f"    - QR 코드 {inserted_count}개 삽입")
-            
-            # 6. 저장
-            print("\n5. 저장 중...")
-            
-            # 래스터화 옵션 확인
-            should_rasterize = PROCESSING_CONFIG.get('rasterize_final', True)
-            
-            if should_rasterize:
-                print("  - 최종 PDF 래스터화 활성화 (품질 유지 + 용량 최적화)")
-                # 래스터화된 새 문서 생성
-                raster_doc = fitz.open()
-                
-                for page_num in range(len(order_doc)):
-                    page = order_doc[page_num]
-                    
-                    # 페이지를 고해상도로 래스터화
-                    pix = page.get_pixmap(dpi=200, alpha=False)  # 200 DPI로 래스터화
-                    
-                    # 새 페이지 생성
-                    new_page = raster_doc.new_page(width=page.rect.width, height=page.rect.height)
-                    
-                    # 래스터화된 이미지 삽입
-                    new_page.insert_image(new_page.rect, pixmap=pix)
-                
-                # 래스터화된 문서로 교체
-                order_doc.close()
-                order_doc = raster_doc
-                print("  - 래스터화 완료")
-            
-            if PROCESSING_CONFIG['overwrite_original']:
-                # 정규화된 파일인 경우 특별 처리
-                if is_normalized and self.temp_normalized_file:
-                    # 수정된 내용을 임시 파일에 저장
-                    temp_save_path = str(Path(self.temp_normalized_file).parent / f"save_{Path(self.temp_normalized_file).name}")
-                    order_doc.save(temp_save_path, garbage=4, deflate=True)
-                    order_doc.close()
-                    
-                    # 임시 저장 파일을 원본으로 이동
-                    shutil.move(temp_save_path, self.dropped_files['order_pdf'])
-                    
-                    # 정규화 임시 파일 삭제
-                    try:
-                        if os.path.exists(self.temp_normalized_file):
-                            os.remove(self.temp_normalized_file)
-                    except:
-                        pass
-                    self.temp_normalized_file = None
-                else:
-                    # 정규화되지 않은 원본 파일인 경우
-                    order_doc.save(self.dropped_files['order_pdf'], garbage=4, deflate=True)
-                    order_doc.close()
-                
-                print(f"  - 원본 파일 덮어쓰기 완료: {os.path.basename(self.dropped_files['order_pdf'])}")
-            else:
-                # 새 파일로 저장
-                save_path = Path(self.dropped_files['order_pdf'])
-                new_name = save_path.stem + '_processed' + save_path.suffix
-                new_path = save_path.parent / new_name
-                order_doc.save(str(new_path), garbage=4, deflate=True)
-                order_doc.close()
-                
-                # 정규화 임시 파일 삭제 (있는 경우)
-                if self.temp_normalized_file and os.path.exists(self.temp_normalized_file):
-                    try:
-                        os.remove(self.temp_normalized_file)
-                    except:
-                        pass
-                    self.temp_normalized_file = None
-                
-                print(f"  - 새 파일로 저장: {new_name}")
-            
-            print("\n✅ 모든 처리가 완료되었습니다!")
-            
-            # 처리 시간 계산
-            end_time = time.time()
-            processing_time = end_time - start_time
-            print(f"⏱️  처리 시간: {processing_time:.2f}초")
-            
-            # 파일 크기 정보 출력
-            if os.path.exists(self.dropped_files['order_pdf']):
-                file_size = os.path.getsize(self.dropped_files['order_pdf']) / 1024 / 1024  # MB
-                print(f"📄 최종 파일 크기: {file_size:.2f} MB")
-            
-            print("="*60 + "\n")
-            
-        except Exception as e:
-            error_msg = str(e)
-            print("\n" + "="*60)
-            print("❌ 오류 발생!")
-            print("="*60)
-            print(f"오류 내용: {error_msg}")
-            
-            if DEBUG_MODE:
-                import traceback
-                print("\n[상세 오류 정보]")
-                traceback.print_exc()
-            
-            print("="*60 + "\n")
-            raise e
-
-
 # 메인 실행 블록
 if __name__ == "__main__":
-    # 명령줄 인자 확인
-    if len(sys.argv) > 1 and "--cli" in sys.argv:
-        # CLI 모드 실행
-        if not check_dependencies():
-            sys.exit(1)
-            
-        # --cli를 제외한 파일 경로들 추출
-        files = [arg for arg in sys.argv[1:] if arg != "--cli" and os.path.exists(arg)]
-        
-        if not files:
-            print("오류: 처리할 파일이 없습니다.")
-            sys.exit(1)
-        
-        # 파일 처리
-        processor = PrintProcessor()
-        success = processor.process_files_cli(files)
-        sys.exit(0 if success else 1)
-    
-    elif len(sys.argv) > 1 and "--coord-presets" in sys.argv:
+    # 명령줄 인자 확인 (--cli, --daemon 모드는 파일 맨 위에서 처리)
+    if len(sys.argv) > 1 and "--coord-presets" in sys.argv:
         # 좌표 프리셋 관리 모드
         if check_dependencies():
             manager = CoordPresetManager()
@@ -326,9 +326,10 @@ class EnhancedPrintAutomationGUI:
     
     def check_and_process(self):
         """파일 준비 확인 및 자동 처리"""
-        # 최소 2개 파일 필요 (의뢰서 + (인쇄물 또는 QR))
+        # 최소 2개 파일 필요 (의뢰서 + (인쇄물 또는 QR)), QR 생성을 켜면 의뢰서만으로도 처리
         if self.dropped_files['order_pdf'] and \
-           (self.dropped_files['print_pdf'] or self.dropped_files['qr_image']):
+           (self.dropped_files['print_pdf'] or self.dropped_files['qr_image']
+            or self.processor.can_generate_qr()):
             
             # 자동 처리 시작
             self.process_files()
@@ -381,10 +382,6 @@ class EnhancedPrintAutomationGUI:
         self.status_label.config(text="대기 중...", fg="#666666")
         self.progress_label.config(text="")
         self.drop_label.config(text="파일을 여기에 드롭하세요")
-        
-        # 캐시 비우기 (선택적)
-        if hasattr(self.processor, 'clear_cache'):
-            self.processor.clear_cache()
     
     def open_enhanced_settings(self):
         """고급 설정 창 열기"""
@@ -406,6 +403,8 @@ class EnhancedPrintAutomationGUI:
         print("향상된 설정이 다시 로드되었습니다.")
         
         # 성능 설정 적용
+        self.processor.blank_detection_cache.set_limit(
+            self.processor.settings["performance"].get("cache_size_mb", 100))
         if self.processor.settings["performance"]["multithreading"]:
             from concurrent.futures import ThreadPoolExecutor
             self.processor.executor = ThreadPoolExecutor(
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+인쇄 자동화 핵심 모듈 (GUI 의존성 없음)
+
+- settings  : settings.json / config.py 설정 로드
+- processor : PrintProcessor (의뢰서 처리 엔진)
+- blank     : 백지 감지
+- normalize : PDF 가로형 정규화
+- overlay   : 배경/썸네일/QR 레이어를 한 번 만들어 모든 페이지에 얹기
+- proxy     : 고해상도 사진을 썸네일 크기에 맞게 줄인 사본 페이지 (프록시 썸네일)
+- thumbsource : 래스터 썸네일 원본 선택 (/Thumb, 페이지 전체 JPEG/이미지, 렌더링)
+- contactsheet : 여러 페이지 썸네일을 격자로 모은 벡터 페이지 (N-up)
+- effects   : 썸네일 흑백/대비/선명도 (변환표 + NumPy, PIL과 같은 결과)
+- qrvector  : QR 이미지의 모듈 격자를 읽어 벡터 사각형으로 다시 그림
+- qrgen     : QR 이미지 없이 의뢰서 파일명/주문 목록으로 QR 생성 (벡터)
+- raster    : 최종 PDF 래스터화 (작업 프로세스로 나눠 처리, 페이지 내용에 맞는 압축)
+- composite : 래스터화 합성 경로 (정규화/오버레이/래스터화를 페이지마다 렌더링 한 번으로)
+- saving    : 저장 방식 (fast/compact/incremental)
+- output    : 결과 파일 원자적 기록 (임시 파일 → 바꿔치기), 링크/복제 백업, 남은 임시 파일 정리
+- resources : 같은 이미지는 문서에 한 번만 기록하고 xref 재사용, 리소스 요약
+- profile   : DocumentProfile (파일을 한 번 열어 분석하고 모든 단계가 공유)
+- pixbridge : Pixmap ↔ NumPy/PIL 변환 (PNG 왕복 없음)
+- fingerprint : 페이지 지문 (내용 스트림 + 리소스 + 검사 조건)
+- cache     : 크기 제한이 있는 디스크 캐시 (SQLite, LRU)
+- cli       : 명령줄(--cli) 진입점
+
+무거운 모듈(PyMuPDF, PIL)은 실제로 사용할 때 로드되도록
+PrintProcessor 등은 처음 접근할 때 불러옴
+"""
+
+_LAZY_EXPORTS = {
+    'PrintProcessor': ('processor', 'PrintProcessor'),
+    'load_settings': ('settings', 'load_settings'),
+    'reload_settings': ('settings', 'reload_settings'),
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        module_name, attr = _LAZY_EXPORTS[name]
+        module = importlib.import_module(f'{__name__}.{module_name}')
+        return getattr(module, attr)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
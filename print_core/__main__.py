@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+"""python -m print_core [파일들...] / --import-report"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
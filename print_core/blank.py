@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+
+"""
+백지 감지 모듈
+페이지를 그레이스케일로 바로 렌더링하고 NumPy로 흰색 픽셀 비율과 엔트로피를 계산
+
+알고리즘 (threshold는 0~1 비율, 향상된 설정의 %값은 100으로 나눠 전달):
+- ratio     : 250 이상을 흰색으로, 흰색 비율 >= threshold 이면 백지 (기본 처리 엔진)
+- simple    : 250 초과를 흰색으로, 흰색 비율 >  threshold 이면 백지
+- histogram : 250 이상을 흰색으로, 흰색 비율 >  threshold 이면 백지
+- entropy   : 밝기 엔트로피 < 10 x (1 - threshold) 이면 백지
+
+렌더링 전에 페이지 구조(내용 스트림, 글자, 도형, 이미지 배치)로 쉬운 경우를 먼저 판정
+- 그려지는 잉크가 없는 페이지 → 순백 페이지로 보고 알고리즘 조건을 그대로 적용
+- 글자/도형의 잉크 추정량이 허용치의 2배 이상이고 나중에 덮는 것이 없음 → 잉크 있음
+- 그 밖(이미지, 흰 사각형으로 덮인 내용 등)은 렌더링하여 판정
+- 렌더링 배율이 낮으면(PRECHECK_MIN_ZOOM 미만, 기본 처리 엔진의 0.5배) 큰 이미지가 있는 페이지만 구조로 판정
+  (0.5배 렌더링은 글자/도형 분석보다 빠르지만, 사진이 크면 렌더링 시간의 대부분이 이미지 디코딩)
+"""
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+
+ALGORITHMS = ('ratio', 'simple', 'entropy', 'histogram')
+
+# 기본 처리 엔진의 검사 조건 (50% 크기, 재단선 20px 제외)
+DEFAULT_PARAMS = {
+    'algorithm': 'ratio',
+    'threshold': 0.99,
+    'zoom': 0.5,
+    'margins': (20, 20, 20, 20),  # 렌더링 픽셀 기준 (왼쪽, 위, 오른쪽, 아래)
+    'precheck': True,
+}
+
+# 구조 판정 결과
+STRUCTURE_BLANK = 'blank'
+STRUCTURE_INKED = 'inked'
+
+# get_bboxlog() 항목 중 실제로 칠해지는 것
+_PAINT_KINDS = ('fill-path', 'stroke-path', 'fill-text', 'stroke-text',
+                'fill-image', 'fill-imgmask', 'fill-shade')
+_COVER_KINDS = ('fill-image', 'fill-imgmask', 'fill-shade')
+
+# 글자 상자 면적 중 실제 잉크 비율 추정치
+# (150dpi 측정: 일반 글자 0.2~0.3, 점/밑줄만 있는 줄 0.05 → 판정 시 2배 여유로 보정)
+TEXT_INK_RATIO = 0.1
+
+# 이보다 낮은 배율에서는 렌더링이 구조 분석보다 빠르므로 빈 내용 확인만 수행
+# 단, 이미지 픽셀 수 합이 PRECHECK_IMAGE_PIXELS 이상이면 디코딩이 더 느리므로 구조로 판정
+PRECHECK_MIN_ZOOM = 1.0
+PRECHECK_IMAGE_PIXELS = 1000000
+
+# 작업 단위 검사 통계 (reset_stats()로 초기화)
+stats = {'pages': 0, 'structure_blank': 0, 'structure_inked': 0, 'rendered': 0}
+
+
+def make_params(algorithm='ratio', threshold=0.99, zoom=0.5, margins=(20, 20, 20, 20),
+                precheck=True):
+    """detect_blank_pages용 설정 딕셔너리 생성"""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"지원하지 않는 백지 감지 알고리즘: {algorithm}")
+    return {
+        'algorithm': algorithm,
+        'threshold': threshold,
+        'zoom': zoom,
+        'margins': tuple(margins),
+        'precheck': precheck,
+    }
+
+
+def enhanced_params(blank_settings):
+    """향상된 설정(enhanced_settings.json의 blank_detection)을 엔진 설정으로 변환"""
+    exclude = blank_settings.get("exclude_areas", {})
+    return make_params(
+        algorithm=blank_settings.get("algorithm", "simple"),
+        threshold=blank_settings.get("threshold", 95) / 100,
+        zoom=150 / 72,  # 150 DPI
+        margins=(exclude.get("left_margin", 0), exclude.get("header", 0),
+                 exclude.get("right_margin", 0), exclude.get("footer", 0)),
+        precheck=blank_settings.get("precheck", True)
+    )
+
+
+def reset_stats():
+    """작업 단위 검사 통계 초기화"""
+    for key in stats:
+        stats[key] = 0
+
+
+def describe_stats():
+    """작업 로그용 검사 통계 (검사한 페이지가 없으면 빈 문자열)"""
+    if not stats['pages']:
+        return ""
+    avoided = stats['structure_blank'] + stats['structure_inked']
+    return (f"{stats['pages']}페이지 검사, 렌더링 생략 {avoided}페이지 "
+            f"(빈 페이지 {stats['structure_blank']}, 잉크 확인 {stats['structure_inked']})")
+
+
+def _is_white(color, opacity=1, tolerance=0.02):
+    """흰 종이 위에서 흰색으로 보이는지 (Gray/RGB는 모두 1, CMYK는 모두 0에 가까우면 흰색)
+
+    opacity: 불투명도 (흰 바탕과 섞은 색으로 판단, 거의 투명한 검정 글자는 렌더링하면 흰색)
+    """
+    if not color:
+        return False
+    if len(color) == 4:
+        return max(color) * opacity <= tolerance
+    return (1 - min(color)) * opacity <= tolerance
+
+
+def _clip(bbox, inner):
+    """두 영역의 교집합 (x0, y0, x1, y1), 겹치지 않으면 None
+
+    페이지당 수백 개의 영역을 다루므로 fitz.Rect 대신 튜플로 계산
+    """
+    x0, y0 = max(bbox[0], inner[0]), max(bbox[1], inner[1])
+    x1, y1 = min(bbox[2], inner[2]), min(bbox[3], inner[3])
+    if x0 > x1 or y0 > y1:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def _area(bbox):
+    return (bbox[2] - bbox[0]) * (bbox[3] - bbox[1])
+
+
+def _inner_rect(page, params):
+    """여백을 뺀 검사 영역 (글자/도형 좌표와 같은 회전 전 페이지 좌표)"""
+    zoom = params['zoom']
+    left, top, right, bottom = (margin / zoom for margin in params['margins'])
+    rect = page.rect
+    inner = fitz.Rect(rect.x0 + left, rect.y0 + top, rect.x1 - right, rect.y1 - bottom)
+    if inner.is_empty:
+        # 여백이 페이지보다 크면 전체 영역 사용 (page_histogram과 같은 규칙)
+        inner = fitz.Rect(rect)
+    return tuple(inner * page.derotation_matrix)
+
+
+def _draws_nothing(page):
+    """내용 스트림, XObject, 주석이 모두 없어 아무것도 그려지지 않는 페이지인지"""
+    if page.first_annot is not None or page.first_widget is not None:
+        return False
+    # 내용이 있는 페이지는 스트림을 풀지 않고 길이만으로 바로 걸러냄
+    doc = page.parent
+    for xref in page.get_contents():
+        length = doc.xref_get_key(xref, 'Length')[1]
+        if length.isdigit() and int(length) > 64:
+            return False
+    return not page.read_contents().strip() and not page.get_xobjects()
+
+
+def _image_pixels(page):
+    """페이지(폼 XObject 포함)가 사용하는 이미지의 픽셀 수 합 (디코딩 없이 사전 항목으로)"""
+    return sum(width * height for _, _, width, height, *_ in page.get_images())
+
+
+def _stroke_area(path):
+    """선 면적 추정 (선분 길이 x 선 두께, 곡선은 현의 길이로 낮춰 잡음)"""
+    length = 0.0
+    for item in path['items']:
+        if item[0] == 'l' or item[0] == 'c':
+            start, end = item[1], item[-1]
+            length += abs(end - start)
+        elif item[0] == 're':
+            length += (item[1].width + item[1].height) * 2
+        elif item[0] == 'qu':
+            quad = item[1]
+            length += (abs(quad.ur - quad.ul) + abs(quad.lr - quad.ur) +
+                       abs(quad.ll - quad.lr) + abs(quad.ul - quad.ll))
+    return length * (path.get('width') or 1)
+
+
+def classify_structure(page, params):
+    """렌더링 없이 페이지 구조로 판정: 'blank' / 'inked' / None(렌더링 필요)
+
+    잉크 면적은 실제보다 작게 잡음 (글자는 상자 면적의 일부, 사각형이 아닌 채우기와
+    점선은 제외, 클리핑은 모든 클리핑 영역의 교집합으로 적용)
+    """
+    # 주석은 렌더링 결과에 포함되므로 렌더링하여 판정
+    if page.first_annot is not None or page.first_widget is not None:
+        return None
+
+    if _draws_nothing(page):
+        return STRUCTURE_BLANK
+
+    inner = _inner_rect(page, params)
+
+    # 칠해지는 순서대로 영역 기록 (폼 XObject 안쪽까지 포함, 순번 = seqno)
+    kinds = set()
+    covers = []  # 나중에 그려져 아래 내용을 가릴 수 있는 것: 이미지, 그라데이션, 흰 도형
+    for seqno, (kind, bbox) in enumerate(page.get_bboxlog()):
+        if kind not in _PAINT_KINDS:
+            continue
+        clipped = _clip(bbox, inner)
+        if clipped is None:
+            continue
+        kinds.add(kind)
+        if kind in _COVER_KINDS:
+            covers.append((seqno, clipped))
+    if not kinds:
+        return STRUCTURE_BLANK
+
+    has_images = bool(covers)
+    if not kinds - set(_COVER_KINDS):
+        # 이미지/그라데이션만 있으면 잉크를 추정할 수 없으므로 글자/도형 분석 없이 렌더링
+        return None
+    ink = []  # (seqno, 영역, 잉크 면적, 클리핑 시 면적 비율로 줄일 수 있는지)
+
+    if kinds & {'fill-text', 'stroke-text'}:
+        for span in page.get_texttrace():
+            # 보이지 않는 글자(OCR 레이어 등)와 흰 글자, 거의 투명한 글자는 잉크가 아님
+            if span['type'] == 3 or _is_white(span['color'], span['opacity']):
+                continue
+            if span['type'] >= 4:
+                # 글자 모양 클리핑은 영향 범위를 알 수 없음
+                return None
+            clipped = _clip(span['bbox'], inner)
+            if clipped is not None:
+                ink.append((span['seqno'], clipped, _area(clipped) * TEXT_INK_RATIO, True))
+
+    # 도형과 클리핑 영역 (클리핑은 글자에도 적용되므로 항상 확인)
+    clip = inner
+    for path in page.get_drawings(extended=True):
+        kind = path['type']
+        if kind == 'clip':
+            clip = _clip(path['scissor'], clip) if clip else None
+            continue
+        if kind == 'group':
+            # 투명도 그룹(불투명도, 혼합 모드)은 결과를 추정할 수 없음
+            return None
+        clipped = _clip(path['rect'], inner)
+        if clipped is None:
+            continue
+        fill, stroke = path.get('fill'), path.get('color')
+        fill_opacity, stroke_opacity = path.get('fill_opacity', 1), path.get('stroke_opacity', 1)
+        if fill is not None:
+            if _is_white(fill):
+                # 불투명한 흰 도형만 아래 내용을 가림 (반투명하면 아래가 비침)
+                if fill_opacity >= 1:
+                    covers.append((path['seqno'], clipped))
+            elif _is_white(fill, fill_opacity):
+                # 거의 투명한 채우기는 렌더링하면 흰색
+                pass
+            elif len(path['items']) == 1 and path['items'][0][0] in ('re', 'qu'):
+                ink.append((path['seqno'], clipped, _area(clipped), True))
+            else:
+                # 사각형이 아닌 채우기는 면적을 알 수 없으므로 가림 여부만 확인
+                ink.append((path['seqno'], clipped, 0.0, False))
+        if stroke is not None and not _is_white(stroke, stroke_opacity):
+            solid = path.get('dashes') in (None, '[] 0')
+            area = _stroke_area(path) if solid and clipped == tuple(path['rect']) else 0.0
+            ink.append((path['seqno'], clipped, area, False))
+
+    if not ink:
+        # 흰색/투명한 것만 그려졌다면 순백 페이지, 이미지가 있으면 판단 불가
+        return None if has_images else STRUCTURE_BLANK
+
+    # 엔트로피 기준은 잉크 면적으로 추정할 수 없음
+    if params['algorithm'] == 'entropy' or clip is None:
+        return None
+
+    # 나중에 그려진 흰 도형/이미지에 가릴 수 있는 잉크는 세지 않음
+    ink_area = 0.0
+    for seqno, bbox, area, scalable in ink:
+        if not area or any(cover_seqno > seqno and _clip(cover, bbox)
+                           for cover_seqno, cover in covers):
+            continue
+        visible = _clip(bbox, clip)
+        if visible == bbox:
+            ink_area += area
+        elif visible is not None and scalable:
+            ink_area += area * _area(visible) / _area(bbox)
+
+    # 잉크 추정량이 허용 비율(1 - threshold)의 2배 이상이면 확실히 잉크 있음
+    if ink_area > 0 and ink_area >= 2 * (1 - params['threshold']) * _area(inner):
+        return STRUCTURE_INKED
+
+    return None
+
+
+def page_histogram(page, zoom=0.5, margins=(0, 0, 0, 0)):
+    """페이지를 그레이스케일로 렌더링하여 여백을 뺀 영역의 밝기 히스토그램(256칸) 반환"""
+    import numpy as np
+    from .pixbridge import pixmap_to_array
+
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+    gray = pixmap_to_array(pix)[:, :, 0]
+
+    left, top, right, bottom = margins
+    height, width = gray.shape
+    region = gray[top:height - bottom, left:width - right]
+    if region.size == 0:
+        # 여백이 페이지보다 크면 전체 영역 사용
+        region = gray
+
+    return np.bincount(region.ravel(), minlength=256)
+
+
+def analyze_histograms(histograms, params):
+    """히스토그램 배열(페이지 수 x 256)로 흰색 비율, 엔트로피, 백지 여부 계산"""
+    import numpy as np
+
+    histograms = np.asarray(histograms, dtype=np.float64).reshape(-1, 256)
+    totals = np.maximum(histograms.sum(axis=1), 1)
+
+    # simple만 250 초과, 나머지는 250 이상을 흰색으로 간주
+    white_from = 251 if params['algorithm'] == 'simple' else 250
+    white_ratio = histograms[:, white_from:].sum(axis=1) / totals
+
+    # 샤논 엔트로피 (비트)
+    probs = histograms / totals[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(probs > 0, probs * np.log2(probs), 0.0)
+    entropy = 0.0 - terms.sum(axis=1)  # -0.0 방지
+
+    threshold = params['threshold']
+    algorithm = params['algorithm']
+    if algorithm == 'ratio':
+        blank = white_ratio >= threshold
+    elif algorithm == 'entropy':
+        blank = entropy < 10 * (1 - threshold)
+    else:  # simple, histogram
+        blank = white_ratio > threshold
+
+    return white_ratio, entropy, blank
+
+
+def detect_blank_pages(doc, pages=None, params=None):
+    """여러 페이지를 한 번에 백지 검사
+
+    pages: 검사할 페이지 번호 목록 (생략하면 전체)
+    params: make_params()/enhanced_params() 결과 (생략하면 기본 처리 엔진 조건)
+    반환값: {'pages', 'white_ratio', 'entropy', 'blank', 'method'} (페이지 순서대로 NumPy 배열)
+            method는 'structure'(렌더링 생략) 또는 'render',
+            구조로 잉크가 확인된 페이지의 white_ratio/entropy는 측정하지 않으므로 NaN
+    """
+    import numpy as np
+
+    params = params or DEFAULT_PARAMS
+    pages = list(range(len(doc)) if pages is None else pages)
+
+    histograms = np.zeros((len(pages), 256), dtype=np.int64)
+    method = np.empty(len(pages), dtype=object)
+    inked = np.zeros(len(pages), dtype=bool)
+
+    for index, page_num in enumerate(pages):
+        page = doc[page_num]
+        if not params.get('precheck', True):
+            verdict = None
+        elif params['zoom'] >= PRECHECK_MIN_ZOOM or _image_pixels(page) >= PRECHECK_IMAGE_PIXELS:
+            verdict = classify_structure(page, params)
+        else:
+            verdict = STRUCTURE_BLANK if _draws_nothing(page) else None
+        stats['pages'] += 1
+
+        if verdict == STRUCTURE_BLANK:
+            # 순백 페이지와 같은 히스토그램으로 알고리즘 조건을 그대로 적용
+            histograms[index, 255] = 1
+            method[index] = 'structure'
+            stats['structure_blank'] += 1
+        elif verdict == STRUCTURE_INKED:
+            inked[index] = True
+            method[index] = 'structure'
+            stats['structure_inked'] += 1
+        else:
+            histograms[index] = page_histogram(page, params['zoom'], params['margins'])
+            method[index] = 'render'
+            stats['rendered'] += 1
+
+    white_ratio, entropy, blank = analyze_histograms(histograms, params)
+    white_ratio[inked] = np.nan
+    entropy[inked] = np.nan
+    blank[inked] = False
+
+    return {
+        'pages': np.array(pages, dtype=np.int64),
+        'white_ratio': white_ratio,
+        'entropy': entropy,
+        'blank': blank,
+        'method': method,
+    }
+
+
+def is_blank_page(page, threshold=0.99, edge_margin=20):
+    """페이지가 백지인지 확인"""
+    try:
+        params = make_params('ratio', threshold, 0.5, (edge_margin,) * 4)
+        result = detect_blank_pages(page.parent, [page.number], params)
+
+        if cfg.DEBUG_MODE:
+            if result['method'][0] == 'structure':
+                state = '백지' if result['blank'][0] else '잉크 있음'
+                print(f"  백지 검사: 구조 판정 {state} (렌더링 생략)")
+            else:
+                print(f"  백지 검사: 흰색 픽셀 비율 {result['white_ratio'][0]:.2%}")
+
+        return bool(result['blank'][0])
+
+    except Exception as e:
+        if cfg.DEBUG_MODE:
+            print(f"  백지 검사 실패: {e}")
+        return False
+
+
+def find_non_blank_page(pdf_path, threshold=0.99, edge_margin=20, max_pages=10):
+    """백지가 아닌 첫 페이지 번호 찾기 (모두 백지면 0)"""
+    try:
+        doc = fitz.open(pdf_path)
+        max_search = min(max_pages, len(doc))
+
+        for page_num in range(max_search):
+            page = doc[page_num]
+
+            if cfg.DEBUG_MODE:
+                print(f"\n  페이지 {page_num + 1} 검사 중...")
+
+            if not is_blank_page(page, threshold, edge_margin):
+                if cfg.DEBUG_MODE and page_num > 0:
+                    print(f"  -> 백지가 아닌 페이지 발견! (페이지 {page_num + 1})")
+                doc.close()
+                return page_num
+
+        doc.close()
+
+        # 모든 페이지가 백지인 경우
+        if cfg.DEBUG_MODE:
+            print(f"  -> 처음 {max_search}페이지가 모두 백지입니다. 첫 페이지 사용.")
+        return 0
+
+    except Exception as e:
+        if cfg.DEBUG_MODE:
+            print(f"백지 검사 중 오류: {e}")
+        return 0
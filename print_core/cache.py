@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+디스크 캐시
+SQLite 파일 하나에 키-값을 저장하고, 크기 제한(MB)을 넘으면 오래 쓰지 않은 항목부터 삭제(LRU)
+
+- 값은 JSON으로 저장 (bool, 숫자, 문자열, 목록, 딕셔너리)
+- 프로그램을 다시 시작해도 유지됨
+- 파일을 열 수 없으면(읽기 전용 폴더 등) 메모리 캐시로 동작
+- 여러 스레드에서 함께 사용 가능
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from . import settings as cfg
+
+# 백지 감지 결과 캐시 파일 (enhanced_settings.json과 같은 폴더)
+BLANK_CACHE_PATH = "blank_cache.sqlite3"
+
+# 크기 제한을 넘었을 때 이 비율까지 줄임 (매번 조금씩 지우지 않도록)
+EVICT_TARGET = 0.9
+
+
+class DiskCache:
+    """크기 제한이 있는 영구 키-값 캐시"""
+
+    def __init__(self, path, max_mb=100):
+        self.path = str(path)
+        self.max_bytes = max(int(max_mb * 1024 * 1024), 0)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._conn = self._connect(self.path)
+
+    def _connect(self, path):
+        try:
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            self._init_schema(conn)
+        except sqlite3.Error as e:
+            if cfg.DEBUG_MODE:
+                print(f"캐시 파일을 열 수 없어 메모리 캐시를 사용합니다: {e}")
+            self.path = ":memory:"
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._init_schema(conn)
+        return conn
+
+    @staticmethod
+    def _init_schema(conn):
+        # auto_vacuum은 테이블을 만들기 전에 설정해야 적용됨
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        # 캐시는 잃어도 다시 계산하면 되므로 커밋마다 디스크 동기화하지 않음
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS cache (
+                            key TEXT PRIMARY KEY,
+                            value BLOB NOT NULL,
+                            last_used REAL NOT NULL)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)")
+        conn.commit()
+
+    def get(self, key, default=None):
+        """저장된 값 (없으면 default)"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._conn.execute("UPDATE cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """값 저장 후 크기 제한 확인"""
+        data = json.dumps(value).encode('utf-8')
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO cache (key, value, last_used) VALUES (?, ?, ?)",
+                               (key, data, time.time()))
+            self._conn.commit()
+            if self._size_bytes() > self.max_bytes:
+                self._evict()
+
+    def _size_bytes(self):
+        """사용 중인 데이터베이스 크기 (빈 페이지 제외)"""
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free_count = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_count) * page_size
+
+    def _evict(self):
+        """오래 쓰지 않은 항목부터 삭제하여 제한의 EVICT_TARGET까지 줄임"""
+        target = self.max_bytes * EVICT_TARGET
+        total = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        while total and self._size_bytes() > target:
+            # 한 번에 남은 항목의 1/4씩 (최소 1개) 삭제
+            batch = max(total // 4, 1)
+            self._conn.execute("""DELETE FROM cache WHERE key IN (
+                                      SELECT key FROM cache ORDER BY last_used LIMIT ?)""", (batch,))
+            self._conn.commit()
+            self.evicted += batch
+            total -= batch
+        self._conn.execute("PRAGMA incremental_vacuum")
+        self._conn.commit()
+
+        if cfg.DEBUG_MODE:
+            print(f"캐시 정리: {self.evicted}개 삭제, 남은 항목 {total}개")
+
+    def set_limit(self, max_mb):
+        """크기 제한 변경 (줄어들면 바로 정리)"""
+        with self._lock:
+            self.max_bytes = max(int(max_mb * 1024 * 1024), 0)
+            if self._size_bytes() > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self._conn.execute("PRAGMA incremental_vacuum")
+            self._conn.commit()
+            self.hits = self.misses = self.evicted = 0
+
+    def stats(self):
+        """통계 (항목 수, 크기, 적중/실패 수)"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            size = self._size_bytes()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size_mb": size / 1024 / 1024,
+            "limit_mb": self.max_bytes / 1024 / 1024,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evicted": self.evicted,
+            "path": self.path,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
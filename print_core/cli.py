@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+명령줄(--cli) 진입점
+GUI 모듈(tkinter, tkinterdnd2, 설정 창)을 불러오지 않고 의뢰서 처리
+
+사용법:
+  print_automation.py --cli [파일들...]     # 의뢰서 처리
+  print_automation.py --cli --no-daemon ... # 상주 작업자를 거치지 않고 직접 처리
+  print_automation.py --cli --save-profile compact ... # 이번 작업의 저장 방식 (fast/compact/incremental)
+  print_automation.py --cli --import-report # 모듈별 import 시간 리포트
+"""
+
+import importlib.util
+import os
+import sys
+
+
+def check_dependencies():
+    """CLI 처리에 필요한 패키지 확인 (실제 import 없이 확인만)"""
+    required_packages = {
+        'fitz': 'PyMuPDF',
+        'PIL': 'Pillow',
+        'numpy': 'numpy'
+    }
+    
+    missing_packages = [package for module, package in required_packages.items()
+                        if importlib.util.find_spec(module) is None]
+    
+    if missing_packages:
+        print("다음 패키지를 설치해주세요:")
+        print(f"pip install {' '.join(missing_packages)}")
+        return False
+    
+    return True
+
+
+def _option_value(argv, name):
+    """'--이름 값' 옵션의 값과 값을 뺀 인자 목록 (옵션이 없으면 None)"""
+    if name not in argv:
+        return None, argv
+    index = argv.index(name)
+    if index + 1 >= len(argv):
+        return None, argv[:index]
+    return argv[index + 1], argv[:index] + argv[index + 2:]
+
+
+def main(argv=None):
+    """CLI 실행 (종료 코드 반환)"""
+    argv = sys.argv[1:] if argv is None else argv
+
+    if "--import-report" in argv:
+        from .importtime import print_import_report
+        print_import_report()
+        return 0
+
+    save_profile, argv = _option_value(argv, "--save-profile")
+
+    # 옵션을 제외한 파일 경로들 추출
+    files = [arg for arg in argv if not arg.startswith("--") and os.path.exists(arg)]
+    
+    if not files:
+        print("오류: 처리할 파일이 없습니다.")
+        return 1
+
+    # 상주 작업자가 실행 중이면 작업을 넘김
+    if "--no-daemon" not in argv:
+        try:
+            import print_daemon
+            result = print_daemon.submit(files, save_profile=save_profile)
+        except ImportError:
+            result = None
+        if result is not None:
+            return 0 if result else 1
+
+    if not check_dependencies():
+        return 1
+
+    from .processor import PrintProcessor
+    processor = PrintProcessor()
+    processor.save_profile = save_profile
+    success = processor.process_files_cli(files)
+    return 0 if success else 1
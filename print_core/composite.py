@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+"""
+래스터화 합성 경로 (PROCESSING_CONFIG['fused_raster'])
+최종 래스터화가 켜져 있을 때 정규화 → 오버레이 → 래스터화를 페이지마다 렌더링 한 번으로 처리
+
+기존 경로: 정규화(벡터 배치 또는 6배 렌더링 이미지 삽입) → 오버레이를 벡터로 얹음 → 200 DPI로 다시 렌더링
+합성 경로:
+- 의뢰서 페이지는 정규화의 회전/축소/위치를 변환 행렬에 넣어 출력 DPI로 바로 렌더링
+  (6배 렌더링, 이미지 삽입, 정규화 문서를 다시 렌더링하는 단계가 없음)
+- 오버레이(흰색 배경, 썸네일, QR)는 페이지 크기별로 한 번만 투명 배경(RGBA)으로 렌더링하고
+  항목이 있는 영역만 잘라 두었다가 각 페이지에 픽셀로 합성 (페이지마다 썸네일을 다시 그리지 않음)
+- 합성한 픽셀은 raster의 내용별 압축으로 한 번만 압축
+- 페이지가 많으면 raster와 같이 작업 프로세스로 나눠 처리
+
+정규화 방식이 'external'이면 외부 모듈이 만들 페이지를 미리 알 수 없어 기존 경로를 사용
+주석/양식 필드는 렌더링에 그대로 포함됨 (벡터 정규화에서 병합(bake)한 결과와 같음)
+"""
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from . import normalize
+from . import raster
+from .pixbridge import pixmap_to_array
+
+LAYER_MARGIN = 2      # 오버레이 항목 영역 바깥으로 더 렌더링할 픽셀 (안티앨리어싱 가장자리)
+MAX_PARTIAL = 0.25    # 반투명 픽셀이 이 비율 이하인 조각은 불투명 부분을 그대로 복사하고 나머지만 계산
+
+# 작업 프로세스에서 연 의뢰서 사본과 오버레이 조각
+_worker_doc = None
+_worker_layers = None
+
+
+def enabled(normalize_pages=True):
+    """합성 경로를 사용할지 (최종 래스터화와 fused_raster가 켜져 있고, 외부 정규화가 아닐 때)
+
+    normalize_pages: 이번 작업에서 정규화를 하는지 (꺼져 있으면 정규화 방식은 상관없음)
+    """
+    if not cfg.PROCESSING_CONFIG.get('rasterize_final', True):
+        return False
+    if not cfg.PROCESSING_CONFIG.get('fused_raster', True):
+        return False
+    return not normalize_pages or normalize.get_normalize_mode() != 'external'
+
+
+def _size_key(size):
+    return (round(size[0], 2), round(size[1], 2))
+
+
+def _layer_key(placement):
+    """오버레이 조각을 같이 쓸 수 있는 배치인지 (출력 페이지 크기, 레이어 행렬)"""
+    size, _, layer_matrix = placement
+    return _size_key(size), tuple(round(value, 2) for value in layer_matrix)
+
+
+def page_placement(page, kind=None):
+    """출력 페이지 크기, 표시 좌표 → 출력 페이지 좌표(pt) 변환 행렬, 오버레이 레이어 → 출력 페이지 변환 행렬
+
+    kind: 페이지 형태 (normalize.classify_page, None이면 정규화하지 않고 보이는 그대로)
+    정규화 배치는 normalize_page_vector와 같음 (세로형은 시계 방향 90도, A4 가로형에 맞춰 중앙 정렬)
+    오버레이는 기존 경로(Overlay.apply)와 같은 위치: 레이어는 회전 전 페이지 좌표에 그려지므로
+    정규화하지 않은 회전 페이지에서는 회전 전 좌표 → 표시 좌표 행렬 (정규화한 페이지는 회전 0도)
+    반환값: ((너비, 높이), 행렬 6개 값, 레이어 행렬 6개 값)
+    """
+    rect = page.rect  # 회전이 적용된 표시 크기 (렌더링도 이 방향으로 됨)
+    if kind is None or kind == normalize.PAGE_NORMALIZED:
+        return (rect.width, rect.height), tuple(fitz.Identity), tuple(page.rotation_matrix)
+
+    if rect.width < rect.height:
+        target = normalize.fit_rect(rect.height, rect.width)
+        # 시계 방향 90도: 표시 좌표 (x, y) → (높이 - y, x)
+        matrix = fitz.Matrix(0, 1, -1, 0, rect.height, 0)
+        scale = target.width / rect.height
+    else:
+        target = normalize.fit_rect(rect.width, rect.height)
+        matrix = fitz.Matrix(fitz.Identity)
+        scale = target.width / rect.width
+    matrix = matrix * fitz.Matrix(scale, scale) * fitz.Matrix(1, 0, 0, 1, target.x0, target.y0)
+    return (normalize.A4_LANDSCAPE_WIDTH, normalize.A4_LANDSCAPE_HEIGHT), tuple(matrix), tuple(fitz.Identity)
+
+
+def plan_pages(doc, classes=None):
+    """페이지별 배치 목록 (classes: 페이지 형태 목록, None이면 정규화하지 않음)"""
+    if classes is None:
+        return [page_placement(page) for page in doc]
+    return [page_placement(page, kind) for page, kind in zip(doc, classes)]
+
+
+def _item_boxes(overlay, width, height):
+    """오버레이 항목 영역 → 페이지 안의 영역(pt) 목록 (겹치는 영역은 합침)"""
+    boxes = []
+    for _, rect, _ in overlay.items:
+        box = [max(0, rect.x0), max(0, rect.y0), min(width, rect.x1), min(height, rect.y1)]
+        if box[0] >= box[2] or box[1] >= box[3]:
+            continue
+        # 겹치는 상자를 모두 흡수한 뒤 추가 (흰색 배경과 그 위 썸네일 등)
+        merged = True
+        while merged:
+            merged = False
+            for other in boxes:
+                if (other[0] < box[2] and box[0] < other[2]
+                        and other[1] < box[3] and box[1] < other[3]):
+                    box = [min(box[0], other[0]), min(box[1], other[1]),
+                           max(box[2], other[2]), max(box[3], other[3])]
+                    boxes.remove(other)
+                    merged = True
+                    break
+        boxes.append(box)
+    return boxes
+
+
+def _piece(pix):
+    """투명 배경으로 렌더링한 영역 → 합성용 조각 (그린 것이 없으면 None)
+
+    MuPDF 픽스맵은 색에 알파를 곱해 둔 형식이라 합성은 곱셈 한 번과 덧셈 한 번
+    반투명 픽셀(가장자리, 항목 사이 빈 곳)이 적으면 그 위치와 값을 미리 골라 둠
+    """
+    import numpy as np
+
+    rgba = pixmap_to_array(pix)
+    alpha = rgba[..., 3]
+    if not alpha.any():
+        return None
+    piece = {'x': pix.x, 'y': pix.y, 'rgb': rgba[..., :3].copy(), 'partial': None,
+             'inverse': 255 - alpha[..., None].astype(np.uint16)}
+    ys, xs = np.nonzero(alpha < 255)
+    if len(ys) <= MAX_PARTIAL * alpha.size:
+        piece['partial'] = (ys, xs, piece['inverse'][ys, xs], piece['rgb'][ys, xs])
+    return piece
+
+
+def render_overlay(overlay, size, dpi=raster.RASTER_DPI, matrix=None):
+    """오버레이 레이어에서 항목이 있는 영역만 투명 배경으로 렌더링한 조각 목록
+
+    size: 출력 페이지 크기, matrix: 레이어 → 출력 페이지 변환 행렬 (page_placement, None이면 그대로)
+    레이어 크기는 출력 페이지를 레이어 좌표로 되돌린 크기 (회전 페이지는 회전 전 크기, Overlay.apply와 같음)
+    영역마다 따로 렌더링해도 같은 변환이라 전체를 렌더링한 픽셀과 위치가 같음
+    출력 페이지 밖으로 나가는 부분은 잘림 (기존 경로에서도 페이지 밖은 보이지 않음)
+    """
+    if not len(overlay):
+        return []
+    transform = fitz.Matrix(matrix) if matrix is not None else fitz.Matrix(fitz.Identity)
+    output = fitz.Rect(0, 0, *size)
+    layer_rect = output * ~transform
+    page = overlay.layer(layer_rect.width, layer_rect.height)[0]
+    # 레이어 내용은 한 번만 해석해 두고 영역마다 그 부분만 렌더링
+    display = page.get_displaylist()
+    zoom = fitz.Matrix(dpi / 72, dpi / 72)
+    margin = LAYER_MARGIN * 72 / dpi
+    pieces = []
+    for x0, y0, x1, y1 in _item_boxes(overlay, layer_rect.width, layer_rect.height):
+        area = fitz.Rect(x0, y0, x1, y1) * transform
+        area = fitz.Rect(area.x0 - margin, area.y0 - margin, area.x1 + margin, area.y1 + margin) & output
+        if area.is_empty:
+            continue
+        # 자르는 영역은 레이어 좌표로 (렌더링할 때 행렬로 변환됨)
+        clip = area * ~transform
+        piece = _piece(display.get_pixmap(matrix=transform * zoom, alpha=True, clip=clip))
+        if piece is not None:
+            pieces.append(piece)
+    return pieces
+
+
+def render_overlays(overlay, placements, dpi=raster.RASTER_DPI):
+    """배치별 오버레이 조각 {(출력 페이지 크기, 레이어 행렬): 조각 목록}
+
+    같은 크기와 방향의 페이지는 한 번만 렌더링
+    썸네일 PDF를 그리지 못하면 여기서 예외가 남 (호출한 쪽에서 썸네일을 빼고 다시 시도)
+    """
+    layers = {}
+    for placement in placements:
+        key = _layer_key(placement)
+        if key not in layers:
+            layers[key] = render_overlay(overlay, placement[0], dpi, placement[2])
+    return layers
+
+
+def _mix(under, inverse, color):
+    """오버레이 색 + 페이지 색 x (255 - 알파) / 255 (반올림)"""
+    mixed = under * inverse
+    mixed += 127
+    mixed //= 255
+    mixed += color
+    return mixed
+
+
+def blend(rgb, pieces):
+    """페이지 픽셀 위에 오버레이 조각 합성 (rgb를 직접 수정)"""
+    for piece in pieces:
+        height, width = piece['rgb'].shape[:2]
+        region = rgb[piece['y']:piece['y'] + height, piece['x']:piece['x'] + width]
+        if region.shape[:2] != (height, width):
+            raise ValueError("오버레이 조각이 페이지 밖으로 벗어남")
+        if piece['partial'] is None:
+            region[...] = _mix(region, piece['inverse'], piece['rgb'])
+            continue
+        # 불투명한 부분은 그대로 복사하고 반투명한 픽셀만 계산
+        ys, xs, inverse, color = piece['partial']
+        under = region[ys, xs]
+        region[...] = piece['rgb']
+        region[ys, xs] = _mix(under, inverse, color)
+
+
+def render_page(doc, page_num, placement, pieces, dpi=raster.RASTER_DPI, options=None):
+    """의뢰서 페이지 한 장: 배치대로 렌더링 → 오버레이 합성 → 압축 (반환값은 raster.encode_pixels 참고)"""
+    (width, height), matrix, _ = placement
+    zoom = fitz.Matrix(dpi / 72, dpi / 72)
+    # 출력 페이지를 get_pixmap(dpi=...)으로 렌더링할 때와 같은 픽셀 격자
+    grid = (fitz.Rect(0, 0, width, height) * zoom).irect
+    pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(matrix) * zoom, alpha=False)
+    if pix.irect != grid:
+        # 축소/중앙 정렬한 페이지는 흰 페이지 위의 제자리에 복사 (격자 밖은 잘림)
+        canvas = fitz.Pixmap(fitz.csRGB, grid, False)
+        canvas.clear_with(255)
+        canvas.copy(pix, pix.irect)
+        pix = canvas
+    rgb = pixmap_to_array(pix)
+    blend(rgb, pieces)
+    return raster.encode_pixels(rgb, dpi, options)
+
+
+def _init_worker(data, layers):
+    global _worker_doc, _worker_layers
+    _worker_doc = fitz.open("pdf", data)
+    _worker_layers = layers
+
+
+def _worker_render(task):
+    page_num, placement, dpi, options = task
+    return render_page(_worker_doc, page_num, placement, _worker_layers[_layer_key(placement)],
+                       dpi, options)
+
+
+def compose_document(doc, placements, layers, dpi=raster.RASTER_DPI, workers=None, options=None):
+    """배치 목록과 오버레이 조각으로 이미지 페이지 문서 생성 (원본 문서는 바꾸지 않음)
+
+    placements: plan_pages 결과, layers: render_overlays 결과
+    workers/options: raster.rasterize_document와 같음
+    반환값: (새 문서, 실제로 사용한 작업 프로세스 수, 페이지별 압축 결과 목록)
+    """
+    options = raster.encode_options() if options is None else options
+    tasks = [(page_num, placement, dpi, options) for page_num, placement in enumerate(placements)]
+    count = raster.worker_count(len(tasks), workers)
+    results, count = raster.render_pages(
+        tasks,
+        lambda task: render_page(doc, task[0], task[1], layers[_layer_key(task[1])], dpi, options),
+        count, _worker_render, _init_worker, (doc.tobytes(), layers) if count > 1 else ())
+    rects = [fitz.Rect(0, 0, *size) for size, _, _ in placements]
+    raster_doc, report = raster.build_document(rects, results)
+    return raster_doc, count, report
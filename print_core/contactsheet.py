@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""
+여러 페이지 썸네일 (N-up 모음)
+선택한 페이지들을 격자 칸에 show_pdf_page로 배치한 한 페이지짜리 PDF를 만들어 사용
+페이지를 래스터화하지 않으므로 글자/선은 벡터 그대로, PNG 인코딩도 없음
+
+- 격자: 'auto'면 페이지 수에 맞게 (2개는 가로 2칸, 3~4개는 2x2, 그 이상은 정사각형에 가깝게)
+        '3x2'처럼 지정하면 열 x 행 (칸보다 많은 페이지는 제외)
+- 칸 크기는 기존 이미지 모음과 같은 200x280pt, 각 페이지는 칸 안에 비율 유지하여 가운데 배치
+- 배치할 크기를 알려주면 고해상도 사진은 프록시(proxy 모듈)로 줄인 사본 페이지를 사용
+- 만든 모음은 (인쇄데이터 파일, 선택한 페이지, 격자, 잘라낼 영역) 기준으로 보관하여 재사용
+- 흑백/대비/선명도 효과는 이미지에만 적용할 수 있으므로 효과가 있으면 기존 이미지 모음 사용
+"""
+
+import math
+import os
+from collections import OrderedDict
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from . import proxy
+from .fingerprint import page_fingerprint
+
+CELL_SIZE = (200, 280)  # 칸 크기 (pt)
+CACHE_ENTRIES = 8
+
+# 캐시 키 → 모음 문서 (최근에 쓴 순서)
+_cache = OrderedDict()
+
+
+def clear_cache():
+    for sheet in _cache.values():
+        sheet.close()
+    _cache.clear()
+
+
+def grid_shape(count, grid='auto'):
+    """페이지 수와 격자 설정 → (열, 행)
+
+    grid: 'auto' 또는 '열x행' (예: '3x2'), 잘못된 값은 'auto'로 처리
+    """
+    if grid and grid != 'auto':
+        try:
+            cols, rows = (int(value) for value in str(grid).lower().split('x'))
+            if cols > 0 and rows > 0:
+                return cols, rows
+        except ValueError:
+            pass
+        if cfg.DEBUG_MODE:
+            print(f"    - 격자 설정 '{grid}'을(를) 해석할 수 없어 자동으로 배치합니다.")
+    count = max(1, count)
+    cols = math.ceil(math.sqrt(count))
+    return cols, math.ceil(count / cols)
+
+
+def cell_rects(count, grid='auto', cell_size=CELL_SIZE):
+    """칸 사각형 목록 (왼쪽 위부터 행 방향), 격자 칸보다 많은 페이지는 제외"""
+    cols, rows = grid_shape(count, grid)
+    width, height = cell_size
+    return [fitz.Rect(i % cols * width, i // cols * height,
+                      (i % cols + 1) * width, (i // cols + 1) * height)
+            for i in range(min(count, cols * rows))]
+
+
+def _source_key(src_doc, pages):
+    """인쇄데이터 식별자: 파일에서 연 문서는 (경로, 수정 시각, 크기), 메모리 문서는 페이지 지문"""
+    name = src_doc.name
+    if name and os.path.exists(name):
+        stat = os.stat(name)
+        return (os.path.abspath(name), stat.st_mtime_ns, stat.st_size)
+    memo = {}
+    return tuple(page_fingerprint(src_doc[page_num], memo=memo) for page_num in pages)
+
+
+def _show_page(page, rect, src_doc, page_num, area, scale):
+    """칸에 페이지 배치 (scale이 있으면 그 배율에 맞게 사진을 줄인 사본 사용)"""
+    if scale:
+        try:
+            proxy_doc, report = proxy.make_proxy(src_doc, page_num, scale)
+        except Exception as e:
+            if cfg.DEBUG_MODE:
+                print(f"    - 페이지 {page_num + 1} 프록시 생성 실패, 원본 사용: {e}")
+        else:
+            if cfg.DEBUG_MODE:
+                print(f"    - 페이지 {page_num + 1} 프록시: {proxy.describe(report)}")
+            page.show_pdf_page(rect, proxy_doc, 0, clip=area)
+            proxy_doc.close()
+            return
+    page.show_pdf_page(rect, src_doc, page_num, clip=area)
+
+
+def build_sheet(src_doc, pages, grid='auto', clip=None, cell_size=CELL_SIZE, placement=None):
+    """선택한 페이지를 격자로 배치한 한 페이지짜리 문서
+
+    pages: 페이지 번호 목록 (0부터, 배치 순서)
+    clip: 각 페이지에서 사용할 영역을 돌려주는 함수 (page → Rect 또는 None), 표지 오른쪽 절반 등
+    placement: 모음을 넣을 칸 크기 (너비, 높이 pt) - 주면 사진을 그 크기에 맞게 줄임
+    반환값: 모음 문서 (캐시가 소유하므로 호출하는 쪽에서 닫지 않음)
+    """
+    rects = cell_rects(len(pages), grid, cell_size)
+    pages = list(pages)[:len(rects)]
+    clips = [clip(src_doc[page_num]) if clip else None for page_num in pages]
+    key = (_source_key(src_doc, pages), tuple(pages), grid_shape(len(pages), grid),
+           tuple(cell_size), tuple(tuple(c) if c else None for c in clips),
+           tuple(placement) if placement else None)
+
+    sheet = _cache.get(key)
+    if sheet is not None:
+        _cache.move_to_end(key)
+        if cfg.DEBUG_MODE:
+            print(f"    - 페이지 모음 재사용: {len(pages)}페이지")
+        return sheet
+
+    cols, rows = grid_shape(len(pages), grid)
+    sheet = fitz.open()
+    page = sheet.new_page(width=cols * cell_size[0], height=rows * cell_size[1])
+    # 기존 이미지 모음과 같은 흰색 바탕
+    page.draw_rect(page.rect, color=None, fill=(1, 1, 1), width=0)
+    # 모음 → 배치할 칸 배율 (모음 전체가 비율을 유지해 들어감)
+    sheet_scale = None
+    if placement:
+        sheet_scale = min(placement[0] / page.rect.width, placement[1] / page.rect.height)
+    for rect, page_num, area in zip(rects, pages, clips):
+        scale = None
+        if sheet_scale:
+            shown = area or src_doc[page_num].rect
+            scale = min(rect.width / shown.width, rect.height / shown.height) * sheet_scale
+        _show_page(page, rect, src_doc, page_num, area, scale)
+
+    _cache[key] = sheet
+    while len(_cache) > CACHE_ENTRIES:
+        _, old = _cache.popitem(last=False)
+        old.close()
+    if cfg.DEBUG_MODE:
+        print(f"    - 페이지 모음 생성: {len(pages)}페이지, {cols}x{rows} 격자")
+    return sheet
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+썸네일 이미지 효과 (흑백, 대비, 선명도)
+ImageOps.grayscale → ImageEnhance.Contrast → ImageEnhance.Sharpness 순서와 같은 결과를
+중간 이미지를 여러 장 만들지 않고 계산
+
+- 흑백 + 대비 : 회색조 변환 후 256칸 변환표(LUT) 한 번 적용 (대비는 회색조 평균 기준 혼합)
+- 선명도      : SMOOTH 3x3 필터와 혼합을 NumPy로 한 번에 계산 (행 단위로 나눠 캐시 안에서 처리)
+- PIL과 같은 정수/float32 연산 순서를 사용하므로 결과 픽셀이 PIL 방식과 같음
+- L/RGB 이외의 모드(RGBA, P 등)는 PIL 방식으로 처리
+"""
+
+_FAST_MODES = ('L', 'RGB')
+TILE_ROWS = 64  # 선명도 계산을 나누는 행 수 (float32 임시 배열이 캐시에 들어가는 크기)
+
+
+def _pil_effects(img, grayscale, contrast, sharpness):
+    """기존 PIL 방식 (지원하지 않는 모드용, 비교 기준)"""
+    from PIL import ImageEnhance, ImageOps
+
+    if grayscale:
+        img = ImageOps.grayscale(img)
+    if contrast != 1.0:
+        img = ImageEnhance.Contrast(img).enhance(contrast)
+    if sharpness != 1.0:
+        img = ImageEnhance.Sharpness(img).enhance(sharpness)
+    return img
+
+
+def _contrast_lut(gray, factor):
+    """대비 변환표: 회색조 평균(반올림)에서 factor배로 벌리고 소수점 버림 (Image.blend와 같음)"""
+    import numpy as np
+
+    histogram = gray.histogram()
+    total = sum(histogram)
+    mean = int(sum(value * count for value, count in enumerate(histogram)) / total + 0.5)
+    values = np.arange(256, dtype=np.float32)
+    blended = np.float32(mean) + np.float32(factor) * (values - np.float32(mean))
+    return np.clip(blended, 0, 255).astype(np.uint8).tolist()
+
+
+def _sharpen(samples, factor):
+    """SMOOTH 필터 결과와 원본을 factor로 혼합 (가장자리 한 픽셀은 PIL처럼 원본 유지)
+
+    samples: (높이, 너비[, 채널]) uint8 배열
+    """
+    import numpy as np
+
+    out = samples.copy()
+    height = samples.shape[0]
+    scale = np.float32(1 / 13)
+    half = np.float32(0.5)
+    factor = np.float32(factor)
+    for top in range(1, height - 1, TILE_ROWS):
+        bottom = min(height - 1, top + TILE_ROWS)
+        x = samples[top - 1:bottom + 1].astype(np.float32)
+        # 3x3 합 (가로 3칸 → 세로 3칸), 가운데는 가중치 5
+        rows = x[:, :-2] + x[:, 1:-1]
+        rows += x[:, 2:]
+        smooth = rows[:-2] + rows[1:-1]
+        smooth += rows[2:]
+        center = x[1:-1, 1:-1]
+        smooth += center * 4
+        smooth *= scale
+        smooth += half
+        np.floor(smooth, out=smooth)
+        # smooth + factor * (원본 - smooth)
+        blended = center - smooth
+        blended *= factor
+        blended += smooth
+        np.clip(blended, 0, 255, out=blended)
+        out[top:bottom, 1:-1] = blended
+    return out
+
+
+def apply_effects(img, grayscale=False, contrast=1.0, sharpness=1.0):
+    """흑백/대비/선명도 적용 (PIL 방식과 같은 결과, 효과가 없으면 원본 그대로)"""
+    import numpy as np
+    from PIL import Image
+
+    if img.mode not in _FAST_MODES or min(img.size) < 3:
+        return _pil_effects(img, grayscale, contrast, sharpness)
+
+    if grayscale and img.mode != 'L':
+        img = img.convert('L')
+    if contrast != 1.0:
+        gray = img if img.mode == 'L' else img.convert('L')
+        img = img.point(_contrast_lut(gray, contrast) * len(img.getbands()))
+    if sharpness != 1.0:
+        img = Image.fromarray(_sharpen(np.asarray(img), sharpness), img.mode)
+    return img
+
+
+def apply_effects_batch(images, grayscale=False, contrast=1.0, sharpness=1.0):
+    """여러 썸네일에 같은 효과 적용
+
+    이미지를 한 배열로 쌓으면 임시 배열이 커져 오히려 느려서 한 장씩 타일 단위로 처리
+    """
+    return [apply_effects(img, grayscale, contrast, sharpness) for img in images]
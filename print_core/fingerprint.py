@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+페이지 지문
+페이지가 그리는 내용이 같으면 문서나 파일이 달라도 같은 값이 나오는 해시
+
+지문에 포함되는 것:
+- 내용 스트림 (압축된 원본 바이트)
+- 리소스 (글꼴, 이미지, 폼 XObject 등) — 참조를 따라가며 객체와 스트림 전체
+- 주석 (렌더링 결과에 포함되므로)
+- MediaBox / CropBox / 회전
+- 검사 조건 (params)
+
+객체 번호는 문서마다 다르므로 참조(N 0 R)는 대상 객체의 해시로 바꿔서 계산
+"""
+
+import hashlib
+import json
+import re
+
+# 간접 참조 "12 0 R"
+_REFERENCE = re.compile(r"(\d+) (\d+) R")
+
+# 따라가지 않는 객체 종류 (페이지 트리로 올라가면 문서 전체를 읽게 됨)
+_STOP_TYPES = ('/Page', '/Pages', '/Catalog')
+
+DIGEST_SIZE = 16
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def _object_digest(doc, xref, memo, active):
+    """객체(와 스트림)의 해시, 참조하는 객체는 재귀적으로 해시로 치환"""
+    if xref in memo:
+        return memo[xref]
+    if xref in active:
+        # 순환 참조
+        return b'cycle'
+    if doc.xref_get_key(xref, 'Type')[1] in _STOP_TYPES:
+        return b'page-tree'
+
+    active.add(xref)
+    digest = _new_hash()
+    source = doc.xref_object(xref, compressed=True)
+    digest.update(_resolve(doc, source, memo, active).encode())
+    if doc.xref_is_stream(xref):
+        digest.update(doc.xref_stream_raw(xref) or b'')
+    active.discard(xref)
+
+    memo[xref] = digest.digest()
+    return memo[xref]
+
+
+def _resolve(doc, source, memo, active):
+    """PDF 객체 문자열의 참조를 대상 객체 해시로 치환"""
+    return _REFERENCE.sub(
+        lambda m: _object_digest(doc, int(m.group(1)), memo, active).hex(), source)
+
+
+def _inherited_key(doc, xref, key):
+    """페이지 트리에서 상속될 수 있는 키 값 (없으면 'null')"""
+    seen = set()
+    while xref and xref not in seen:
+        seen.add(xref)
+        kind, value = doc.xref_get_key(xref, key)
+        if kind != 'null':
+            return value
+        kind, parent = doc.xref_get_key(xref, 'Parent')
+        if kind != 'xref':
+            break
+        xref = int(parent.split()[0])
+    return 'null'
+
+
+def page_fingerprint(page, params=None, memo=None):
+    """페이지 지문 (16진 문자열)
+
+    params: 결과에 영향을 주는 검사 조건 딕셔너리 (JSON으로 직렬화 가능한 값)
+    memo: 같은 문서의 여러 페이지를 계산할 때 공유하면 공통 리소스를 한 번만 해시
+    """
+    doc = page.parent
+    memo = {} if memo is None else memo
+    active = set()
+    digest = _new_hash()
+
+    # 내용 스트림 (여러 개면 순서대로)
+    for xref in page.get_contents():
+        digest.update(b'contents')
+        digest.update(doc.xref_stream_raw(xref) or b'')
+
+    # 리소스 (부모 페이지 트리에서 상속될 수 있음)
+    resources = _inherited_key(doc, page.xref, 'Resources')
+    digest.update(b'resources')
+    digest.update(_resolve(doc, resources, memo, active).encode())
+
+    # 주석
+    annots = doc.xref_get_key(page.xref, 'Annots')[1]
+    digest.update(b'annots')
+    digest.update(_resolve(doc, annots, memo, active).encode())
+
+    # 페이지 영역과 회전
+    digest.update(f"{tuple(page.mediabox)}{tuple(page.cropbox)}{page.rotation}".encode())
+
+    if params is not None:
+        digest.update(json.dumps(params, sort_keys=True, default=list).encode())
+
+    return digest.hexdigest()
+
+
+def document_fingerprints(doc, params=None):
+    """문서 전체 페이지 지문 목록 (공통 리소스는 한 번만 해시)"""
+    memo = {}
+    return [page_fingerprint(page, params, memo) for page in doc]
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+시작 시간(import time) 리포트
+`python -X importtime` 결과를 모듈별로 정리하여 CLI 시작 지연 회귀를 추적
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+# CLI 경로에서 로드되면 안 되는 GUI 모듈
+GUI_MODULES = ('tkinter', 'tkinterdnd2', 'settings_gui', 'enhanced_settings_gui', 'print_automation')
+
+# CLI 처리 경로에서 처음 사용할 때 불러와야 하는 무거운 모듈 (모듈 맨 위에서 import하지 않음)
+DEFERRED_MODULES = ('numpy',)
+
+# CLI 처리 경로의 시작점
+DEFAULT_TARGET = 'print_core.processor'
+
+
+def _parse_importtime(stderr):
+    """-X importtime 출력 파싱"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue  # 머리글 줄
+
+        name = parts[2].rstrip()
+        indent = len(name) - len(name.lstrip())
+        entries.append({
+            'module': name.strip(),
+            'self_us': self_us,
+            'cumulative_us': cumulative_us,
+            'depth': max(0, (indent - 1) // 2)
+        })
+    return entries
+
+
+def _measure_in_process(target):
+    """실행 파일(frozen)에서는 -X importtime을 쓸 수 없으므로 직접 측정"""
+    import importlib
+
+    entries = []
+    for name in ('fitz', 'PIL.Image', 'numpy', target):
+        if name in sys.modules:
+            continue
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        elapsed_us = int((time.perf_counter() - start) * 1_000_000)
+        entries.append({'module': name, 'self_us': elapsed_us,
+                        'cumulative_us': elapsed_us, 'depth': 0})
+    return entries
+
+
+def collect_import_times(target=DEFAULT_TARGET):
+    """대상 모듈을 새 인터프리터에서 import하며 모듈별 시간 수집"""
+    if getattr(sys, 'frozen', False):
+        return _measure_in_process(target)
+
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        capture_output=True, text=True, cwd=package_root
+    )
+    return _parse_importtime(result.stderr)
+
+
+def loaded_modules(entries, names):
+    """entries(collect_import_times 결과)에서 names 패키지에 속한 모듈 이름 목록"""
+    return sorted({e['module'] for e in entries if e['module'].split('.')[0] in names})
+
+
+def print_import_report(target=DEFAULT_TARGET, top=15):
+    """모듈별 import 시간 리포트 출력"""
+    entries = collect_import_times(target)
+    if not entries:
+        print("import 시간을 측정하지 못했습니다.")
+        return entries
+
+    roots = [e for e in entries if e['depth'] == 0]
+    total_us = sum(e['cumulative_us'] for e in roots) or 1
+
+    # 최상위 패키지 단위로 정리 (하위 패키지 시간은 누적값에 포함)
+    packages = [e for e in entries if '.' not in e['module'] or e['module'] == target]
+
+    print("=" * 60)
+    print(f"import 시간 리포트: {target}")
+    print("=" * 60)
+    print(f"{'모듈':35} {'누적(ms)':>10} {'자체(ms)':>10} {'비율':>6}")
+    print("-" * 60)
+    for e in sorted(packages, key=lambda e: e['cumulative_us'], reverse=True)[:top]:
+        print(f"{e['module'][:35]:35} {e['cumulative_us'] / 1000:10.1f} "
+              f"{e['self_us'] / 1000:10.1f} {e['cumulative_us'] / total_us:6.1%}")
+    print("-" * 60)
+    print(f"{'합계':35} {total_us / 1000:10.1f}  (모듈 {len(entries)}개)")
+
+    loaded_gui = loaded_modules(entries, GUI_MODULES)
+    if loaded_gui:
+        print(f"⚠️  CLI 경로에서 GUI 모듈이 로드됨: {', '.join(loaded_gui)}")
+    else:
+        print("✓ CLI 경로에서 GUI 모듈이 로드되지 않음")
+    loaded_deferred = sorted({name.split('.')[0] for name in loaded_modules(entries, DEFERRED_MODULES)})
+    if loaded_deferred:
+        print(f"⚠️  시작할 때 무거운 모듈이 로드됨 (처음 사용할 때 import할 것): {', '.join(loaded_deferred)}")
+    else:
+        print(f"✓ 시작할 때 무거운 모듈({', '.join(DEFERRED_MODULES)})을 로드하지 않음")
+    print("=" * 60)
+
+    return entries
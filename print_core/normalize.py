@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+"""
+PDF 정규화 모듈
+의뢰서 PDF를 아크로뱃에서 보이는 그대로 가로형(A4 842x595)으로 재생성
+
+정규화 방식 (PROCESSING_CONFIG['normalize_mode']):
+- vector   : 원본 페이지를 회전/축소하여 그대로 배치 (기본, 벡터 유지)
+- raster   : 6배 해상도로 렌더링한 이미지를 배치 (기존 방식)
+- external : normalize_pdf.py 모듈 사용
+"""
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from .pixbridge import pixmap_to_image, image_to_pixmap
+
+# 외부 정규화 모듈 (normalize_mode가 'external'일 때 사용)
+try:
+    from normalize_pdf import normalize_pdf as normalize_pdf_external
+    NORMALIZE_AVAILABLE = True
+except ImportError:
+    NORMALIZE_AVAILABLE = False
+
+# 표준 A4 가로형 크기
+A4_LANDSCAPE_WIDTH = 842
+A4_LANDSCAPE_HEIGHT = 595
+
+NORMALIZE_MODES = ('vector', 'raster', 'external')
+
+# 래스터 방식 렌더링 배율
+RASTER_ZOOM = 6.0
+
+# 페이지 형태 분류
+PAGE_NORMALIZED = 'normalized'
+PAGE_ROTATED_LANDSCAPE = 'rotated_landscape'
+PAGE_PORTRAIT = 'portrait'
+PAGE_ODD_SIZE = 'odd_size'
+
+GEOMETRY_NAMES = {
+    PAGE_NORMALIZED: '정상 가로형',
+    PAGE_ROTATED_LANDSCAPE: '회전된 가로형',
+    PAGE_PORTRAIT: '세로형',
+    PAGE_ODD_SIZE: '비표준 크기',
+}
+
+# A4 크기 판정 허용 오차 (pt)
+GEOMETRY_TOLERANCE = 1.0
+
+
+def get_normalize_mode():
+    """설정된 정규화 방식 반환 (잘못된 값이면 vector)"""
+    mode = cfg.PROCESSING_CONFIG.get('normalize_mode', 'vector')
+    return mode if mode in NORMALIZE_MODES else 'vector'
+
+
+def fit_rect(width, height):
+    """주어진 크기를 A4 가로형에 맞춰 중앙 정렬한 영역"""
+    scale = min(A4_LANDSCAPE_WIDTH / width, A4_LANDSCAPE_HEIGHT / height)
+    final_width = width * scale
+    final_height = height * scale
+    x_offset = (A4_LANDSCAPE_WIDTH - final_width) / 2
+    y_offset = (A4_LANDSCAPE_HEIGHT - final_height) / 2
+    return fitz.Rect(x_offset, y_offset, x_offset + final_width, y_offset + final_height)
+
+
+def _has_annotations(page):
+    """주석/양식 필드가 있는 페이지인지 (show_pdf_page는 주석을 옮기지 않음)"""
+    return page.first_annot is not None or page.first_widget is not None
+
+
+def normalize_page_vector(new_page, src_doc, page_num):
+    """원본 페이지를 벡터 그대로 회전/축소하여 새 가로형 페이지에 배치
+
+    show_pdf_page는 원본의 /Rotate 값을 무시하고 MediaBox 기준으로 그리므로
+    잠시 회전을 0으로 두고 표시 회전 + 세로형 보정(90도)을 직접 적용
+    """
+    page = src_doc[page_num]
+    rotation = page.rotation
+    rect = page.rect  # 회전이 적용된 표시 크기
+
+    # 세로형으로 보이는 페이지는 시계 방향으로 90도 더 돌림
+    is_portrait = rect.width < rect.height
+    turn = rotation + (90 if is_portrait else 0)
+
+    if is_portrait:
+        target_rect = fit_rect(rect.height, rect.width)
+    else:
+        target_rect = fit_rect(rect.width, rect.height)
+
+    page.set_rotation(0)
+    try:
+        # show_pdf_page의 rotate는 반시계 방향
+        new_page.show_pdf_page(target_rect, src_doc, page_num, rotate=(-turn) % 360)
+    finally:
+        page.set_rotation(rotation)
+
+    if cfg.DEBUG_MODE:
+        print(f"  - 벡터 배치: 회전 {turn % 360}도, 위치 {target_rect}")
+
+    return target_rect
+
+
+def normalize_page_raster(new_page, page, zoom=RASTER_ZOOM):
+    """페이지를 고해상도로 렌더링하여 새 가로형 페이지에 이미지로 배치"""
+    # get_pixmap()은 회전이 적용된 상태로 렌더링함
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+
+    # 렌더링된 이미지의 실제 크기 (원래 크기로 환산)
+    img_width = pix.width / zoom
+    img_height = pix.height / zoom
+
+    if cfg.DEBUG_MODE:
+        print(f"  - 렌더링된 크기: {img_width:.1f}x{img_height:.1f}")
+        print(f"  - {zoom:g}배 고해상도 렌더링")
+
+    if img_width > img_height:
+        # 이미 가로형이면 렌더링된 픽스맵을 직접 삽입
+        target_rect = fit_rect(img_width, img_height)
+        new_page.insert_image(target_rect, pixmap=pix)
+    else:
+        # 세로형은 90도 회전하여 가로로 만들기 (PNG 왕복 없이 픽셀 버퍼로 처리)
+        target_rect = fit_rect(img_height, img_width)
+
+        img = pixmap_to_image(pix).rotate(-90, expand=True)
+        new_page.insert_image(target_rect, pixmap=image_to_pixmap(img))
+
+        if cfg.DEBUG_MODE:
+            print(f"  - 세로형 → 가로형 변환 완료")
+
+    if cfg.DEBUG_MODE:
+        print(f"  - 최종 크기: {target_rect.width:.1f}x{target_rect.height:.1f}")
+        print(f"  - 위치: ({target_rect.x0:.1f}, {target_rect.y0:.1f})")
+
+    return target_rect
+
+
+def _normalize_external(doc):
+    """외부 normalize_pdf 모듈로 정규화 (실패 시 None)"""
+    if not NORMALIZE_AVAILABLE:
+        if cfg.DEBUG_MODE:
+            print("외부 normalize_pdf 모듈이 없어 내장 방식을 사용합니다.")
+        return None
+
+    try:
+        if cfg.DEBUG_MODE:
+            print("외부 normalize_pdf 모듈을 사용합니다.")
+        return normalize_pdf_external(doc, return_type='document')
+    except Exception as e:
+        if cfg.DEBUG_MODE:
+            print(f"외부 모듈 실패, 내장 방식 사용: {e}")
+        return None
+
+
+def classify_page(page, tolerance=GEOMETRY_TOLERANCE):
+    """페이지 형태 분류
+
+    - normalized        : 이미 A4 가로형(842x595), 회전 0 → 그대로 복사
+    - rotated_landscape : 회전 값으로 A4 가로형으로 보이는 페이지
+    - portrait          : A4 세로형으로 보이는 페이지
+    - odd_size          : 그 밖의 크기
+    """
+    width, height = page.rect.width, page.rect.height  # 회전이 적용된 표시 크기
+
+    def is_a4_landscape(w, h):
+        return (abs(w - A4_LANDSCAPE_WIDTH) <= tolerance and
+                abs(h - A4_LANDSCAPE_HEIGHT) <= tolerance)
+
+    if is_a4_landscape(width, height):
+        return PAGE_NORMALIZED if page.rotation == 0 else PAGE_ROTATED_LANDSCAPE
+    if is_a4_landscape(height, width):
+        return PAGE_PORTRAIT
+    return PAGE_ODD_SIZE
+
+
+def analyze_geometry(doc):
+    """문서 전체 페이지 형태 분류 목록"""
+    return [classify_page(page) for page in doc]
+
+
+def describe_geometry(classes):
+    """분류 결과를 작업 로그용 문자열로"""
+    counts = [(GEOMETRY_NAMES[kind], classes.count(kind)) for kind in GEOMETRY_NAMES]
+    return ", ".join(f"{name} {count}" for name, count in counts if count)
+
+
+def open_pdf(path):
+    """PDF를 메모리로 읽어 열기 (원본 파일을 잠그지 않으므로 같은 경로에 바로 저장 가능)"""
+    with open(path, 'rb') as f:
+        return fitz.open(stream=f.read(), filetype="pdf")
+
+
+def normalize_document(doc, mode=None, classes=None):
+    """문서를 아크로뱃에서 보이는 그대로 가로형으로 재구성 (메모리 안에서 처리)
+
+    mode: 'vector' / 'raster' / 'external' (생략하면 설정값)
+    classes: 이미 분석한 페이지 형태 목록 (DocumentProfile.geometry(), 생략하면 여기서 분석)
+    반환값: 정규화된 새 문서 (정규화가 필요 없거나 실패하면 원래 doc 그대로)
+    이미 A4 가로형인 페이지는 그대로 복사하고, 모든 페이지가 그렇다면 정규화를 생략
+    벡터 배치에 실패한 페이지는 normalize_raster_fallback 설정에 따라 렌더링 방식으로 처리
+    """
+    mode = mode or get_normalize_mode()
+    raster_fallback = cfg.PROCESSING_CONFIG.get('normalize_raster_fallback', True)
+
+    try:
+        # 페이지 형태 분석
+        if classes is None:
+            classes = analyze_geometry(doc)
+        print(f"  - 페이지 형태: {describe_geometry(classes)}")
+
+        if all(kind == PAGE_NORMALIZED for kind in classes):
+            print("  - 모든 페이지가 이미 A4 가로형이므로 정규화를 생략합니다.")
+            return doc
+
+        if mode == 'external':
+            result = _normalize_external(doc)
+            if result is not None:
+                return result
+            mode = 'vector'
+
+        # 주석/양식 필드는 show_pdf_page로 옮겨지지 않으므로 내용으로 병합
+        if mode == 'vector' and any(_has_annotations(page) for page, kind in zip(doc, classes)
+                                    if kind != PAGE_NORMALIZED):
+            try:
+                doc.bake()
+            except Exception as e:
+                if cfg.DEBUG_MODE:
+                    print(f"주석 병합 실패: {e}")
+
+        new_doc = fitz.open()
+        raster_pages = []
+
+        for page_num, page in enumerate(doc):
+            if cfg.DEBUG_MODE:
+                print(f"\n원본 페이지 {page_num + 1}: {GEOMETRY_NAMES[classes[page_num]]}")
+                print(f"  - 크기: {page.rect.width:.1f}x{page.rect.height:.1f}")
+                print(f"  - 회전: {page.rotation}도")
+
+            # 이미 정규화된 페이지는 그대로 복사
+            if classes[page_num] == PAGE_NORMALIZED:
+                new_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
+                continue
+
+            # 새 가로형 페이지 생성
+            new_page = new_doc.new_page(width=A4_LANDSCAPE_WIDTH, height=A4_LANDSCAPE_HEIGHT)
+
+            if mode == 'raster':
+                normalize_page_raster(new_page, page)
+                continue
+
+            try:
+                if _has_annotations(page):
+                    raise ValueError("병합되지 않은 주석이 있음")
+                normalize_page_vector(new_page, doc, page_num)
+            except Exception as e:
+                if not raster_fallback:
+                    raise
+                if cfg.DEBUG_MODE:
+                    print(f"  - 벡터 배치 실패, 렌더링 방식 사용: {e}")
+                # 실패한 페이지는 깨끗한 페이지에 다시 배치
+                new_doc.delete_page(page_num)
+                new_page = new_doc.new_page(page_num, width=A4_LANDSCAPE_WIDTH,
+                                            height=A4_LANDSCAPE_HEIGHT)
+                normalize_page_raster(new_page, page)
+                raster_pages.append(page_num + 1)
+
+        rebuilt = sum(1 for kind in classes if kind != PAGE_NORMALIZED)
+        print(f"  - 다시 구성한 페이지: {rebuilt}/{len(classes)}")
+        if raster_pages:
+            print(f"  - 렌더링 방식으로 처리된 페이지: {raster_pages}")
+
+        if cfg.DEBUG_MODE:
+            print(f"\nPDF 정규화 완료 ({mode})")
+
+        return new_doc
+
+    except Exception as e:
+        if cfg.DEBUG_MODE:
+            print(f"PDF 정규화 실패: {e}")
+            import traceback
+            traceback.print_exc()
+        return doc
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+"""
+결과 파일 기록과 백업
+원본을 덮어쓰다 중간에 멈춰도(오류, 강제 종료, 정전) 원본이 깨지지 않도록
+
+- 기록: 같은 폴더의 임시 파일에 한 번 쓰고 디스크에 반영(fsync)한 뒤 원래 이름으로 바꿔치기(os.replace)
+        바꿔치기는 한 번에 일어나므로 원본 파일은 항상 이전 내용 전체 또는 새 내용 전체
+- 백업: 복사하지 않고 같은 내용을 가리키게 만듦 (위에서부터 가능한 것)
+  - reflink  : 파일 시스템의 블록 공유 복제 (Linux Btrfs/XFS 등, 나중에 한쪽을 고치면 그 부분만 따로 기록)
+  - hardlink : 같은 파일에 이름 하나 더 (원본은 기록할 때 새 파일로 바뀌므로 백업은 이전 내용을 유지)
+               원본을 제자리에서 고치는 경우(덧붙이기 저장)는 백업도 바뀌므로 사용하지 않음
+  - copy     : 그 외 (FAT/네트워크 드라이브 등) shutil.copy2
+- 정리: 이전 실행이 강제 종료되어 남은 임시 파일을 작업을 시작할 때 지움
+        사용자 폴더에서 작업마다 실행하므로 이 모듈이 만든 이름(.~print_*.tmp)만 지움
+        (예전 버전이 남긴 temp_normalized_*.pdf는 사용자 파일과 구별할 수 없어 건드리지 않음)
+"""
+
+import os
+import shutil
+import sys
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+TEMP_PREFIX = '.~print_'
+TEMP_SUFFIX = '.tmp'
+STALE_SECONDS = 600  # 이보다 오래된 임시 파일만 지움 (다른 프로세스가 쓰는 중인 파일은 건드리지 않음)
+
+FICLONE = 0x40049409  # linux/fs.h
+
+BACKUP_METHODS = {
+    'reflink': '블록 공유 복제',
+    'hardlink': '하드 링크',
+    'copy': '복사',
+}
+
+
+def _temp_path(path):
+    """path와 같은 폴더의 임시 파일 경로 (프로세스 번호 + 임의 값, 바꿔치기가 같은 디스크 안에서 일어나도록)"""
+    folder = os.path.dirname(os.path.abspath(path))
+    return os.path.join(folder, f"{TEMP_PREFIX}{os.getpid()}_{uuid.uuid4().hex[:8]}{TEMP_SUFFIX}")
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _sync_folder(path):
+    """바꿔치기한 이름을 디스크에 반영 (POSIX만, Windows는 폴더를 열 수 없고 이름 변경이 바로 기록됨)"""
+    if sys.platform == 'win32':
+        return
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _replace(temp, path):
+    """임시 파일을 path로 바꿔치기 (기존 파일이 있으면 권한을 이어받음)"""
+    if os.path.exists(path):
+        try:
+            shutil.copymode(path, temp)
+        except OSError:
+            pass
+    os.replace(temp, path)
+    _sync_folder(path)
+
+
+def write_bytes(path, data):
+    """data를 path에 원자적으로 기록 (임시 파일 → fsync → 바꿔치기)
+
+    실패하면 임시 파일을 지우고 예외를 그대로 올림 (path는 그대로)
+    """
+    temp = _temp_path(path)
+    try:
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace(temp, path)
+    except BaseException:
+        _remove(temp)
+        raise
+
+
+def _reflink(src, dst):
+    """블록 공유 복제 (지원하지 않는 파일 시스템/플랫폼이면 False)"""
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError:
+        _remove(dst)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def _hardlink(src, dst):
+    try:
+        os.link(src, dst)
+    except (OSError, AttributeError, NotImplementedError):
+        return False
+    return True
+
+
+def backup_file(src, dst, in_place=False):
+    """src를 dst로 백업 (기존 dst는 바꿔치기)
+
+    in_place: 원본을 제자리에서 고칠 예정인지 (그러면 하드 링크를 쓰지 않음)
+    반환값: 사용한 방식 ('reflink', 'hardlink', 'copy')
+    """
+    temp = _temp_path(dst)
+    try:
+        if _reflink(src, temp):
+            method = 'reflink'
+        elif not in_place and _hardlink(src, temp):
+            method = 'hardlink'
+        else:
+            shutil.copy2(src, temp)
+            with open(temp, 'r+b') as f:
+                os.fsync(f.fileno())
+            method = 'copy'
+        os.replace(temp, dst)
+        # dst가 이미 같은 파일의 하드 링크였으면 이름 변경이 아무 일도 하지 않아 임시 이름이 남음
+        _remove(temp)
+        _sync_folder(dst)
+    except BaseException:
+        _remove(temp)
+        raise
+    return method
+
+
+def _is_leftover(name):
+    """이 모듈이 만든 임시 파일인지 (이름으로만 판단)"""
+    return name.startswith(TEMP_PREFIX) and name.endswith(TEMP_SUFFIX)
+
+
+def cleanup(folder, max_age=STALE_SECONDS):
+    """folder에서 max_age초보다 오래된 임시 파일(.~print_*.tmp) 삭제
+
+    반환값: 지운 파일 이름 목록
+    """
+    removed = []
+    now = time.time()
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
+        return removed
+    for entry in entries:
+        try:
+            if not entry.is_file(follow_symlinks=False) or not _is_leftover(entry.name):
+                continue
+            if now - entry.stat(follow_symlinks=False).st_mtime < max_age:
+                continue
+            os.remove(entry.path)
+        except OSError:
+            continue
+        removed.append(entry.name)
+    return removed
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+오버레이 합성
+흰색 배경, 썸네일, QR 코드를 페이지 크기별로 한 장의 레이어에 한 번만 그리고
+의뢰서 각 페이지에는 그 레이어를 show_pdf_page 한 번으로 얹음
+
+- 레이어는 대상 문서 안에서 Form XObject 하나로 저장되어 모든 페이지가 공유
+- 페이지 수 x 위치 수만큼 그리던 작업이 페이지 크기 수 x 위치 수로 줄어듦
+- 회전된 페이지에는 회전 전 페이지 크기의 레이어를 얹어 항목을 직접 그린 것과 같은 결과
+- 같은 이미지(QR 등)를 여러 위치에 넣어도 레이어 안에는 이미지 객체 하나
+"""
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from .resources import ImageCache
+
+
+class Overlay:
+    """의뢰서 페이지에 얹을 레이어 (배치 목록은 한 번 정하고 페이지 크기별로 재사용)"""
+
+    def __init__(self):
+        self.items = []
+        self._layers = {}  # (너비, 높이) → 레이어 문서
+
+    def add_background(self, rect, color=(1, 1, 1)):
+        """채운 사각형 (테두리 없음)"""
+        self.items.append(('background', fitz.Rect(rect), color))
+
+    def add_pdf(self, rect, src_doc, page_num=0, clip=None):
+        """PDF 페이지를 벡터 그대로 배치 (clip: 원본 페이지에서 사용할 영역)"""
+        self.items.append(('pdf', fitz.Rect(rect), (src_doc, page_num, clip)))
+
+    def add_vector(self, rect, src_doc):
+        """벡터로 그린 한 페이지짜리 문서(QR 등) 배치 - 썸네일 PDF('pdf')와 따로 관리"""
+        self.items.append(('vector', fitz.Rect(rect), (src_doc, 0, None)))
+
+    def add_image(self, rect, stream):
+        """이미지(PNG/JPEG 바이트) 배치"""
+        self.items.append(('image', fitz.Rect(rect), stream))
+
+    def without(self, kind):
+        """kind 항목을 뺀 새 오버레이 (예: PDF 썸네일을 얹지 못했을 때 'pdf' 제외)"""
+        overlay = Overlay()
+        overlay.items = [item for item in self.items if item[0] != kind]
+        return overlay
+
+    def __len__(self):
+        return len(self.items)
+
+    def _draw(self, page, images=None):
+        """배치 목록을 추가한 순서대로 페이지에 그림
+
+        images: 대상 문서의 ImageCache (같은 이미지는 한 번만 기록하고 xref 재사용)
+        """
+        images = images or ImageCache(page.parent)
+        for kind, rect, data in self.items:
+            if kind == 'background':
+                shape = page.new_shape()
+                shape.draw_rect(rect)
+                shape.finish(fill=data, stroke_opacity=0)
+                shape.commit()
+            elif kind in ('pdf', 'vector'):
+                src_doc, page_num, clip = data
+                page.show_pdf_page(rect, src_doc, page_num, clip=clip)
+            else:
+                images.insert(page, rect, stream=data)
+
+    def layer(self, width, height):
+        """페이지 크기별 레이어 문서 (처음 요청할 때 한 번 그림)"""
+        key = (round(width, 2), round(height, 2))
+        if key not in self._layers:
+            layer_doc = fitz.open()
+            self._draw(layer_doc.new_page(width=width, height=height))
+            self._layers[key] = layer_doc
+            if cfg.DEBUG_MODE:
+                print(f"    - 오버레이 레이어 생성: {width:.1f}x{height:.1f}, 항목 {len(self.items)}개")
+        return self._layers[key]
+
+    def apply(self, page):
+        """페이지에 레이어 얹기 (같은 크기의 페이지는 같은 Form XObject 공유)
+
+        show_pdf_page는 회전 전 페이지 좌표에 그리므로 레이어도 회전 전 크기로 만듦
+        (항목 좌표는 항목을 페이지에 직접 그리던 때와 같은 회전 전 좌표)
+        """
+        if not self.items:
+            return
+        rect = page.rect * page.derotation_matrix
+        page.show_pdf_page(rect, self.layer(rect.width, rect.height), 0)
+
+    def apply_all(self, doc):
+        """문서의 모든 페이지에 레이어 얹기"""
+        for page in doc:
+            self.apply(page)
+
+    def close(self):
+        for layer_doc in self._layers.values():
+            layer_doc.close()
+        self._layers = {}
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pixmap ↔ NumPy/PIL 변환 도구
+렌더링 결과를 PNG로 인코딩했다가 다시 디코딩하지 않고 픽셀 버퍼를 그대로 사용
+
+- pixmap_to_array : Pixmap.samples를 복사 없이 NumPy 배열(높이 x 너비 x 채널)로
+- pixmap_to_image : Pixmap.samples로 PIL 이미지 생성 (PNG 인코딩/디코딩 없음)
+- image_to_pixmap : PIL 이미지를 PDF에 바로 넣을 수 있는 Pixmap으로
+
+NumPy와 PIL은 실제로 사용할 때 로드
+"""
+
+import fitz  # PyMuPDF
+
+# 채널 수(알파 여부) → PIL 모드
+_PIL_MODES = {
+    (1, False): 'L',
+    (2, True): 'LA',
+    (3, False): 'RGB',
+    (4, True): 'RGBA',
+    (4, False): 'CMYK',
+}
+
+_PIXMAP_COLORSPACES = {
+    'L': fitz.csGRAY,
+    'RGB': fitz.csRGB,
+    'CMYK': fitz.csCMYK,
+}
+
+
+def pixmap_mode(pix):
+    """Pixmap에 해당하는 PIL 모드"""
+    try:
+        return _PIL_MODES[(pix.n, bool(pix.alpha))]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 픽스맵 형식: n={pix.n}, alpha={pix.alpha}")
+
+
+def pixmap_to_array(pix):
+    """Pixmap 픽셀을 복사 없이 NumPy 배열로 (높이, 너비, 채널)
+
+    배열은 pix의 메모리를 그대로 가리키므로 pix가 살아 있는 동안만 사용
+    (배열의 base가 pix.samples_mv를 참조하므로 배열을 들고 있으면 버퍼도 유지됨)
+    """
+    import numpy as np
+
+    arr = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    # 행 끝에 여분 바이트가 있을 수 있으므로 stride 기준으로 자른 뒤 보기만 바꿈
+    arr = arr.reshape(pix.height, pix.stride)[:, :pix.width * pix.n]
+    return arr.reshape(pix.height, pix.width, pix.n)
+
+
+def pixmap_to_image(pix):
+    """Pixmap으로 PIL 이미지 생성 (PNG 인코딩/디코딩 없이 버퍼 직접 사용)
+
+    L/RGBA/CMYK는 버퍼를 공유하고, RGB는 PIL 내부 형식(픽셀당 4바이트) 때문에
+    한 번의 메모리 복사만 일어남. 공유하는 경우를 위해 이미지가 pix를 참조하도록 둠
+    """
+    from PIL import Image
+
+    mode = pixmap_mode(pix)
+    img = Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv,
+                           'raw', mode, pix.stride, 1)
+    img._pixmap_ref = pix
+    return img
+
+
+def image_to_pixmap(img):
+    """PIL 이미지를 Pixmap으로 (insert_image(pixmap=...)로 PNG 없이 삽입)"""
+    if img.mode not in _PIXMAP_COLORSPACES:
+        img = img.convert('RGB')
+    return fitz.Pixmap(_PIXMAP_COLORSPACES[img.mode], img.width, img.height,
+                       img.tobytes(), False)
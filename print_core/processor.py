@@ -0,0 +1,708 @@
+# -*- coding: utf-8 -*-
+
+"""
+인쇄 의뢰서 처리 엔진 (GUI 없이 사용 가능)
+의뢰서 PDF에 인쇄데이터 썸네일과 QR 코드를 삽입
+"""
+
+import os
+import time
+from io import BytesIO
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from . import blank
+from . import composite
+from . import normalize
+from . import output
+from . import proxy
+from . import qrgen
+from . import qrvector
+from . import raster
+from . import saving
+from . import thumbsource
+from .profile import DocumentProfile
+from .overlay import Overlay
+from .resources import resource_summary, describe_resources
+
+
+class PrintProcessor:
+    """GUI 없이 파일 처리를 담당하는 클래스"""
+    
+    def __init__(self):
+        self.dropped_files = {
+            'order_pdf': None,
+            'print_pdf': None,
+            'qr_image': None
+        }
+        # 파일 경로별 문서 프로필 (한 작업 동안 열린 문서를 공유)
+        self.profiles = {}
+        self.proxy_doc = None  # 프록시 썸네일 사본 문서 (작업이 끝나면 닫음)
+        self.save_profile = None  # 이번 작업의 저장 방식 (None이면 PROCESSING_CONFIG['save_profile'])
+    
+    def classify_files(self, files):
+        """파일 목록을 분류"""
+        for file_path in files:
+            if not file_path or file_path == '""':  # 빈 문자열 처리
+                continue
+                
+            ext = Path(file_path).suffix.lower()
+            filename = os.path.basename(file_path)
+            
+            if ext == '.pdf':
+                if '의뢰서' in filename:
+                    self.dropped_files['order_pdf'] = file_path
+                else:
+                    self.dropped_files['print_pdf'] = file_path
+            elif ext in ['.jpg', '.jpeg', '.png']:
+                self.dropped_files['qr_image'] = file_path
+        
+        # 분류된 PDF는 바로 한 번 분석해 둠 (열 수 없는 파일은 처리 단계에서 오류 표시)
+        for key in ('order_pdf', 'print_pdf'):
+            if self.dropped_files[key]:
+                try:
+                    self.get_profile(key)
+                except Exception as e:
+                    if cfg.DEBUG_MODE:
+                        print(f"문서 분석 실패 ({key}): {e}")
+    
+    def saves_incrementally(self):
+        """이번 작업이 의뢰서 파일 끝에 덧붙여 저장하는지
+
+        덧붙이기 저장 + 원본 덮어쓰기 + 최종 래스터화 끔 (래스터화하면 새 문서라 덧붙일 수 없음)
+        """
+        name = self.save_profile or cfg.PROCESSING_CONFIG.get('save_profile')
+        return (name == 'incremental'
+                and cfg.PROCESSING_CONFIG['overwrite_original']
+                and not cfg.PROCESSING_CONFIG.get('rasterize_final', True))
+    
+    def get_profile(self, key):
+        """dropped_files[key] 파일의 문서 프로필 (없으면 만들고, 경로나 여는 방식이 바뀌었으면 다시 만듦)"""
+        path = self.dropped_files[key]
+        # 의뢰서는 같은 경로에 다시 저장하므로 메모리로 읽어 열기 (덧붙이기 저장은 파일에서 열어야 함)
+        in_memory = key == 'order_pdf' and not self.saves_incrementally()
+        profile = self.profiles.get(key)
+        if (profile is not None and profile.path == str(path) and profile.doc is not None
+                and profile.in_memory == in_memory):
+            return profile
+        if profile is not None:
+            profile.close()
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {path}")
+        profile = DocumentProfile(path, in_memory=in_memory)
+        self.profiles[key] = profile
+        return profile
+    
+    def close_profiles(self):
+        """작업이 끝나면 열린 문서 닫기"""
+        for profile in self.profiles.values():
+            profile.close()
+        self.profiles = {}
+        if self.proxy_doc is not None:
+            self.proxy_doc.close()
+            self.proxy_doc = None
+    
+    def process_files_cli(self, files):
+        """명령줄 모드에서 파일 처리"""
+        self.classify_files(files)
+        
+        # 필수 파일 확인
+        if not self.dropped_files['order_pdf']:
+            print("오류: 의뢰서 PDF가 없습니다.")
+            return False
+        
+        if not (self.dropped_files['print_pdf'] or self.dropped_files['qr_image']
+                or self.can_generate_qr()):
+            print("오류: 인쇄데이터 PDF 또는 QR 이미지가 필요합니다.")
+            if cfg.QR_CONFIG.get('generate', False) and not qrgen.available():
+                print("  (QR 생성을 사용하려면: pip install segno)")
+            return False
+        
+        # 파일 처리
+        try:
+            self.process_files()
+            return True
+        except Exception as e:
+            print(f"처리 중 오류: {e}")
+            if cfg.DEBUG_MODE:
+                import traceback
+                traceback.print_exc()
+            return False
+    
+    def can_generate_qr(self, order_path=None):
+        """QR 이미지 없이 의뢰서 정보로 QR을 만들 수 있는지 (QR_CONFIG['generate'])"""
+        if not cfg.QR_CONFIG.get('generate', False) or not qrgen.available():
+            return False
+        return qrgen.order_payload(order_path or self.dropped_files['order_pdf']) is not None
+    
+    def calculate_fit_size(self, original_width, original_height, max_width, max_height):
+        """비율을 유지하면서 최대 크기 안에 맞는 크기 계산"""
+        ratio = min(max_width / original_width, max_height / original_height)
+        new_width = int(original_width * ratio)
+        new_height = int(original_height * ratio)
+        return new_width, new_height
+    
+    def is_blank_page(self, page, threshold=0.99, edge_margin=20):
+        """페이지가 백지인지 확인"""
+        if not cfg.BLANK_DETECTION.get('enabled', True):
+            return False
+        return blank.is_blank_page(page, threshold, edge_margin)
+    
+    def find_non_blank_page(self, pdf_path, max_pages=10):
+        """백지가 아닌 첫 페이지 찾기 (DocumentProfile을 받으면 기록된 결과 재사용)"""
+        if not cfg.BLANK_DETECTION.get('enabled', True):
+            return 0
+        if isinstance(pdf_path, DocumentProfile):
+            return pdf_path.first_non_blank()
+        return blank.find_non_blank_page(
+            pdf_path,
+            threshold=cfg.BLANK_DETECTION.get('threshold', 0.99),
+            edge_margin=cfg.BLANK_DETECTION.get('edge_margin', 20),
+            max_pages=cfg.BLANK_DETECTION.get('max_pages', 10)
+        )
+    
+    def normalize_pdf_to_landscape(self, order_doc, profile=None):
+        """문서를 아크로뱃에서 보이는 그대로 가로형으로 재구성 (normalize_mode 설정 사용)
+
+        임시 파일 없이 메모리 안에서 처리하며, 새 문서를 만들었다면 원래 문서는 닫음
+        profile을 받으면 분석해 둔 페이지 형태를 사용하고 프로필의 문서도 교체
+        """
+        classes = profile.geometry() if profile is not None else None
+        result = normalize.normalize_document(order_doc, classes=classes)
+        if result is not order_doc:
+            if profile is not None:
+                profile.replace_document(result)
+            else:
+                order_doc.close()
+        return result
+    
+    def create_pdf_thumbnail(self, pdf_path, page_num=0, crop_right_half=False):
+        """썸네일로 얹을 PDF 페이지 정보 (열린 문서의 페이지를 그대로 참조)
+
+        pdf_path: PDF 경로 또는 DocumentProfile (프로필이면 열린 문서를 그대로 사용)
+        반환값: ((문서, 페이지 번호, 잘라낼 영역 또는 None), 너비, 높이)
+        경로로 받았으면 반환된 문서는 호출한 쪽에서 닫아야 함
+        """
+        try:
+            profile = pdf_path if isinstance(pdf_path, DocumentProfile) else None
+            
+            # 백지가 아닌 페이지 찾기
+            if cfg.BLANK_DETECTION.get('enabled', True) and page_num == 0:
+                non_blank_page = self.find_non_blank_page(pdf_path)
+                if non_blank_page > 0:
+                    print(f"  - 백지 감지: 페이지 {non_blank_page + 1}을 썸네일로 사용")
+                    page_num = non_blank_page
+            
+            doc = profile.doc if profile is not None else fitz.open(pdf_path)
+            page = doc[page_num]
+            
+            if crop_right_half:
+                # 표지: 오른쪽 50%만 잘라서 사용
+                clip = fitz.Rect(page.rect.width / 2, 0, page.rect.width, page.rect.height)
+                return (doc, page_num, clip), page.rect.width / 2, page.rect.height
+            
+            # 전체 페이지 사용
+            return (doc, page_num, None), page.rect.width, page.rect.height
+                
+        except Exception as e:
+            if cfg.DEBUG_MODE:
+                print(f"PDF 썸네일 생성 실패: {e}")
+                import traceback
+                traceback.print_exc()
+            raise e
+    
+    def make_thumbnail_proxy(self, thumb_source, width, height):
+        """썸네일 원본 페이지의 이미지를 배치 크기에 맞게 줄인 사본으로 교체
+
+        줄일 이미지가 없으면 원본 페이지를 그대로 사용
+        """
+        src_doc, page_num, clip = thumb_source
+        fit_w, _ = self.calculate_fit_size(
+            width, height, cfg.THUMBNAIL_CONFIG['max_width'], cfg.THUMBNAIL_CONFIG['max_height'])
+        try:
+            proxy_doc, report = proxy.make_proxy(src_doc, page_num, fit_w / width)
+        except Exception as e:
+            print(f"  - 프록시 썸네일 생성 실패, 원본 사용: {e}")
+            return thumb_source
+        
+        if not report['images']:
+            proxy_doc.close()
+            return thumb_source
+        print(f"  - 프록시 썸네일: {proxy.describe(report)}")
+        if not (report['replaced'] or report['cached']):
+            proxy_doc.close()
+            return thumb_source
+        
+        self.proxy_doc = proxy_doc
+        return (proxy_doc, 0, clip)
+    
+    def get_normalized_rect(self, x, y, width, height, page):
+        """정규화된 가로형 PDF에서는 좌표 변환이 필요 없음"""
+        return fitz.Rect(x, y, x + width, y + height)
+    
+    def draw_white_background(self, page, x, y, width, height, padding=0):
+        """썸네일 뒤에 흰색 배경 그리기"""
+        # 패딩을 포함한 사각형 좌표
+        rect = fitz.Rect(
+            x - padding,
+            y - padding,
+            x + width + padding,
+            y + height + padding
+        )
+        
+        # 흰색 배경 그리기
+        shape = page.new_shape()
+        shape.draw_rect(rect)
+        shape.finish(
+            fill=(1, 1, 1),  # 흰색 (RGB: 1, 1, 1)
+            stroke_opacity=0  # 테두리 없음
+        )
+        shape.commit()
+        
+        if cfg.DEBUG_MODE:
+            print(f"    - 흰색 배경 추가: {rect.width:.1f}x{rect.height:.1f} (패딩: {padding})")
+    
+    def build_overlay(self, thumb_source=None, thumbnail_data=None, thumb_size=(0, 0),
+                      qr_data=None, qr_size=(0, 0), use_white_bg=True, bg_padding=0, qr_source=None):
+        """의뢰서 페이지에 얹을 오버레이 구성 (흰색 배경 → 썸네일 → QR 순서)
+
+        thumb_source: 벡터로 얹을 썸네일 (문서, 페이지 번호, 잘라낼 영역) - create_pdf_thumbnail 결과
+        thumbnail_data: thumb_source가 없을 때 사용할 이미지 썸네일 바이트
+        qr_source: 벡터 QR 문서 (qrvector.vector_qr 결과), 없으면 qr_data 이미지 사용
+        """
+        overlay = Overlay()
+        thumb_w, thumb_h = thumb_size
+        
+        if thumb_source is not None or thumbnail_data:
+            for pos in cfg.THUMBNAIL_CONFIG['positions']:
+                # 중앙 정렬을 위한 오프셋 계산
+                x_offset = (cfg.THUMBNAIL_CONFIG['max_width'] - thumb_w) // 2
+                y_offset = (cfg.THUMBNAIL_CONFIG['max_height'] - thumb_h) // 2
+                actual_x = pos['x'] + x_offset
+                actual_y = pos['y'] + y_offset
+                
+                if use_white_bg:
+                    overlay.add_background(fitz.Rect(
+                        actual_x - bg_padding, actual_y - bg_padding,
+                        actual_x + thumb_w + bg_padding, actual_y + thumb_h + bg_padding
+                    ))
+                    if cfg.DEBUG_MODE:
+                        print(f"    - 흰색 배경 추가: {thumb_w + bg_padding * 2:.1f}x"
+                              f"{thumb_h + bg_padding * 2:.1f} (패딩: {bg_padding})")
+                
+                target_rect = fitz.Rect(actual_x, actual_y, actual_x + thumb_w, actual_y + thumb_h)
+                if thumb_source is not None:
+                    # PDF 페이지 직접 삽입 (벡터 유지)
+                    src_doc, src_page, clip = thumb_source
+                    overlay.add_pdf(target_rect, src_doc, src_page, clip=clip)
+                else:
+                    overlay.add_image(target_rect, thumbnail_data)
+        
+        if qr_data or qr_source is not None:
+            qr_w, qr_h = qr_size
+            for pos in cfg.QR_CONFIG['positions']:
+                x_offset = (cfg.QR_CONFIG['max_width'] - qr_w) // 2
+                y_offset = (cfg.QR_CONFIG['max_height'] - qr_h) // 2
+                qr_rect = fitz.Rect(
+                    pos['x'] + x_offset, pos['y'] + y_offset,
+                    pos['x'] + x_offset + qr_w, pos['y'] + y_offset + qr_h
+                )
+                if qr_source is not None:
+                    overlay.add_vector(qr_rect, qr_source)
+                else:
+                    overlay.add_image(qr_rect, qr_data)
+        
+        return overlay
+    
+    def process_files(self):
+        """파일 처리 메인 로직"""
+        try:
+            start_time = time.time()
+            blank.reset_stats()
+            
+            print("\n" + "="*60)
+            print("인쇄 의뢰서 자동화 처리 시작")
+            print("="*60)
+            
+            # 이전 실행이 강제 종료되어 남은 임시 파일 정리
+            if self.dropped_files['order_pdf']:
+                removed = output.cleanup(os.path.dirname(os.path.abspath(self.dropped_files['order_pdf'])))
+                if removed:
+                    print(f"이전 작업의 임시 파일 {len(removed)}개 삭제")
+            
+            if cfg.DEBUG_MODE:
+                print("\n[디버그 모드 활성화]")
+                print(f"의뢰서 PDF: {self.dropped_files['order_pdf']}")
+                print(f"인쇄데이터 PDF: {self.dropped_files['print_pdf']}")
+                print(f"QR 이미지: {self.dropped_files['qr_image']}")
+            
+            # PDF 썸네일과 QR 데이터 초기화
+            thumb_source = None
+            thumb_pdf_w = thumb_pdf_h = 0
+            thumbnail_data = None  # 대체 이미지 방식용
+            thumb_w = thumb_h = 0
+            qr_data = None
+            qr_source = None  # 벡터 QR 문서
+            qr_w = qr_h = 0
+            
+            # 1. 인쇄데이터 PDF가 있으면 PDF 직접 삽입용 데이터 생성
+            if self.dropped_files['print_pdf']:
+                print("\n1. 인쇄 데이터 PDF 처리 중...")
+                
+                try:
+                    # 파일명에 '표지' 포함 여부 확인
+                    filename = os.path.basename(self.dropped_files['print_pdf'])
+                    crop_right_half = '표지' in filename
+                    
+                    if crop_right_half:
+                        print("  - 표지 파일 감지: 오른쪽 50%만 사용")
+                    
+                    # 한 번 열어 분석한 문서 사용 (없는 파일이면 오류)
+                    print_profile = self.get_profile('print_pdf')
+                    print(f"  - 문서 분석: {print_profile.describe()}")
+                    
+                    # PDF 직접 삽입할 페이지 (열린 문서를 그대로 참조)
+                    thumb_source, thumb_pdf_w, thumb_pdf_h = self.create_pdf_thumbnail(
+                        print_profile,
+                        page_num=0,
+                        crop_right_half=crop_right_half
+                    )
+                    
+                    print(f"  - PDF 썸네일 준비 완료: {thumb_pdf_w:.1f}x{thumb_pdf_h:.1f}")
+                    print(f"  - 벡터 형식 유지 (품질 손실 없음)")
+                    
+                    # 고해상도 사진은 썸네일 크기에 맞게 줄인 사본 페이지 사용 (글자/선은 벡터 유지)
+                    if cfg.THUMBNAIL_CONFIG.get('proxy_images', True):
+                        thumb_source = self.make_thumbnail_proxy(thumb_source, thumb_pdf_w, thumb_pdf_h)
+                    
+                except Exception as e:
+                    print(f"  - PDF 처리 실패: {e}")
+                    print("  - 대체 방법: 이미지로 변환하여 처리합니다.")
+                    
+                    # 실패 시 기존 이미지 방식으로 대체
+                    try:
+                        # 백지가 아닌 페이지 찾기 (앞에서 검사한 결과 재사용)
+                        print_profile = self.get_profile('print_pdf')
+                        page_num = self.find_non_blank_page(print_profile)
+                        
+                        first_page = print_profile.doc[page_num]
+                        
+                        # 표지 크롭 처리 (오른쪽 절반)
+                        area = first_page.rect
+                        clip = None
+                        if crop_right_half:
+                            clip = fitz.Rect(area.x0 + area.width / 2, area.y0, area.x1, area.y1)
+                            area = clip
+                        
+                        # 삽입 크기(pt) 계산 (2배 해상도 기준 비율)
+                        thumb_w, thumb_h = self.calculate_fit_size(
+                            area.width * 2, area.height * 2,
+                            cfg.THUMBNAIL_CONFIG['max_width'],
+                            cfg.THUMBNAIL_CONFIG['max_height']
+                        )
+                        # 삽입 크기와 출력 해상도에 맞는 픽셀 크기 (그보다 크게 렌더링하지 않음)
+                        render_dpi = cfg.THUMBNAIL_CONFIG.get('render_dpi', thumbsource.DEFAULT_DPI)
+                        target = thumbsource.fit_target(area, (thumb_w, thumb_h), render_dpi)
+                        
+                        # 가장 싼 원본 선택 (/Thumb, 페이지 전체 JPEG/이미지, 렌더링 순)
+                        source = thumbsource.select_source(first_page, target, clip)
+                        thumbnail_data = None
+                        if clip is None:
+                            thumbnail_data = thumbsource.jpeg_passthrough(first_page, source, target)
+                        
+                        if thumbnail_data:
+                            kind = f"{source['kind']}, JPEG 그대로 사용"
+                        else:
+                            img, kind = thumbsource.make_thumbnail(first_page, target, clip, source=source)
+                            
+                            # PNG로 저장
+                            thumb_buffer = BytesIO()
+                            img.save(thumb_buffer, format='PNG')
+                            thumbnail_data = thumb_buffer.getvalue()
+                        
+                        print(f"  - 대체 이미지 썸네일 생성 완료: {thumb_w}x{thumb_h} "
+                              f"({target[0]}x{target[1]}px, 원본: {kind})")
+                        
+                    except Exception as e2:
+                        print(f"  - 대체 방법도 실패: {e2}")
+                        thumbnail_data = None
+            
+            # 2. QR 이미지가 있으면 로드 및 리사이즈 (개선된 방식)
+            if self.dropped_files['qr_image']:
+                print("\n2. QR 이미지 처리 중...")
+                from PIL import Image, ImageEnhance
+                
+                with open(self.dropped_files['qr_image'], 'rb') as f:
+                    qr_bytes = f.read()
+                qr_img = Image.open(BytesIO(qr_bytes))
+                print(f"  - 원본 QR 크기: {qr_img.width}x{qr_img.height}")
+                
+                qr_max_w = cfg.QR_CONFIG['max_width']
+                qr_max_h = cfg.QR_CONFIG['max_height']
+                qr_w, qr_h = self.calculate_fit_size(
+                    qr_img.width, qr_img.height, qr_max_w, qr_max_h
+                )
+                
+                print(f"  - 목표 QR 크기: {qr_max_w}x{qr_max_h}")
+                print(f"  - 조정된 크기: {qr_w}x{qr_h}")
+                
+                # 모듈 격자를 읽을 수 있으면 벡터 사각형으로 (같은 이미지는 다시 읽지 않음)
+                if cfg.QR_CONFIG.get('vector', True):
+                    qr_source = qrvector.vector_qr(qr_bytes)
+                    if qr_source is not None:
+                        print("  - QR 코드 최적화: 모듈 격자 인식 → 벡터 사각형")
+                    else:
+                        print("  - QR 격자를 인식하지 못해 이미지로 처리합니다.")
+                
+                if qr_source is None:
+                    # QR 코드에 최적화된 리사이즈 (NEAREST + 샤프닝)
+                    qr_img = qr_img.resize((qr_w, qr_h), Image.Resampling.NEAREST)
+                    
+                    # 샤프닝 필터 적용으로 경계선 강화
+                    enhancer = ImageEnhance.Sharpness(qr_img)
+                    qr_img = enhancer.enhance(2.0)  # 샤프니스 2배 증가
+                    
+                    print("  - QR 코드 최적화: NEAREST 리샘플링 + 샤프닝 적용")
+                    
+                    # PIL 이미지를 바이트로 변환
+                    qr_buffer = BytesIO()
+                    qr_img.save(qr_buffer, format='PNG')
+                    qr_data = qr_buffer.getvalue()
+            
+            # QR 이미지가 없으면 의뢰서 파일명/주문 목록으로 QR 생성 (벡터, 같은 내용은 재사용)
+            elif cfg.QR_CONFIG.get('generate', False):
+                payload, qr_source = qrgen.order_qr(self.dropped_files['order_pdf'])
+                if payload is None:
+                    print("\n2. QR 생성 건너뜀: 의뢰서 파일명/주문 목록에서 QR 내용을 찾지 못했습니다.")
+                elif qr_source is None:
+                    print("\n2. QR 생성 건너뜀: segno 또는 qrcode 패키지가 필요합니다.")
+                else:
+                    print(f"\n2. QR 코드 생성: {payload}")
+                    side = qr_source[0].rect.width
+                    qr_w, qr_h = self.calculate_fit_size(
+                        side, side, cfg.QR_CONFIG['max_width'], cfg.QR_CONFIG['max_height']
+                    )
+            
+            # 3. 백업 생성 (설정된 경우)
+            # 원본은 메모리로 열려 있고 저장할 때 새 파일로 바꿔치기되므로 하드 링크 백업도 이전 내용을 유지
+            # (덧붙이기 저장은 원본 파일을 제자리에서 고치므로 하드 링크를 쓰지 않음)
+            if cfg.PROCESSING_CONFIG['backup_before_save']:
+                backup_path = Path(self.dropped_files['order_pdf'])
+                backup_name = backup_path.stem + cfg.PROCESSING_CONFIG['backup_suffix'] + backup_path.suffix
+                backup_full_path = backup_path.parent / backup_name
+                method = output.backup_file(self.dropped_files['order_pdf'], backup_full_path,
+                                            in_place=self.saves_incrementally())
+                if cfg.DEBUG_MODE:
+                    print(f"\n백업 생성 ({output.BACKUP_METHODS[method]}): {backup_full_path}")
+            
+            # 4. 의뢰서 PDF (분류할 때 메모리로 열어 둔 문서, 원본 파일을 잠그지 않음 - 덧붙이기 저장은 파일에서 연 문서)
+            order_pdf_path = self.dropped_files['order_pdf']
+            order_profile = self.get_profile('order_pdf')
+            order_doc = order_profile.doc
+            
+            # 파일명으로 정규화 필요 여부 추가 체크
+            filename = os.path.basename(order_pdf_path)
+            skip_normalize = 'skip_norm' in filename.lower()
+            
+            # 래스터화까지 하는 작업은 정규화/오버레이/래스터화를 페이지마다 렌더링 한 번으로 (합성 경로)
+            normalize_pages = cfg.PROCESSING_CONFIG.get('auto_normalize', True) and not skip_normalize
+            fused = composite.enabled(normalize_pages)
+            page_classes = None
+            
+            # 의뢰서 PDF 정규화 (자동 정규화 설정된 경우)
+            if normalize_pages and fused:
+                print("\n3. PDF 정규화 중...")
+                print("  - 래스터화 합성 경로: 회전/배치를 최종 렌더링에서 바로 적용")
+                page_classes = order_profile.geometry()
+                print(f"  - 페이지 형태: {normalize.describe_geometry(page_classes)}")
+            elif normalize_pages:
+                print("\n3. PDF 정규화 중...")
+                mode_names = {'vector': '벡터', 'raster': '렌더링', 'external': '외부 모듈'}
+                print(f"  - {mode_names[normalize.get_normalize_mode()]} 방식으로 페이지 재구성")
+                normalized_doc = self.normalize_pdf_to_landscape(order_doc, order_profile)
+                if normalized_doc is not order_doc:
+                    order_doc = normalized_doc
+                    print("  - PDF 정규화 완료!")
+            elif skip_normalize:
+                print("\n파일명에 'skip_norm'이 포함되어 정규화를 건너뜁니다.")
+            
+            # 5. 의뢰서 PDF 수정
+            print("\n4. 의뢰서 PDF 처리 중...")
+            
+            # 흰색 배경 설정 확인
+            use_white_bg = cfg.THUMBNAIL_CONFIG.get('white_background', True)
+            bg_padding = cfg.THUMBNAIL_CONFIG.get('background_padding', 5)
+            
+            if use_white_bg and cfg.DEBUG_MODE:
+                print(f"  - 썸네일 흰색 배경 활성화 (패딩: {bg_padding}px)")
+            
+            # 같은 이미지/썸네일이 한 번만 기록되었는지 확인용 (디버그 모드, 합성 경로는 의뢰서를 바꾸지 않음)
+            resources_before = resource_summary(order_doc) if cfg.DEBUG_MODE and not fused else None
+            
+            # 배경, 썸네일, QR을 한 장의 레이어로 구성 (페이지마다 다시 그리지 않음)
+            # PDF 썸네일은 인쇄데이터 문서의 페이지를 그대로 참조 (직렬화/재해석 없음)
+            if thumb_source:
+                thumb_w, thumb_h = self.calculate_fit_size(
+                    thumb_pdf_w, thumb_pdf_h,
+                    cfg.THUMBNAIL_CONFIG['max_width'],
+                    cfg.THUMBNAIL_CONFIG['max_height']
+                )
+            overlay = self.build_overlay(
+                thumb_source=thumb_source,
+                thumbnail_data=None if thumb_source else thumbnail_data,
+                thumb_size=(thumb_w, thumb_h),
+                qr_data=qr_data,
+                qr_source=qr_source,
+                qr_size=(qr_w, qr_h),
+                use_white_bg=use_white_bg,
+                bg_padding=bg_padding
+            )
+            thumb_kind = "PDF 썸네일" if thumb_source else "이미지 썸네일"
+            thumb_count = len(cfg.THUMBNAIL_CONFIG['positions']) if (thumb_source or thumbnail_data) else 0
+            qr_count = len(cfg.QR_CONFIG['positions']) if (qr_data or qr_source is not None) else 0
+            
+            if fused:
+                # 오버레이는 페이지 크기별로 한 번만 렌더링해 두고 래스터화할 때 픽셀로 합성
+                placements = composite.plan_pages(order_doc, page_classes)
+                try:
+                    overlay_layers = composite.render_overlays(overlay, placements)
+                except Exception as e:
+                    if not thumb_source:
+                        raise
+                    # PDF 썸네일을 그리지 못하면 썸네일 없이 배경과 QR만 사용
+                    print(f"    - PDF 삽입 실패: {e}")
+                    overlay.close()
+                    overlay = overlay.without('pdf')
+                    thumb_source = None
+                    thumb_count = 0
+                    overlay_layers = composite.render_overlays(overlay, placements)
+                
+                for page_num, ((width, height), _, _) in enumerate(placements):
+                    page = order_doc[page_num]
+                    
+                    print(f"\n  페이지 {page_num + 1}/{len(order_doc)}:")
+                    print(f"    - 크기: {page.rect.width:.1f}x{page.rect.height:.1f} → {width:.1f}x{height:.1f}")
+                    print(f"    - 회전: {page.rotation}도")
+                    if thumb_count:
+                        print(f"    - {thumb_kind} {thumb_count}개 합성")
+                    if qr_count:
+                        print(f"    - QR 코드 {qr_count}개 합성")
+            else:
+                for page_num in range(len(order_doc)):
+                    page = order_doc[page_num]
+                    
+                    print(f"\n  페이지 {page_num + 1}/{len(order_doc)}:")
+                    print(f"    - 크기: {page.rect.width:.1f}x{page.rect.height:.1f}")
+                    print(f"    - 회전: {page.rotation}도")
+                    
+                    try:
+                        overlay.apply(page)
+                    except Exception as e:
+                        if not thumb_source:
+                            raise
+                        # PDF 썸네일을 얹지 못하면 썸네일 없이 배경과 QR만 사용
+                        print(f"    - PDF 삽입 실패: {e}")
+                        overlay.close()
+                        overlay = overlay.without('pdf')
+                        thumb_source = None
+                        thumb_count = 0
+                        overlay.apply(page)
+                    
+                    if thumb_count:
+                        quality = " (벡터 품질)" if thumb_source else ""
+                        print(f"    - {thumb_kind} {thumb_count}개 삽입{quality}")
+                    if qr_count:
+                        print(f"    - QR 코드 {qr_count}개 삽입")
+            
+            overlay.close()
+            
+            if resources_before is not None:
+                print(f"\n  - 리소스 (처리 전): {describe_resources(resources_before)}")
+                print(f"  - 리소스 (처리 후): {describe_resources(resource_summary(order_doc))}")
+            
+            # 6. 저장
+            print("\n5. 저장 중...")
+            
+            # 래스터화 옵션 확인
+            should_rasterize = cfg.PROCESSING_CONFIG.get('rasterize_final', True)
+            final_resources = None  # 결과 문서 리소스 (래스터화하면 압축 결과로 알 수 있음)
+            
+            if should_rasterize:
+                print("  - 최종 PDF 래스터화 활성화 (품질 유지 + 용량 최적화)")
+                # 200 DPI로 렌더링한 이미지 페이지로 이루어진 새 문서 (페이지가 많으면 작업 프로세스로 나눠 처리)
+                if fused:
+                    raster_doc, workers, raster_report = composite.compose_document(
+                        order_doc, placements, overlay_layers)
+                else:
+                    raster_doc, workers, raster_report = raster.rasterize_document(order_doc)
+                
+                # 래스터화된 문서로 교체
+                order_profile.replace_document(raster_doc)
+                order_doc = raster_doc
+                final_resources = raster.report_resources(raster_report)
+                # 페이지마다 고른 압축 방식과 크기 (디버그 모드면 기존 RGB Flate 대비 절약량)
+                for line in raster.describe(raster_report):
+                    print(f"    - {line}")
+                if workers > 1:
+                    print(f"  - 래스터화 완료 (작업 프로세스 {workers}개)")
+                else:
+                    print("  - 래스터화 완료")
+            
+            # 원본이 메모리로 열려 있으므로 최종 경로에 한 번만 기록 (덧붙이기 저장은 바뀐 부분만 원본 끝에)
+            if cfg.PROCESSING_CONFIG['overwrite_original']:
+                output_path = self.dropped_files['order_pdf']
+                save_profile, save_time = saving.save_document(order_doc, output_path, self.save_profile)
+                print(f"  - 원본 파일 덮어쓰기 완료: {os.path.basename(output_path)}")
+            else:
+                # 새 파일로 저장
+                save_path = Path(self.dropped_files['order_pdf'])
+                new_name = save_path.stem + '_processed' + save_path.suffix
+                output_path = str(save_path.parent / new_name)
+                save_profile, save_time = saving.save_document(order_doc, output_path, self.save_profile)
+                print(f"  - 새 파일로 저장: {new_name}")
+            print(f"  - 저장 방식: {saving.describe(save_profile, save_time)}")
+            
+            print("\n✅ 모든 처리가 완료되었습니다!")
+            
+            # 처리 시간 계산
+            end_time = time.time()
+            processing_time = end_time - start_time
+            print(f"⏱️  처리 시간: {processing_time:.2f}초")
+            
+            # 백지 검사 통계 (구조 판정으로 렌더링을 생략한 페이지 수)
+            blank_summary = blank.describe_stats()
+            if blank_summary:
+                print(f"🔍 백지 검사: {blank_summary}")
+            
+            # 파일 크기 정보 출력
+            if os.path.exists(output_path):
+                file_size = os.path.getsize(output_path) / 1024 / 1024  # MB
+                print(f"📄 최종 파일 크기: {file_size:.2f} MB")
+                # 래스터화하지 않은 문서는 모든 XObject를 훑어야 하므로 디버그 모드에서만
+                if final_resources is None and cfg.DEBUG_MODE:
+                    final_resources = resource_summary(order_doc)
+                if final_resources is not None:
+                    print(f"📦 리소스: {describe_resources(final_resources)}")
+            
+            print("="*60 + "\n")
+            
+        except Exception as e:
+            error_msg = str(e)
+            print("\n" + "="*60)
+            print("❌ 오류 발생!")
+            print("="*60)
+            print(f"오류 내용: {error_msg}")
+            
+            if cfg.DEBUG_MODE:
+                import traceback
+                print("\n[상세 오류 정보]")
+                traceback.print_exc()
+            
+            print("="*60 + "\n")
+            raise e
+        
+        finally:
+            # 작업 중 열어 둔 문서 닫기 (의뢰서는 다음 작업에서 새로 분석)
+            self.close_profiles()
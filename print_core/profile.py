@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""
+문서 프로필
+파일을 분류할 때 한 번 열어 분석한 결과와 열린 문서를 함께 보관
+정규화, 썸네일, 삽입 단계가 같은 프로필을 받아 쓰므로 파일을 다시 열거나 다시 검사하지 않음
+
+페이지마다 기록하는 것:
+- number, rect(회전 적용 표시 크기), mediabox, cropbox, rotation
+- geometry   : 정규화 분류 (normalize.classify_page)
+- has_images : 이미지 리소스가 있는지
+- has_text   : 글꼴 리소스가 있는지
+- blank      : 백지 여부 (first_non_blank()로 검사한 페이지만, 나머지는 None)
+- fingerprint: 페이지 지문 (처음 요청할 때 계산)
+"""
+
+import os
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from . import blank
+from . import normalize
+from .fingerprint import page_fingerprint
+
+
+class DocumentProfile:
+    """한 번 열어 분석한 PDF와 페이지별 정보"""
+
+    def __init__(self, path, in_memory=False):
+        """path: PDF 경로
+        in_memory: 파일을 메모리로 읽어 열기 (원본을 잠그지 않으므로 같은 경로에 저장 가능)
+        """
+        self.path = str(path)
+        self.name = os.path.basename(self.path)
+        self.in_memory = in_memory
+        if in_memory:
+            self.doc = normalize.open_pdf(self.path)
+        else:
+            self.doc = fitz.open(self.path)
+        self.pages = [self._profile_page(page) for page in self.doc]
+        self._fingerprint_memo = {}
+
+        if cfg.DEBUG_MODE:
+            print(f"문서 분석: {self.name} - {self.describe()}")
+
+    @staticmethod
+    def _profile_page(page):
+        """페이지 정보 (리소스 목록만 읽고 내용은 해석하지 않음)"""
+        return {
+            'number': page.number,
+            'rect': fitz.Rect(page.rect),
+            'mediabox': fitz.Rect(page.mediabox),
+            'cropbox': fitz.Rect(page.cropbox),
+            'rotation': page.rotation,
+            'geometry': normalize.classify_page(page),
+            'has_images': bool(page.get_images()),
+            'has_text': bool(page.get_fonts()),
+            'blank': None,
+            'fingerprint': None,
+        }
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def geometry(self):
+        """페이지별 정규화 분류 목록"""
+        return [info['geometry'] for info in self.pages]
+
+    def fingerprint(self, page_num):
+        """페이지 지문 (한 번 계산하면 보관, 공통 리소스 해시는 문서 안에서 공유)"""
+        info = self.pages[page_num]
+        if info['fingerprint'] is None:
+            info['fingerprint'] = page_fingerprint(self.doc[page_num], memo=self._fingerprint_memo)
+        return info['fingerprint']
+
+    def first_non_blank(self, max_pages=None, threshold=None, edge_margin=None):
+        """백지가 아닌 첫 페이지 번호 (모두 백지면 0)
+
+        앞 페이지부터 검사하며 결과를 pages[n]['blank']에 기록하므로
+        같은 프로필에서 다시 부르면 렌더링하지 않음
+        """
+        if not cfg.BLANK_DETECTION.get('enabled', True):
+            return 0
+
+        max_pages = cfg.BLANK_DETECTION.get('max_pages', 10) if max_pages is None else max_pages
+        threshold = cfg.BLANK_DETECTION.get('threshold', 0.99) if threshold is None else threshold
+        edge_margin = cfg.BLANK_DETECTION.get('edge_margin', 20) if edge_margin is None else edge_margin
+        params = blank.make_params('ratio', threshold, 0.5, (edge_margin,) * 4)
+
+        max_search = min(max_pages, len(self.pages))
+        for page_num in range(max_search):
+            info = self.pages[page_num]
+            if info['blank'] is None:
+                try:
+                    result = blank.detect_blank_pages(self.doc, [page_num], params)
+                    info['blank'] = bool(result['blank'][0])
+                except Exception as e:
+                    if cfg.DEBUG_MODE:
+                        print(f"  백지 검사 실패: {e}")
+                    info['blank'] = False
+            if not info['blank']:
+                return page_num
+
+        if cfg.DEBUG_MODE:
+            print(f"  -> 처음 {max_search}페이지가 모두 백지입니다. 첫 페이지 사용.")
+        return 0
+
+    def describe(self):
+        """작업 로그용 요약"""
+        images = sum(1 for info in self.pages if info['has_images'])
+        text = sum(1 for info in self.pages if info['has_text'])
+        return (f"{len(self.pages)}페이지, {normalize.describe_geometry(self.geometry())}, "
+                f"이미지 {images}페이지, 글자 {text}페이지")
+
+    def replace_document(self, doc):
+        """정규화 등으로 새 문서를 만들었을 때 교체하고 페이지 정보 갱신"""
+        if doc is self.doc:
+            return
+        self.doc.close()
+        self.doc = doc
+        self.pages = [self._profile_page(page) for page in doc]
+        self._fingerprint_memo = {}
+
+    def close(self):
+        if self.doc is not None:
+            self.doc.close()
+            self.doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
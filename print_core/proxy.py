@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+프록시 썸네일
+인쇄데이터의 고해상도 사진을 썸네일 크기에 맞는 해상도로 줄인 사본 페이지를 만들어 사용
+글자와 선(벡터)은 그대로 두고 이미지 스트림만 교체
+
+- 사본 페이지는 insert_pdf로 만든 메모리 문서 (원본 문서는 건드리지 않음)
+- 이미지마다 실제 배치 크기 x 썸네일 배율로 유효 해상도를 계산해 proxy_dpi에 맞게 축소
+- 원본이 JPEG이면 JPEG으로, 그 외는 Flate로 다시 압축
+- 투명 마스크(SMask)가 있거나 1비트/특수 색공간(Indexed, Separation 등) 이미지는 그대로 둠
+- 축소 결과는 원본 이미지별로 보관하여 같은 인쇄데이터를 다시 처리할 때 재사용
+"""
+
+import hashlib
+import os
+import time
+import zlib
+from collections import OrderedDict
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+
+DEFAULT_DPI = 300
+JPEG_QUALITY = 85
+MIN_REDUCTION = 0.75   # 이보다 덜 줄어드는 이미지는 다시 압축하지 않음
+CACHE_LIMIT_MB = 64
+
+# 처리할 수 있는 색공간
+_COLORSPACES = ('DeviceGray', 'DeviceRGB', 'DeviceCMYK', 'ICCBased')
+_DEVICE_NAMES = {1: '/DeviceGray', 3: '/DeviceRGB', 4: '/DeviceCMYK'}
+_JPEG_FILTERS = ('DCTDecode', 'JPXDecode')
+
+# (원본 이미지 식별자, 너비, 높이) → (스트림, 필터, 성분 수) - 최근에 쓴 순서
+_cache = OrderedDict()
+_cache_bytes = 0
+
+
+def clear_cache():
+    global _cache_bytes
+    _cache.clear()
+    _cache_bytes = 0
+
+
+def _cache_put(key, value):
+    global _cache_bytes
+    _cache[key] = value
+    _cache_bytes += len(value[0])
+    while _cache_bytes > CACHE_LIMIT_MB * 1024 * 1024 and len(_cache) > 1:
+        _, value = _cache.popitem(last=False)
+        _cache_bytes -= len(value[0])
+
+
+def _source_ids(src_doc, page_num, copy_images):
+    """사본 이미지 xref → 원본 이미지 식별자 (캐시 키)
+
+    파일에서 연 문서는 (경로, 수정 시각, 원본 xref), 메모리 문서는 스트림 해시
+    """
+    src_images = src_doc[page_num].get_images(full=True)
+    name = src_doc.name
+    same_order = len(src_images) == len(copy_images) and all(
+        a[2:8] == b[2:8] for a, b in zip(src_images, copy_images))
+    if name and os.path.exists(name) and same_order:
+        stamp = os.path.getmtime(name)
+        return {b[0]: (name, stamp, a[0]) for a, b in zip(src_images, copy_images)}
+    return None
+
+
+def _placements(page):
+    """이미지 크기(픽셀)별 가장 큰 배치 크기 (이미지 가로축, 세로축 방향의 pt)
+
+    xref 확인(xrefs=True)은 이미지를 모두 디코딩하므로 쓰지 않고 픽셀 크기로 묶음
+    크기가 같은 이미지가 여럿이면 가장 크게 배치된 것을 기준으로 함 (덜 줄이는 쪽)
+    """
+    sizes = {}
+    for info in page.get_image_info():
+        a, b, c, d = info['transform'][:4]
+        key = (info['width'], info['height'])
+        w, h = sizes.get(key, (0, 0))
+        sizes[key] = (max(w, (a * a + b * b) ** 0.5), max(h, (c * c + d * d) ** 0.5))
+    return sizes
+
+
+def _encode(pix, as_jpeg):
+    if as_jpeg:
+        return pix.tobytes("jpg", jpg_quality=JPEG_QUALITY), '/DCTDecode'
+    return zlib.compress(pix.samples), '/FlateDecode'
+
+
+def _write(doc, xref, data, filt, width, height, keep_colorspace, n):
+    """이미지 스트림과 사전 교체 (xref 번호는 유지하므로 참조는 그대로)"""
+    doc.update_stream(xref, data, compress=False)
+    doc.xref_set_key(xref, 'Filter', filt)
+    doc.xref_set_key(xref, 'Width', str(width))
+    doc.xref_set_key(xref, 'Height', str(height))
+    doc.xref_set_key(xref, 'BitsPerComponent', '8')
+    if doc.xref_get_key(xref, 'Decode')[0] != 'null':
+        doc.xref_set_key(xref, 'Decode', 'null')
+    if not keep_colorspace:
+        doc.xref_set_key(xref, 'ColorSpace', _DEVICE_NAMES[n])
+
+
+def make_proxy(src_doc, page_num, scale, dpi=None):
+    """이미지를 축소한 사본 페이지 문서 생성
+
+    scale: 원본 페이지 pt → 썸네일 pt 배율
+    dpi: 썸네일 안에서 이미지가 가질 해상도 (기본 THUMBNAIL_CONFIG['proxy_dpi'] 또는 300)
+    반환값: (사본 문서, 보고 사전)
+    """
+    start = time.perf_counter()
+    dpi = dpi or cfg.THUMBNAIL_CONFIG.get('proxy_dpi', DEFAULT_DPI)
+    report = {'images': 0, 'replaced': 0, 'cached': 0, 'skipped': 0,
+              'bytes_before': 0, 'bytes_after': 0, 'seconds': 0.0}
+
+    proxy = fitz.open()
+    proxy.insert_pdf(src_doc, from_page=page_num, to_page=page_num)
+    page = proxy[0]
+    images = page.get_images(full=True)
+    ids = _source_ids(src_doc, page_num, images)
+    sizes = _placements(page)
+
+    done = set()
+    for xref, smask, width, height, bpc, cs_name, alt, name, filt, referencer in images:
+        if xref in done:
+            continue
+        done.add(xref)
+        report['images'] += 1
+        raw_len = len(proxy.xref_stream_raw(xref) or b'')
+        placed = sizes.get((width, height))
+
+        if smask or bpc not in (8, 16) or cs_name not in _COLORSPACES or not placed:
+            report['skipped'] += 1
+            continue
+
+        # 썸네일 안에서의 크기(pt) → 필요한 픽셀 수
+        factor = max(placed[0] * scale * dpi / 72 / width,
+                     placed[1] * scale * dpi / 72 / height)
+        if factor > MIN_REDUCTION:
+            report['skipped'] += 1
+            continue
+        new_w = max(1, int(round(width * factor)))
+        new_h = max(1, int(round(height * factor)))
+
+        source_id = ids[xref] if ids else hashlib.blake2b(
+            proxy.xref_stream_raw(xref), digest_size=16).digest()
+        key = (source_id, new_w, new_h)
+        cached = _cache.get(key)
+        if cached:
+            _cache.move_to_end(key)
+            data, new_filt, n = cached
+            report['cached'] += 1
+        else:
+            try:
+                pix = fitz.Pixmap(proxy, xref)
+                if pix.alpha or pix.n not in _DEVICE_NAMES:
+                    report['skipped'] += 1
+                    continue
+                small = fitz.Pixmap(pix, new_w, new_h, None)
+                n = small.n
+                as_jpeg = filt in _JPEG_FILTERS and n in (1, 3)
+                data, new_filt = _encode(small, as_jpeg)
+            except Exception as e:
+                if cfg.DEBUG_MODE:
+                    print(f"    - 이미지 {xref} 축소 실패: {e}")
+                report['skipped'] += 1
+                continue
+            if len(data) >= raw_len:
+                report['skipped'] += 1
+                continue
+            _cache_put(key, (data, new_filt, n))
+            report['replaced'] += 1
+
+        # ICCBased는 디코딩해도 프로파일 성분 수가 유지되므로 원래 색공간(프로파일) 유지
+        _write(proxy, xref, data, new_filt, new_w, new_h, cs_name == 'ICCBased', n)
+        report['bytes_before'] += raw_len
+        report['bytes_after'] += len(data)
+
+        if cfg.DEBUG_MODE:
+            print(f"    - 이미지 {xref}: {width}x{height} → {new_w}x{new_h} "
+                  f"({raw_len / 1024:.0f}KB → {len(data) / 1024:.0f}KB)")
+
+    report['seconds'] = time.perf_counter() - start
+    return proxy, report
+
+
+def describe(report):
+    """작업 로그용 요약 (줄어든 크기와 걸린 시간)"""
+    changed = report['replaced'] + report['cached']
+    text = f"이미지 {report['images']}개 중 {changed}개 축소"
+    if report['cached']:
+        text += f" (캐시 {report['cached']}개)"
+    if changed:
+        text += (f", {report['bytes_before'] / 1024 / 1024:.1f}MB → "
+                 f"{report['bytes_after'] / 1024 / 1024:.2f}MB")
+    return text + f", {report['seconds'] * 1000:.0f}ms"
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+의뢰서 정보로 QR 코드 생성 (QR 이미지 파일 없이)
+QR 이미지를 넣지 않은 작업에서 QR 내용을 정해 벡터 QR(qrvector와 같은 사각형 문서)로 바로 그림
+이미지 파일을 읽고 디코딩/리사이즈하는 단계가 없음
+
+QR 내용 (QR_CONFIG['generate']가 켜져 있을 때, 위에서부터 먼저 찾은 것):
+- 주문 목록(manifest) : CSV/JSON 파일에서 의뢰서 파일명과 같은 행의 필드 값
+                        (상대 경로는 의뢰서 폴더 기준, 파일명은 확장자 있거나 없거나 모두 비교)
+- 파일명 정규식       : 의뢰서 파일명(확장자 제외)에서 찾은 값을 형식 문자열에 넣음
+                        ({0}, {1}은 괄호 그룹, {이름}은 이름 있는 그룹, {name}은 파일명)
+
+QR 생성은 segno 또는 qrcode 패키지를 사용 (선택 설치, 둘 다 없으면 생성하지 않음)
+같은 내용의 QR은 다시 만들지 않고 보관한 문서를 사용
+"""
+
+import csv
+import importlib.util
+import json
+import os
+import re
+from collections import OrderedDict
+
+from . import settings as cfg
+from . import qrvector
+
+DEFAULT_PATTERN = r'(\d{6,})'  # 파일명에서 찾을 주문번호 (숫자 6자리 이상)
+DEFAULT_TEMPLATE = '{0}'
+ERROR_LEVELS = ('L', 'M', 'Q', 'H')
+CACHE_ENTRIES = 16
+
+# (내용, 오류 정정 수준, 여백) → QR 문서 - 최근에 쓴 순서
+_cache = OrderedDict()
+# 주문 목록 경로 → ((수정 시각, 크기), 행 목록)
+_manifests = {}
+
+
+def clear_cache():
+    for doc in _cache.values():
+        if doc is not None:
+            doc.close()
+    _cache.clear()
+    _manifests.clear()
+
+
+def available():
+    """QR 생성 패키지(segno 또는 qrcode)가 설치되어 있는지 (import 없이 확인)"""
+    return any(importlib.util.find_spec(name) is not None for name in ('segno', 'qrcode'))
+
+
+def _load_manifest(path):
+    """주문 목록 행 목록 (CSV: 머리글 행 기준, JSON: 객체 목록 또는 {파일명: 객체})
+
+    파일이 바뀌지 않았으면 다시 읽지 않음
+    """
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _manifests.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            rows = [dict(value, file=key) if isinstance(value, dict) else {'file': key, 'qr': value}
+                    for key, value in data.items()]
+        else:
+            rows = [row for row in data if isinstance(row, dict)]
+    else:
+        # 엑셀에서 저장한 CSV(BOM 포함)도 읽을 수 있도록 utf-8-sig
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+
+    _manifests[path] = (stamp, rows)
+    return rows
+
+
+def _manifest_payload(order_path, qr_config):
+    manifest = qr_config.get('manifest')
+    if not manifest:
+        return None
+    if not os.path.isabs(manifest):
+        manifest = os.path.join(os.path.dirname(os.path.abspath(order_path)), manifest)
+    if not os.path.exists(manifest):
+        if cfg.DEBUG_MODE:
+            print(f"    - 주문 목록 파일이 없습니다: {manifest}")
+        return None
+
+    key = qr_config.get('manifest_key', 'file')
+    field = qr_config.get('manifest_field', 'qr')
+    filename = os.path.basename(order_path)
+    names = (filename, os.path.splitext(filename)[0])
+    for row in _load_manifest(manifest):
+        if str(row.get(key, '')).strip() in names:
+            value = row.get(field)
+            return str(value) if value not in (None, '') else None
+    return None
+
+
+def _pattern_payload(order_path, qr_config):
+    pattern = qr_config.get('payload_pattern', DEFAULT_PATTERN)
+    if not pattern:
+        return None
+    stem = os.path.splitext(os.path.basename(order_path))[0]
+    match = re.search(pattern, stem)
+    if match is None:
+        return None
+    groups = match.groups() or (match.group(0),)
+    template = qr_config.get('payload_template', DEFAULT_TEMPLATE)
+    return template.format(*groups, name=stem, **match.groupdict())
+
+
+def order_payload(order_path, qr_config=None):
+    """의뢰서 파일에 해당하는 QR 내용 (생성하지 않거나 찾지 못하면 None)
+
+    qr_config: QR 설정 (기본 QR_CONFIG, 향상된 처리는 settings['qr'])
+    """
+    qr_config = cfg.QR_CONFIG if qr_config is None else qr_config
+    if not order_path or not qr_config.get('generate', False):
+        return None
+    try:
+        return _manifest_payload(order_path, qr_config) or _pattern_payload(order_path, qr_config)
+    except Exception as e:
+        print(f"  - QR 내용을 정하지 못했습니다: {e}")
+        return None
+
+
+def _encode(payload, error):
+    """QR 모듈 격자 (여백 없는 (N, N) bool 배열), 생성 패키지가 없으면 None"""
+    import numpy as np
+
+    try:
+        import segno
+    except ImportError:
+        segno = None
+    if segno is not None:
+        code = segno.make_qr(payload, error=error.lower())
+        return np.array([list(row) for row in code.matrix], dtype=bool)
+
+    try:
+        import qrcode
+    except ImportError:
+        return None
+    levels = {
+        'L': qrcode.constants.ERROR_CORRECT_L, 'M': qrcode.constants.ERROR_CORRECT_M,
+        'Q': qrcode.constants.ERROR_CORRECT_Q, 'H': qrcode.constants.ERROR_CORRECT_H,
+    }
+    code = qrcode.QRCode(error_correction=levels[error], border=0)
+    code.add_data(payload)
+    code.make(fit=True)
+    return np.array(code.get_matrix(), dtype=bool)
+
+
+def generated_qr(payload, error='M', border=4):
+    """QR 내용 → 벡터 QR 문서 (한 변이 모듈 수 + 여백인 정사각형 페이지, 만들 수 없으면 None)
+
+    같은 내용은 보관한 문서를 돌려줌 (호출하는 쪽에서 닫지 않음)
+    """
+    error = str(error).upper()
+    if error not in ERROR_LEVELS:
+        error = 'M'
+    key = (payload, error, border)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    try:
+        modules = _encode(payload, error)
+    except Exception as e:
+        print(f"  - QR 생성 실패: {e}")
+        modules = None
+    doc = None
+    if modules is not None:
+        count = len(modules)
+        side = count + 2 * border
+        doc = qrvector.qr_document({
+            'modules': modules,
+            'box': (border, border, border + count, border + count),
+            'size': (side, side),
+            'dark': (0.0, 0.0, 0.0),
+            'light': (1.0, 1.0, 1.0),
+        })
+        if cfg.DEBUG_MODE:
+            print(f"    - QR 생성: {count}x{count} 모듈, 내용 {payload!r}")
+
+    _cache[key] = doc
+    while len(_cache) > CACHE_ENTRIES:
+        _, old = _cache.popitem(last=False)
+        if old is not None:
+            old.close()
+    return doc
+
+
+def order_qr(order_path, qr_config=None):
+    """의뢰서 파일 → (QR 내용, 벡터 QR 문서), 생성하지 않으면 (None, None)"""
+    qr_config = cfg.QR_CONFIG if qr_config is None else qr_config
+    payload = order_payload(order_path, qr_config)
+    if payload is None:
+        return None, None
+    return payload, generated_qr(payload, qr_config.get('error', 'M'), qr_config.get('border', 4))
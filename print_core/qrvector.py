@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+"""
+벡터 QR 코드
+QR 이미지에서 모듈 격자를 한 번 읽어 채운 사각형(벡터)으로 다시 그림
+어떤 해상도로 인쇄해도 경계가 선명하고, 파일에는 작은 그리기 명령만 들어감
+
+- 모듈 크기: 왼쪽 위 위치 찾기 패턴(7모듈)의 길이로 추정 → 한 변의 모듈 수를 17+4v로 맞춤
+- 각 모듈 가운데 3x3 지점을 읽어 어둡고 밝음을 정하고, 애매한 모듈이 많으면 실패
+- 위치 찾기 패턴 3개, 구분선, 타이밍 패턴이 모두 맞아야 사용 (아니면 기존 이미지 방식)
+- 기울어진 스캔, 투명 배경, 대비가 낮은 이미지 등은 기존 이미지 방식으로 처리
+- 결과는 이미지 파일 내용(해시) 기준으로 보관하여 같은 QR은 다시 읽지 않음
+
+만든 QR은 원본 이미지와 같은 크기(픽셀 → pt)의 한 페이지짜리 PDF로,
+show_pdf_page로 배치하면 이미지를 넣을 때와 같은 위치/크기가 됨
+"""
+
+import hashlib
+import io
+from collections import OrderedDict
+
+from . import settings as cfg
+
+MIN_CONTRAST = 64          # 어두운/밝은 부분 밝기 차이 최소값
+MAX_AMBIGUOUS = 0.03       # 애매한 모듈(어두운 지점 20~80%) 허용 비율
+SQUARE_TOLERANCE = 0.03    # 가로/세로 길이 차이 허용 비율
+CACHE_ENTRIES = 16
+
+# 이미지 해시 → QR 문서 (인식 실패는 None) - 최근에 쓴 순서
+_cache = OrderedDict()
+
+# 위치 찾기 패턴 (NumPy는 처음 검사할 때 불러오므로 목록으로 두고 np.array_equal로 비교)
+_FINDER = (
+    (1, 1, 1, 1, 1, 1, 1),
+    (1, 0, 0, 0, 0, 0, 1),
+    (1, 0, 1, 1, 1, 0, 1),
+    (1, 0, 1, 1, 1, 0, 1),
+    (1, 0, 1, 1, 1, 0, 1),
+    (1, 0, 0, 0, 0, 0, 1),
+    (1, 1, 1, 1, 1, 1, 1),
+)
+
+
+def clear_cache():
+    for doc in _cache.values():
+        if doc is not None:
+            doc.close()
+    _cache.clear()
+
+
+def _run_length(line):
+    """배열 처음부터 이어지는 True 개수"""
+    import numpy as np
+
+    breaks = np.flatnonzero(~line)
+    return int(breaks[0]) if len(breaks) else len(line)
+
+
+def _valid_pattern(modules):
+    """위치 찾기 패턴, 구분선, 타이밍 패턴 확인"""
+    import numpy as np
+
+    size = len(modules)
+    for top, left in ((0, 0), (0, size - 7), (size - 7, 0)):
+        if not np.array_equal(modules[top:top + 7, left:left + 7], _FINDER):
+            return False
+    # 위치 찾기 패턴 바깥쪽 구분선 (밝음)
+    if (modules[7, :8].any() or modules[:8, 7].any()
+            or modules[7, size - 8:].any() or modules[:8, size - 8].any()
+            or modules[size - 8, :8].any() or modules[size - 8:, 7].any()):
+        return False
+    # 6번째 행/열의 타이밍 패턴 (어두움부터 번갈아)
+    timing = np.arange(8, size - 8) % 2 == 0
+    return (np.array_equal(modules[6, 8:size - 8], timing)
+            and np.array_equal(modules[8:size - 8, 6], timing))
+
+
+def detect(img):
+    """QR 이미지의 모듈 격자 인식
+
+    반환값: {'modules': (N, N) bool 배열, 'box': 심볼 영역 (x0, y0, x1, y1) 픽셀,
+             'size': 이미지 크기, 'dark': 어두운 색, 'light': 밝은 색} 또는 None
+    """
+    import numpy as np
+
+    if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info:
+        alpha = img.convert('RGBA').getchannel('A')
+        if alpha.getextrema()[0] < 255:
+            return None  # 투명 배경은 이미지 그대로 (배경색을 알 수 없음)
+    rgb = np.asarray(img.convert('RGB'))
+    gray = np.asarray(img.convert('L'))
+    low, high = int(gray.min()), int(gray.max())
+    if high - low < MIN_CONTRAST:
+        return None
+    dark = gray < (low + high) / 2
+
+    rows = np.flatnonzero(dark.any(axis=1))
+    cols = np.flatnonzero(dark.any(axis=0))
+    y0, y1 = rows[0], rows[-1] + 1
+    x0, x1 = cols[0], cols[-1] + 1
+    width, height = x1 - x0, y1 - y0
+    if abs(width - height) > max(2, SQUARE_TOLERANCE * width):
+        return None
+
+    # 왼쪽 위 위치 찾기 패턴의 윗변/왼변 길이 = 7모듈 (가장자리 흐림을 피해 한 픽셀 안쪽)
+    inset_y = min(y0 + 1, y1 - 1)
+    inset_x = min(x0 + 1, x1 - 1)
+    finder = (_run_length(dark[inset_y, x0:x1]) + _run_length(dark[y0:y1, inset_x])) / 2
+    if finder < 7:
+        return None
+    estimate = (width + height) / 2 / (finder / 7)
+    version = round((estimate - 17) / 4)
+    if not 1 <= version <= 40 or abs(estimate - (17 + 4 * version)) > 1.5:
+        return None
+    count = 17 + 4 * version
+    step_x, step_y = width / count, height / count
+
+    # 모듈마다 가운데 3x3 지점의 어두운 비율
+    offsets = np.array([0.3, 0.5, 0.7])
+    xs = np.clip((x0 + (np.arange(count)[:, None] + offsets) * step_x).astype(int), 0, dark.shape[1] - 1)
+    ys = np.clip((y0 + (np.arange(count)[:, None] + offsets) * step_y).astype(int), 0, dark.shape[0] - 1)
+    samples = dark[ys.reshape(-1)][:, xs.reshape(-1)].reshape(count, 3, count, 3)
+    ratio = samples.mean(axis=(1, 3))
+    modules = ratio > 0.5
+    ambiguous = np.count_nonzero((ratio > 0.2) & (ratio < 0.8))
+    if ambiguous > MAX_AMBIGUOUS * count * count or not _valid_pattern(modules):
+        return None
+
+    return {
+        'modules': modules,
+        'box': (int(x0), int(y0), int(x1), int(y1)),
+        'size': img.size,
+        'dark': tuple(rgb[dark].mean(axis=0) / 255),
+        'light': tuple(rgb[~dark].mean(axis=0) / 255),
+    }
+
+
+def _module_rects(modules):
+    """어두운 모듈 → 사각형 (가로로 이어진 구간을 합치고, 아래 행에 같은 구간이 있으면 세로로 합침)
+
+    반환값: (열 시작, 행 시작, 열 끝, 행 끝) 목록 (모듈 단위)
+    """
+    import numpy as np
+
+    rects = []
+    open_runs = {}  # (열 시작, 열 끝) → 행 시작
+    for row, line in enumerate(modules):
+        padded = np.concatenate(([False], line, [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        runs = set(zip(edges[::2].tolist(), edges[1::2].tolist()))
+        for run in list(open_runs):
+            if run not in runs:
+                rects.append((run[0], open_runs.pop(run), run[1], row))
+        for run in runs:
+            open_runs.setdefault(run, row)
+    rects.extend((run[0], start, run[1], len(modules)) for run, start in open_runs.items())
+    return rects
+
+
+def _color(rgb):
+    return " ".join(f"{value:.3f}" for value in rgb)
+
+
+def qr_document(result):
+    """인식 결과 → 원본 이미지 크기의 한 페이지짜리 PDF (밝은 바탕 + 어두운 모듈 사각형)
+
+    사각형이 수천 개가 될 수 있어 Shape 대신 내용 스트림을 직접 작성
+    (모듈 단위 좌표를 cm 변환 하나로 배치, 모든 사각형을 채우기 한 번으로)
+    """
+    import fitz  # PyMuPDF
+
+    width, height = result['size']
+    x0, y0, x1, y1 = result['box']
+    modules = result['modules']
+    step_x = (x1 - x0) / len(modules)
+    step_y = (y1 - y0) / len(modules)
+
+    # PDF 좌표는 아래에서 위로 증가하므로 세로 방향을 뒤집어 배치
+    lines = [
+        "q",
+        f"{_color(result['light'])} rg",
+        f"0 0 {width} {height} re f",
+        f"{step_x:.5f} 0 0 {-step_y:.5f} {x0} {height - y0} cm",
+        f"{_color(result['dark'])} rg",
+    ]
+    lines.extend(f"{col0} {row0} {col1 - col0} {row1 - row0} re"
+                 for col0, row0, col1, row1 in _module_rects(modules))
+    lines += ["f", "Q"]
+
+    doc = fitz.open()
+    page = doc.new_page(width=width, height=height)
+    xref = doc.get_new_xref()
+    doc.update_object(xref, "<<>>")
+    doc.update_stream(xref, "\n".join(lines).encode())
+    page.set_contents(xref)
+    return doc
+
+
+def vector_qr(data):
+    """QR 이미지 바이트 → 벡터 QR 문서 (인식하지 못하면 None)
+
+    같은 내용의 이미지는 다시 읽지 않고 보관한 문서를 돌려줌 (호출하는 쪽에서 닫지 않음)
+    """
+    from PIL import Image
+
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    try:
+        result = detect(Image.open(io.BytesIO(data)))
+    except Exception as e:
+        if cfg.DEBUG_MODE:
+            print(f"    - QR 격자 인식 실패: {e}")
+        result = None
+    doc = qr_document(result) if result else None
+    if doc is not None and cfg.DEBUG_MODE:
+        count = len(result['modules'])
+        print(f"    - QR 격자 인식: {count}x{count} 모듈, 사각형 {len(_module_rects(result['modules']))}개")
+
+    _cache[key] = doc
+    while len(_cache) > CACHE_ENTRIES:
+        _, old = _cache.popitem(last=False)
+        if old is not None:
+            old.close()
+    return doc
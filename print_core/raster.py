@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+
+"""
+최종 PDF 래스터화 (PROCESSING_CONFIG['rasterize_final'])
+각 페이지를 200 DPI 이미지 한 장짜리 페이지로 바꾼 새 문서를 만듦
+
+- 페이지 렌더링과 압축(Flate)은 작업 프로세스들이 나눠 처리
+  각 작업 프로세스는 시작할 때 문서 바이트를 받아 자기 사본을 한 번만 열어 둠
+- 작업 프로세스는 압축한 이미지 스트림만 돌려주고, 본 프로세스는 페이지 순서대로 이미지 객체를 기록
+  저장할 때 다시 압축하지 않음 (기존 저장과 같은 압축 수준이라 파일 크기도 같음)
+- 작업 프로세스 수: PROCESSING_CONFIG['raster_workers'] (0: CPU 수, 1: 본 프로세스에서 순서대로)
+- 페이지가 PARALLEL_MIN_PAGES보다 적거나 CPU가 하나면 프로세스를 띄우는 비용이 더 커서 본 프로세스에서 처리
+- 작업 프로세스를 쓸 수 없으면 (권한, 메모리 부족 등) 본 프로세스에서 처리
+
+페이지 내용에 맞는 압축 (PROCESSING_CONFIG['raster_encoding'] = 'adaptive', 'flate'면 모두 RGB Flate)
+- 흑백(1비트) : 색이 전혀 없고 중간 밝기 픽셀(글자 가장자리 등)이 2% 이하인 페이지 (글자/선 위주 의뢰서)
+- 회색조      : 색이 전혀 없는 페이지 → 8비트 Gray Flate
+- 사진(JPEG)  : 페이지 절반 이상이 중간 밝기이고 이웃 픽셀끼리 거의 다 다른 페이지 (스캔, 사진)
+                → raster_jpeg_quality 품질 JPEG (단색 면이 많은 그림은 Flate가 더 작아서 제외)
+- 컬러        : 그 외 (글자 + 컬러 썸네일 등) → 기존과 같은 RGB Flate
+- raster_reduce_dpi가 켜져 있으면 세밀한 부분이 없는 페이지(절반 해상도로 줄였다 늘려도 거의 같음)는 절반 DPI로
+  (흑백 페이지는 제외)
+
+실행 파일(PyInstaller)로 만들 때는 진입 스크립트에서 multiprocessing.freeze_support()를 먼저 호출해야 함
+"""
+
+import io
+import math
+import os
+import zlib
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from .pixbridge import pixmap_to_array
+
+RASTER_DPI = 200
+COMPRESS_LEVEL = 6       # 저장(deflate=True)할 때 MuPDF가 쓰는 수준과 같음
+PARALLEL_MIN_PAGES = 4   # 이보다 페이지가 적으면 작업 프로세스를 띄우지 않음
+CHUNKS_PER_WORKER = 4    # 작업 프로세스마다 나눠 줄 묶음 수 (페이지별 렌더링 시간 차이 분산)
+
+ENCODINGS = ('adaptive', 'flate')
+GRAY_TOLERANCE = 12          # 이 이하의 채널 차이는 색이 없는 것으로 봄 (안티앨리어싱, 렌더링 오차)
+MIDTONE_RANGE = (32, 224)    # 중간 밝기 범위 (사진 판정)
+BILEVEL_WHITE = 250          # 흑백 판정에서 종이색으로 보는 최소 밝기 (연한 음영은 내용)
+BILEVEL_MAX_MIDTONES = 0.02  # 흑백(1비트)으로 볼 최대 중간 밝기 비율 (글자 가장자리)
+BILEVEL_MAX_FLAT = 0.001     # 흑백으로 볼 최대 음영 면 비율 (가로/세로 이웃과 밝기가 같은 회색 픽셀)
+PHOTO_MIN_MIDTONES = 0.5     # 사진(JPEG)으로 볼 최소 중간 밝기 비율
+PHOTO_MIN_TEXTURE = 0.45     # 사진으로 볼 최소 비율 (가로 이웃 픽셀과 밝기가 다른 픽셀)
+DETAIL_TOLERANCE = 16        # 절반 해상도로 줄였다 늘렸을 때 이보다 달라지면 세밀한 부분
+DETAIL_MAX_FRACTION = 0.001  # 세밀한 부분이 이 비율 이하면 절반 DPI 사용
+SAMPLE_ROWS = 8              # 비율은 이 간격의 행만 보고 추정 (색 유무는 색이 안 보일 때만 전체 확인)
+
+_BILEVEL_TABLE = [0] * 128 + [255] * 128  # 밝기 128 미만은 검정
+
+KIND_BILEVEL = 'bilevel'
+KIND_GRAY = 'gray'
+KIND_PHOTO = 'photo'
+KIND_COLOR = 'color'
+KIND_NAMES = {
+    KIND_BILEVEL: '흑백(1비트)',
+    KIND_GRAY: '회색조',
+    KIND_PHOTO: '사진(JPEG)',
+    KIND_COLOR: '컬러',
+}
+
+# 작업 프로세스에서 연 문서 사본
+_worker_doc = None
+
+
+def encode_options():
+    """PROCESSING_CONFIG의 압축 설정 (작업 프로세스에는 설정 파일 대신 이 값을 넘김)"""
+    encoding = cfg.PROCESSING_CONFIG.get('raster_encoding', 'adaptive')
+    return {
+        'encoding': encoding if encoding in ENCODINGS else 'adaptive',
+        'jpeg_quality': int(cfg.PROCESSING_CONFIG.get('raster_jpeg_quality', 85)),
+        'reduce_dpi': bool(cfg.PROCESSING_CONFIG.get('raster_reduce_dpi', False)),
+        'measure': cfg.DEBUG_MODE,  # 기존 방식 크기 계산 (압축을 한 번 더 하므로 디버그 모드에서만)
+    }
+
+
+def _has_color(rgb):
+    import numpy as np
+
+    spread = np.maximum(np.maximum(rgb[..., 0], rgb[..., 1]), rgb[..., 2])
+    spread -= np.minimum(np.minimum(rgb[..., 0], rgb[..., 1]), rgb[..., 2])
+    return bool((spread > GRAY_TOLERANCE).any())
+
+
+def _luminance(rgb):
+    """RGB → 밝기 (분류용 근사, 가중치 합이 256이라 uint16에서 넘치지 않음)"""
+    import numpy as np
+
+    rgb = rgb.astype(np.uint16)
+    return (rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8
+
+
+def _is_bilevel(rgb, gray, midtones):
+    """검정과 종이색만으로 나타낼 수 있는지 (gray: 표본 행의 밝기, midtones: 중간 밝기 비율)
+
+    글자 가장자리의 회색은 조금 있어도 되지만 연한 음영(양식 배경, 표 줄무늬, 225~249)은
+    128 기준으로 자르면 흰색이 되므로, 아래 행과 옆 픽셀까지 같은 회색인 면이 있으면 흑백이 아님
+    """
+    import numpy as np
+
+    if midtones > BILEVEL_MAX_MIDTONES:
+        return False
+    tint = (gray > MIDTONE_RANGE[0]) & (gray < BILEVEL_WHITE)
+    below = _luminance(rgb[1::SAMPLE_ROWS])
+    rows = min(len(gray), len(below))
+    flat = tint[:rows] & (gray[:rows] == below[:rows])
+    flat = flat[:, 1:] & (gray[:rows, 1:] == gray[:rows, :-1])
+    return np.count_nonzero(flat) <= BILEVEL_MAX_FLAT * gray.size
+
+
+def classify(rgb):
+    """페이지 종류와 색이 없는지 여부 (rgb: (H, W, 3) uint8 배열)"""
+    import numpy as np
+
+    sample = rgb[::SAMPLE_ROWS]
+    # 일부 행에서 색이 보이면 바로 컬러, 안 보이면 작은 점 하나까지 전체 확인
+    colorless = not _has_color(sample) and not _has_color(rgb)
+    gray = _luminance(sample)
+    low, high = MIDTONE_RANGE
+    midtones = np.count_nonzero((gray > low) & (gray < high)) / gray.size
+    if midtones >= PHOTO_MIN_MIDTONES:
+        texture = np.count_nonzero(gray[:, 1:] != gray[:, :-1]) / gray.size
+        if texture >= PHOTO_MIN_TEXTURE:
+            return KIND_PHOTO, colorless
+    if colorless:
+        return (KIND_BILEVEL if _is_bilevel(rgb, gray, midtones) else KIND_GRAY), True
+    return KIND_COLOR, False
+
+
+def has_fine_detail(gray_img):
+    """절반 해상도로 줄였다 늘렸을 때 달라지는 부분이 있는지 (gray_img: 'L' 모드 PIL 이미지)"""
+    from PIL import Image, ImageChops
+
+    box = (0, 0, gray_img.width // 2 * 2, gray_img.height // 2 * 2)
+    full = gray_img.crop(box)
+    restored = full.reduce(2).resize(full.size, Image.Resampling.NEAREST)
+    changed = sum(ImageChops.difference(full, restored).histogram()[DETAIL_TOLERANCE + 1:])
+    return changed > DETAIL_MAX_FRACTION * full.width * full.height
+
+
+def _flate(data):
+    return zlib.compress(data, COMPRESS_LEVEL)
+
+
+def encode_pixels(rgb, dpi=RASTER_DPI, options=None):
+    """렌더링한 페이지 픽셀 압축
+
+    rgb: (높이, 너비, 3) uint8 배열 (행 사이 여분 바이트 없음, 픽스맵 버퍼를 그대로 가리켜도 됨)
+    options['measure']가 켜져 있으면 기존 방식(RGB Flate) 크기도 계산 ('flate_bytes', 로그용)
+    반환값: {'kind', 'dpi', 'width', 'height', 'colorspace', 'bpc', 'filter', 'data'[, 'flate_bytes']}
+    """
+    from PIL import Image
+
+    options = options or {'encoding': 'flate'}
+    height, width = rgb.shape[:2]
+    result = {'kind': KIND_COLOR, 'dpi': dpi, 'width': width, 'height': height,
+              'colorspace': '/DeviceRGB', 'bpc': 8, 'filter': '/FlateDecode'}
+    if options.get('encoding') != 'adaptive':
+        result['data'] = _flate(rgb)
+        return result
+
+    # 분류는 복사하지 않은 배열로, 이미지 변환은 필요한 페이지만
+    kind, colorless = classify(rgb)
+    result['kind'] = kind
+    if options.get('measure'):
+        result['flate_bytes'] = len(_flate(rgb))
+    if kind == KIND_COLOR and not options.get('reduce_dpi'):
+        result['data'] = _flate(rgb)
+        return result
+
+    img = Image.fromarray(rgb, 'RGB')
+    gray_img = img.convert('L')
+    if colorless:
+        img = gray_img
+        result['colorspace'] = '/DeviceGray'
+
+    if kind == KIND_BILEVEL:
+        # 1비트 Gray: 0이 검정, 1이 흰색 (행마다 바이트 단위로 채움)
+        result['bpc'] = 1
+        result['data'] = _flate(gray_img.point(_BILEVEL_TABLE, '1').tobytes())
+        return result
+
+    if options.get('reduce_dpi') and not has_fine_detail(gray_img):
+        img = img.reduce(2)  # 2x2 평균으로 절반 크기
+        result.update(dpi=dpi / 2, width=img.width, height=img.height)
+
+    if kind == KIND_PHOTO:
+        # JPEG은 PIL 인코더가 MuPDF보다 빠르고 같은 품질에서 더 작음
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=options.get('jpeg_quality', 85))
+        result['filter'] = '/DCTDecode'
+        result['data'] = buffer.getvalue()
+    else:
+        result['data'] = _flate(img.tobytes())
+    return result
+
+
+def render_page(doc, page_num, dpi=RASTER_DPI, options=None):
+    """페이지 렌더링 + 압축 (반환값은 encode_pixels 참고)"""
+    pix = doc[page_num].get_pixmap(dpi=dpi, alpha=False)
+    return encode_pixels(pixmap_to_array(pix), dpi, options)
+
+
+def _init_worker(data):
+    global _worker_doc
+    _worker_doc = fitz.open("pdf", data)
+
+
+def _worker_render(task):
+    page_num, dpi, options = task
+    return render_page(_worker_doc, page_num, dpi, options)
+
+
+def worker_count(page_count, setting=None):
+    """사용할 작업 프로세스 수 (1이면 본 프로세스에서 처리)
+
+    setting: 0이면 CPU 수, 1이면 사용 안 함, 2 이상이면 그 수 (기본: PROCESSING_CONFIG['raster_workers'])
+    """
+    if setting is None:
+        setting = cfg.PROCESSING_CONFIG.get('raster_workers', 0)
+    setting = int(setting or 0)
+    if setting == 1 or page_count < PARALLEL_MIN_PAGES:
+        return 1
+    workers = setting if setting > 1 else (os.cpu_count() or 1)
+    return max(1, min(workers, page_count))
+
+
+def render_pages(tasks, render, workers=1, worker_render=None, initializer=None, initargs=()):
+    """페이지 작업 목록 처리 (작업 프로세스를 쓸 수 없으면 본 프로세스에서 순서대로)
+
+    render: 본 프로세스에서 쓸 함수, worker_render: 작업 프로세스에서 쓸 함수 (모듈 최상위 함수)
+    initializer/initargs: 작업 프로세스마다 한 번 실행 (문서를 열어 두는 등)
+    반환값: (작업 순서대로 결과, 실제로 사용한 작업 프로세스 수)
+            본 프로세스에서 처리할 때는 결과를 하나씩 만들어 바로 쓰고 버리도록 generator
+    """
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, math.ceil(len(tasks) / (workers * CHUNKS_PER_WORKER)))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                                     initargs=initargs) as pool:
+                return list(pool.map(worker_render, tasks, chunksize=chunksize)), workers
+        except Exception as e:
+            print(f"  - 작업 프로세스를 사용할 수 없어 순서대로 처리합니다: {e}")
+    return (render(task) for task in tasks), 1
+
+
+def add_image_page(doc, rect, result):
+    """압축된 이미지로 이미지 한 장짜리 페이지 추가 (다시 압축하지 않도록 스트림을 직접 기록)"""
+    page = doc.new_page(width=rect.width, height=rect.height)
+    image = doc.get_new_xref()
+    doc.update_object(image, f"<</Type/XObject/Subtype/Image/Width {result['width']}"
+                             f"/Height {result['height']}/ColorSpace {result['colorspace']}"
+                             f"/BitsPerComponent {result['bpc']}>>")
+    # compress=False로 기록하면 Filter 항목이 지워지므로 기록한 뒤에 지정
+    doc.update_stream(image, result['data'], compress=False)
+    doc.xref_set_key(image, "Filter", result['filter'])
+
+    contents = doc.get_new_xref()
+    doc.update_object(contents, "<<>>")
+    doc.update_stream(contents, f"q {rect.width:g} 0 0 {rect.height:g} 0 0 cm /Im0 Do Q".encode())
+    doc.xref_set_key(page.xref, "Resources", f"<</XObject<</Im0 {image} 0 R>>>>")
+    page.set_contents(contents)
+    return page
+
+
+def rasterize_document(doc, dpi=RASTER_DPI, workers=None, options=None):
+    """문서의 모든 페이지를 이미지 페이지로 바꾼 새 문서
+
+    workers: 작업 프로세스 설정 (worker_count 참고)
+    options: 압축 설정 (기본: encode_options())
+    반환값: (새 문서, 실제로 사용한 작업 프로세스 수, 페이지별 {'kind', 'dpi', 'bytes'} 목록)
+    """
+    options = encode_options() if options is None else options
+    tasks = [(page_num, dpi, options) for page_num in range(len(doc))]
+    count = worker_count(len(tasks), workers)
+    # 작업 프로세스는 시작할 때 문서 바이트를 받아 자기 사본을 엶
+    results, count = render_pages(
+        tasks, lambda task: render_page(doc, *task), count,
+        _worker_render, _init_worker, (doc.tobytes(),) if count > 1 else ())
+    raster_doc, report = build_document([page.rect for page in doc], results)
+    return raster_doc, count, report
+
+
+def build_document(rects, results):
+    """페이지 크기 목록과 압축 결과로 이미지 페이지 문서 구성
+
+    반환값: (새 문서, 페이지별 {'kind', 'dpi', 'bytes', 'flate_bytes'} 목록)
+    """
+    raster_doc = fitz.open()
+    report = []
+    for rect, result in zip(rects, results):
+        add_image_page(raster_doc, rect, result)
+        report.append({'kind': result['kind'], 'dpi': result['dpi'], 'bytes': len(result['data']),
+                       'flate_bytes': result.get('flate_bytes')})
+    return raster_doc, report
+
+
+def report_resources(report):
+    """래스터화한 문서의 리소스 요약 (resources.resource_summary와 같은 형식, 문서를 다시 훑지 않음)"""
+    return {'images': len(report), 'image_bytes': sum(item['bytes'] for item in report),
+            'forms': 0, 'form_bytes': 0}
+
+
+def describe(report):
+    """페이지별 압축 결과 (로그용 문자열 목록, 기존 방식 크기를 계산했으면 줄어든 크기 포함)"""
+    lines = []
+    for page_num, item in enumerate(report, 1):
+        line = (f"페이지 {page_num}: {KIND_NAMES.get(item['kind'], item['kind'])} "
+                f"{item['dpi']:g}DPI {item['bytes'] / 1024:.1f}KB")
+        if item.get('flate_bytes'):
+            saved = item['flate_bytes'] - item['bytes']
+            line += f" (RGB Flate {item['flate_bytes'] / 1024:.1f}KB 대비 {saved / 1024:.1f}KB 절약)"
+        lines.append(line)
+    return lines
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+PDF 리소스 재사용
+같은 이미지를 여러 위치/페이지에 넣을 때 처음 한 번만 디코딩/압축해 기록하고
+이후에는 insert_image(xref=...)로 같은 객체를 참조
+
+- ImageCache        : 문서 하나에 넣은 이미지의 xref 기록 (내용 해시 또는 파일 경로 기준)
+- resource_summary  : 문서의 이미지/폼 XObject 개수와 크기
+- describe_resources: 작업 로그용 문자열
+"""
+
+import hashlib
+import os
+
+
+class ImageCache:
+    """문서 하나에 삽입한 이미지 xref 기록"""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._xrefs = {}
+        self.inserted = 0  # 새로 기록한 이미지 수
+        self.reused = 0    # xref로 재사용한 배치 수
+
+    @staticmethod
+    def _digest(data):
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _key(self, stream=None, filename=None, pixmap=None):
+        if stream is not None:
+            return ('stream', self._digest(stream))
+        if filename is not None:
+            path = os.path.abspath(filename)
+            return ('file', path, os.path.getmtime(path))
+        return ('pixmap', pixmap.width, pixmap.height, pixmap.n, self._digest(pixmap.samples_mv))
+
+    def insert(self, page, rect, stream=None, filename=None, pixmap=None, key=None):
+        """이미지 배치 (같은 이미지는 처음 한 번만 기록하고 이후 xref 재사용)
+
+        key: 호출하는 쪽에서 정한 식별자 (생략하면 내용 해시 또는 파일 경로)
+        반환값: 이미지 xref
+        """
+        if page.parent is not self.doc:
+            raise ValueError("다른 문서의 페이지에는 이 ImageCache를 사용할 수 없습니다.")
+
+        key = key or self._key(stream, filename, pixmap)
+        xref = self._xrefs.get(key)
+        if xref:
+            page.insert_image(rect, xref=xref)
+            self.reused += 1
+            return xref
+
+        if filename is not None and stream is None:
+            # 파일은 한 번만 읽음
+            with open(filename, 'rb') as f:
+                stream = f.read()
+        if stream is not None:
+            xref = page.insert_image(rect, stream=stream)
+        else:
+            xref = page.insert_image(rect, pixmap=pixmap)
+        self._xrefs[key] = xref
+        self.inserted += 1
+        return xref
+
+    def describe(self):
+        return f"이미지 {self.inserted}개 기록, {self.reused}회 재사용"
+
+
+def resource_summary(doc):
+    """문서의 이미지/폼 XObject 개수와 스트림 크기(바이트, 저장 전에는 압축 전 크기일 수 있음)"""
+    summary = {'images': 0, 'image_bytes': 0, 'forms': 0, 'form_bytes': 0}
+    for xref in range(1, doc.xref_length()):
+        subtype = doc.xref_get_key(xref, 'Subtype')[1]
+        if subtype == '/Image':
+            summary['images'] += 1
+            summary['image_bytes'] += len(doc.xref_stream_raw(xref) or b'')
+        elif subtype == '/Form':
+            summary['forms'] += 1
+            summary['form_bytes'] += len(doc.xref_stream_raw(xref) or b'')
+    return summary
+
+
+def describe_resources(summary):
+    """resource_summary 결과를 작업 로그용 문자열로 (개수만, 실제 크기는 저장한 파일 크기로 확인)"""
+    return f"이미지 {summary['images']}개, 폼 {summary['forms']}개"
+
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""
+PDF 저장 방식 (저장 프로필)
+작업마다(명령줄 --save-profile) 또는 설정/프리셋으로 고름
+(PROCESSING_CONFIG['save_profile'], 향상된 처리는 settings['performance']['save_profile'])
+
+- fast        : 정리/압축 없이 그대로 기록 (래스터화한 새 문서처럼 이미 압축되어 있고 버릴 객체가 없는 문서용)
+- compact     : 기본. 사용하지 않는 객체 제거 + 같은 객체/스트림 병합(garbage=4),
+                압축되지 않은 스트림/이미지/글꼴 압축, 객체 스트림으로 묶어 기록
+- incremental : 바뀐 객체만 원본 파일 끝에 덧붙임 (파일에서 연 문서를 같은 파일에 저장할 때만)
+                다시 쓰지 않아 가장 빠르지만 처리할 때마다 파일이 커지고 지운 내용도 파일에 남음
+
+덧붙일 수 없는 경우(메모리로 연 문서, 다른 경로, 새로 만든 문서)는 compact로 저장
+덧붙이기 외에는 메모리에 만든 결과를 output.write_bytes로 한 번에 기록 (임시 파일 → 바꿔치기)
+"""
+
+import os
+import time
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from . import output
+
+DEFAULT_PROFILE = 'compact'
+
+PROFILES = {
+    'fast': {'garbage': 0},
+    'compact': {'garbage': 4, 'deflate': True, 'deflate_images': True, 'deflate_fonts': True,
+                'use_objstms': 1},
+    'incremental': {'incremental': True, 'encryption': fitz.PDF_ENCRYPT_KEEP},
+}
+
+PROFILE_NAMES = {
+    'fast': '빠르게',
+    'compact': '작게',
+    'incremental': '덧붙이기',
+}
+
+
+def profile_name(name=None):
+    """사용할 저장 프로필 이름 (None이면 PROCESSING_CONFIG['save_profile'], 모르는 이름이면 기본값)
+
+    이름만 확인하므로 출력하지 않음 (모르는 이름 경고는 save_document에서 저장할 때 한 번)
+    """
+    if not name:
+        name = cfg.PROCESSING_CONFIG.get('save_profile', DEFAULT_PROFILE)
+    return name if name in PROFILES else DEFAULT_PROFILE
+
+
+def _same_file(doc, path):
+    """문서를 path 파일에서 열었는지"""
+    if not doc.name:
+        return False
+    try:
+        return os.path.samefile(doc.name, path)
+    except OSError:
+        return False
+
+
+def can_save_incrementally(doc, path):
+    """path에 덧붙여 저장할 수 있는지 (같은 파일에서 열었고 구조가 덧붙이기를 허용)"""
+    return _same_file(doc, path) and doc.can_save_incrementally()
+
+
+def save_document(doc, path, profile=None):
+    """저장 프로필로 문서 저장
+
+    반환값: (실제로 사용한 프로필 이름, 걸린 시간(초))
+    """
+    requested = profile or cfg.PROCESSING_CONFIG.get('save_profile', DEFAULT_PROFILE)
+    name = profile_name(requested)
+    if name != requested:
+        print(f"  - 알 수 없는 저장 방식 '{requested}', {DEFAULT_PROFILE}로 저장합니다.")
+    if name == 'incremental' and not can_save_incrementally(doc, path):
+        print(f"  - 덧붙이기 저장은 파일에서 연 문서를 같은 파일에 저장할 때만 가능해 {DEFAULT_PROFILE}로 저장합니다.")
+        name = DEFAULT_PROFILE
+
+    start = time.perf_counter()
+    options = PROFILES[name]
+    if name == 'incremental':
+        doc.save(path, **options)
+    else:
+        # 중간에 멈춰도 path에는 이전 파일 또는 새 파일 전체만 남음
+        # (파일에서 연 문서는 Windows에서 바꿔치기할 수 없으므로 메모리로 열어 둘 것)
+        output.write_bytes(path, doc.tobytes(**options))
+    return name, time.perf_counter() - start
+
+
+def describe(name, elapsed):
+    """저장 결과 (로그용)"""
+    return f"{name} ({PROFILE_NAMES[name]}), {elapsed * 1000:.0f}ms"
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+설정 로드 모듈 (GUI 의존성 없음)
+우선순위: settings.json > config.py > 프로그램 내장 기본값
+"""
+
+import json
+from pathlib import Path
+
+# 설정 파일에서 로드 (settings.json 우선, 없으면 config.py, 그것도 없으면 기본값)
+def load_settings():
+    # 1. settings.json 확인
+    settings_path = Path("settings.json")
+    if settings_path.exists():
+        try:
+            with open(settings_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                # 기존 config.py 설정과 병합
+                thumbnail_config = data.get('thumbnail', {})
+                qr_config = data.get('qr', {})
+                
+                # config.py의 기본값 적용
+                if 'white_background' not in thumbnail_config:
+                    thumbnail_config['white_background'] = True
+                if 'background_padding' not in thumbnail_config:
+                    thumbnail_config['background_padding'] = 5
+                
+                # 백지 감지 설정 추가
+                blank_detection = data.get('blank_detection', {
+                    'enabled': True,
+                    'threshold': 0.99,
+                    'edge_margin': 20,
+                    'max_pages': 10
+                })
+                
+                return {
+                    'PAGE_WIDTH': 842,
+                    'PAGE_HEIGHT': 595,
+                    'THUMBNAIL_CONFIG': thumbnail_config,
+                    'QR_CONFIG': qr_config,
+                    'GUI_CONFIG': data.get('gui', {
+                        'window_width': 500, 'window_height': 400,
+                        'always_on_top': True, 'resizable': False
+                    }),
+                    'PROCESSING_CONFIG': data.get('processing', {
+                        'overwrite_original': True,
+                        'backup_before_save': False,
+                        'backup_suffix': '_backup',
+                        'auto_normalize': True,
+                        'normalize_mode': 'vector',
+                        'normalize_raster_fallback': True,
+                        'rasterize_final': True,
+                        'fused_raster': True,
+                        'raster_workers': 0,
+                        'raster_encoding': 'adaptive',
+                        'raster_jpeg_quality': 85,
+                        'raster_reduce_dpi': False,
+                        'save_profile': 'compact'
+                    }),
+                    'BLANK_DETECTION': blank_detection,
+                    'DEBUG_MODE': data.get('debug', False)
+                }
+        except:
+            pass
+    
+    # 2. config.py 확인
+    try:
+        import config
+        thumbnail_config = getattr(config, 'THUMBNAIL_CONFIG', {
+            'max_width': 160, 'max_height': 250,
+            'positions': [{'x': 70, 'y': 180}, {'x': 490, 'y': 180}]
+        })
+        # 흰색 배경 옵션 추가 (기존 config.py와 호환성 유지)
+        if 'white_background' not in thumbnail_config:
+            thumbnail_config['white_background'] = True
+        if 'background_padding' not in thumbnail_config:
+            thumbnail_config['background_padding'] = 5
+            
+        return {
+            'PAGE_WIDTH': getattr(config, 'PAGE_WIDTH', 842),
+            'PAGE_HEIGHT': getattr(config, 'PAGE_HEIGHT', 595),
+            'THUMBNAIL_CONFIG': thumbnail_config,
+            'QR_CONFIG': getattr(config, 'QR_CONFIG', {
+                'max_width': 50, 'max_height': 50,
+                'positions': [{'x': 230, 'y': 470}, {'x': 650, 'y': 470}]
+            }),
+            'GUI_CONFIG': getattr(config, 'GUI_CONFIG', {
+                'window_width': 500, 'window_height': 400,
+                'always_on_top': True, 'resizable': False
+            }),
+            'PROCESSING_CONFIG': getattr(config, 'PROCESSING_CONFIG', {
+                'overwrite_original': True,
+                'backup_before_save': False,
+                'backup_suffix': '_backup',
+                'auto_normalize': True,
+                'normalize_mode': 'vector',
+                'normalize_raster_fallback': True,
+                'rasterize_final': True,
+                'fused_raster': True,
+                'raster_workers': 0,
+                'raster_encoding': 'adaptive',
+                'raster_jpeg_quality': 85,
+                'raster_reduce_dpi': False,
+                'save_profile': 'compact'
+            }),
+            'BLANK_DETECTION': {
+                'enabled': True,
+                'threshold': 0.99,
+                'edge_margin': 20,
+                'max_pages': 10
+            },
+            'DEBUG_MODE': getattr(config, 'DEBUG_MODE', False)
+        }
+    except ImportError:
+        pass
+    
+    # 3. 기본값 사용
+    return {
+        'PAGE_WIDTH': 842,
+        'PAGE_HEIGHT': 595,
+        'THUMBNAIL_CONFIG': {
+            'max_width': 160, 'max_height': 250,
+            'positions': [{'x': 70, 'y': 180}, {'x': 490, 'y': 180}],
+            'white_background': True,  # 흰색 배경 기본값
+            'background_padding': 5,    # 배경 여백 기본값
+            'proxy_images': True,       # 고해상도 사진을 썸네일 크기에 맞게 축소
+            'proxy_dpi': 300,
+            'render_dpi': 150           # 래스터 썸네일 해상도
+        },
+        'QR_CONFIG': {
+            'max_width': 50, 'max_height': 50,
+            'positions': [{'x': 230, 'y': 470}, {'x': 650, 'y': 470}],
+            'vector': True,             # QR을 벡터 사각형으로 다시 그림
+            'generate': False,          # QR 이미지가 없으면 의뢰서 파일명/주문 목록으로 생성
+            'payload_pattern': r'(\d{6,})',
+            'payload_template': '{0}',
+            'manifest': '',
+            'manifest_key': 'file',
+            'manifest_field': 'qr',
+            'error': 'M'
+        },
+        'GUI_CONFIG': {
+            'window_width': 500, 'window_height': 400,
+            'always_on_top': True, 'resizable': False
+        },
+        'PROCESSING_CONFIG': {
+            'overwrite_original': True,
+            'backup_before_save': False,
+            'backup_suffix': '_backup',
+            'auto_normalize': True,
+            'normalize_mode': 'vector',
+            'normalize_raster_fallback': True,
+            'rasterize_final': True,
+            'fused_raster': True,
+            'raster_workers': 0,
+            'raster_encoding': 'adaptive',
+            'raster_jpeg_quality': 85,
+            'raster_reduce_dpi': False,
+            'save_profile': 'compact'
+        },
+        'BLANK_DETECTION': {
+            'enabled': True,
+            'threshold': 0.99,
+            'edge_margin': 20,
+            'max_pages': 10
+        },
+        'DEBUG_MODE': False
+    }
+
+# 전역 설정 변수
+settings = load_settings()
+PAGE_WIDTH = settings['PAGE_WIDTH']
+PAGE_HEIGHT = settings['PAGE_HEIGHT']
+THUMBNAIL_CONFIG = settings['THUMBNAIL_CONFIG']
+QR_CONFIG = settings['QR_CONFIG']
+GUI_CONFIG = settings['GUI_CONFIG']
+PROCESSING_CONFIG = settings['PROCESSING_CONFIG']
+BLANK_DETECTION = settings['BLANK_DETECTION']
+DEBUG_MODE = settings['DEBUG_MODE']
+
+def reload_settings():
+    """설정 다시 로드 (GUI 설정 창, 상주 작업자에서 사용)"""
+    global settings, PAGE_WIDTH, PAGE_HEIGHT, THUMBNAIL_CONFIG, QR_CONFIG, DEBUG_MODE, PROCESSING_CONFIG, BLANK_DETECTION
+    settings = load_settings()
+    PAGE_WIDTH = settings['PAGE_WIDTH']
+    PAGE_HEIGHT = settings['PAGE_HEIGHT']
+    THUMBNAIL_CONFIG = settings['THUMBNAIL_CONFIG']
+    QR_CONFIG = settings['QR_CONFIG']
+    PROCESSING_CONFIG = settings['PROCESSING_CONFIG']
+    BLANK_DETECTION = settings['BLANK_DETECTION']
+    DEBUG_MODE = settings['DEBUG_MODE']
+    
+    if DEBUG_MODE:
+        print("설정이 다시 로드되었습니다.")
+
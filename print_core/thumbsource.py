@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""
+썸네일 원본 선택
+페이지 구조를 보고 썸네일을 만들 수 있는 가장 싼 원본을 고름 (렌더링은 마지막 수단)
+
+- thumb  : 페이지의 /Thumb 이미지가 필요한 크기 이상이면 그대로 디코딩
+- jpeg   : 페이지가 JPEG 한 장으로만 이루어져 있으면 PIL draft로 축소 디코딩
+           (크기가 충분히 작으면 JPEG 바이트를 다시 압축하지 않고 그대로 사용)
+- image  : 페이지가 다른 형식의 이미지 한 장뿐이면 그 이미지만 디코딩
+- render : 그 외 (글자/도형이 있거나, 회전, 마스크, CMYK, Decode 배열 등)
+           필요한 크기에 맞춘 배율로 clip 영역만, 회색조면 Gray 색공간으로 바로 렌더링
+
+이미지 한 장짜리 페이지는 렌더링 결과와 같도록 다음을 모두 만족할 때만 사용
+- 회전 0, 주석 없음, 그려지는 것이 이미지 하나뿐이고 페이지를 거의 다 덮음
+- 기울어지거나 뒤집히지 않은 배치, 투명 마스크 없음, Gray/RGB 8비트, Decode 배열 없음
+"""
+
+import io
+
+import fitz  # PyMuPDF
+
+from . import settings as cfg
+from .pixbridge import pixmap_to_image
+
+SOURCE_THUMB = 'thumb'
+SOURCE_JPEG = 'jpeg'
+SOURCE_IMAGE = 'image'
+SOURCE_RENDER = 'render'
+
+DEFAULT_DPI = 150        # 썸네일 렌더링 해상도 (THUMBNAIL_CONFIG['render_dpi'])
+COVER_TOLERANCE = 2.0    # 이미지가 페이지를 덮는다고 볼 오차 (pt)
+PASSTHROUGH_LIMIT = 2.0  # JPEG을 그대로 쓸 수 있는 최대 크기 (필요한 크기의 배수)
+REDUCE_SLACK = 1.5       # 필요한 크기의 이 배수까지는 줄이지 않음
+
+_GRAY_RGB = {'DeviceGray': 'L', 'DeviceRGB': 'RGB', 'ICCBased': None}
+
+
+def _image_mode(doc, xref, cs_name):
+    """PIL로 바로 디코딩할 수 있는 이미지면 모드('L'/'RGB'), 아니면 None"""
+    if cs_name not in _GRAY_RGB:
+        return None
+    if doc.xref_get_key(xref, 'Decode')[0] != 'null':
+        return None
+    if cs_name == 'ICCBased':
+        # 프로파일 성분 수로 Gray/RGB 구분 (CMYK, Lab 등은 렌더링)
+        cs = doc.xref_get_key(xref, 'ColorSpace')
+        n = None
+        if cs[0] == 'array' and 'R' in cs[1]:
+            profile = int(cs[1].strip('[]').split()[1])
+            n = doc.xref_get_key(profile, 'N')[1]
+        elif cs[0] == 'xref':
+            array = doc.xref_object(int(cs[1].split()[0]))
+            if '/ICCBased' in array:
+                profile = int(array.strip('[] \n').split()[1])
+                n = doc.xref_get_key(profile, 'N')[1]
+        return {'1': 'L', '3': 'RGB'}.get(n)
+    return _GRAY_RGB[cs_name]
+
+
+def _full_size(page, target_size, clip):
+    """clip 영역에 필요한 크기 → 페이지 전체 기준 픽셀 크기"""
+    if clip is None:
+        return target_size
+    return (target_size[0] * page.rect.width / clip.width,
+            target_size[1] * page.rect.height / clip.height)
+
+
+def _thumb_source(page, full_size):
+    """/Thumb 항목이 있고 필요한 크기 이상이면 원본 정보"""
+    if page.rotation:
+        return None
+    doc = page.parent
+    kind, value = doc.xref_get_key(page.xref, 'Thumb')
+    if kind != 'xref':
+        return None
+    xref = int(value.split()[0])
+    width = int(doc.xref_get_key(xref, 'Width')[1] or 0)
+    height = int(doc.xref_get_key(xref, 'Height')[1] or 0)
+    if width < full_size[0] or height < full_size[1]:
+        return None
+    if doc.xref_get_key(xref, 'BitsPerComponent')[1] != '8':
+        return None
+    mode = {'/DeviceGray': 'L', '/DeviceRGB': 'RGB'}.get(doc.xref_get_key(xref, 'ColorSpace')[1])
+    if mode is None or doc.xref_get_key(xref, 'Decode')[0] != 'null':
+        return None
+    filt = doc.xref_get_key(xref, 'Filter')[1]
+    return {'kind': SOURCE_THUMB, 'xref': xref, 'size': (width, height), 'mode': mode,
+            'jpeg': filt == '/DCTDecode', 'bbox': fitz.Rect(page.rect)}
+
+
+def _single_image_source(page):
+    """페이지가 이미지 한 장으로만 그려지면 원본 정보"""
+    if page.rotation or page.first_annot:
+        return None
+    log = page.get_bboxlog()
+    if len(log) != 1 or log[0][0] != 'fill-image':
+        return None
+    images = page.get_images(full=True)
+    if len(images) != 1:
+        return None
+    xref, smask, width, height, bpc, cs_name, alt, name, filt, referencer = images[0]
+    if smask or bpc != 8:
+        return None
+
+    info = page.get_image_info()
+    if len(info) != 1:
+        return None
+    a, b, c, d = info[0]['transform'][:4]
+    if abs(b) > 1e-3 or abs(c) > 1e-3 or a <= 0 or d <= 0:
+        return None
+    bbox = fitz.Rect(info[0]['bbox'])
+    rect = page.rect
+    if any(abs(u - v) > COVER_TOLERANCE for u, v in zip(bbox, rect)):
+        return None
+
+    mode = _image_mode(page.parent, xref, cs_name)
+    if mode is None:
+        return None
+    kind = SOURCE_JPEG if filt == 'DCTDecode' else SOURCE_IMAGE
+    return {'kind': kind, 'xref': xref, 'size': (width, height), 'mode': mode,
+            'jpeg': kind == SOURCE_JPEG, 'bbox': bbox}
+
+
+def select_source(page, target_size, clip=None):
+    """썸네일 원본 선택
+
+    target_size: 필요한 픽셀 크기 (너비, 높이), clip이 있으면 잘라낸 영역 기준
+    반환값: {'kind', 'xref', 'size', 'mode', 'jpeg', 'bbox'} (렌더링이면 kind만)
+    """
+    try:
+        source = (_thumb_source(page, _full_size(page, target_size, clip))
+                  or _single_image_source(page))
+    except Exception as e:
+        if cfg.DEBUG_MODE:
+            print(f"    - 썸네일 원본 확인 실패, 렌더링 사용: {e}")
+        source = None
+    return source or {'kind': SOURCE_RENDER}
+
+
+def _crop_box(source, clip, image_size):
+    """페이지 좌표 clip → 이미지 픽셀 좌표"""
+    bbox = source['bbox']
+    sx = image_size[0] / bbox.width
+    sy = image_size[1] / bbox.height
+    return (max(0, round((clip.x0 - bbox.x0) * sx)), max(0, round((clip.y0 - bbox.y0) * sy)),
+            min(image_size[0], round((clip.x1 - bbox.x0) * sx)),
+            min(image_size[1], round((clip.y1 - bbox.y0) * sy)))
+
+
+def _decode(page, source, target_size, clip, mode='RGB'):
+    """이미지 원본 디코딩 (JPEG은 필요한 크기 이상에서 가장 작은 배율로, 회색조면 디코딩할 때 변환)"""
+    from PIL import Image
+
+    doc = page.parent
+    xref = source['xref']
+    if source['jpeg']:
+        img = Image.open(io.BytesIO(doc.xref_stream_raw(xref)))
+        if img.mode != source['mode']:
+            return None
+        # draft는 잘라낼 영역까지 고려해 전체 이미지 기준 크기로 요청
+        full_w, full_h = _full_size(page, target_size, clip)
+        img.draft(mode if mode == 'L' else source['mode'], (int(full_w), int(full_h)))
+        img.load()
+    elif source['kind'] == SOURCE_IMAGE:
+        img = pixmap_to_image(fitz.Pixmap(doc, xref))
+    else:
+        width, height = source['size']
+        img = Image.frombytes(source['mode'], (width, height), doc.xref_stream(xref))
+
+    if clip is not None:
+        img = img.crop(_crop_box(source, clip, img.size))
+    return img
+
+
+def fit_target(area, box, dpi):
+    """area(pt)를 box(pt) 안에 비율을 유지해 넣었을 때 dpi 기준 픽셀 크기"""
+    ratio = min(box[0] / area.width, box[1] / area.height) * dpi / 72
+    return (max(1, round(area.width * ratio)), max(1, round(area.height * ratio)))
+
+
+def render_thumbnail(page, target_size, clip=None, gray=False):
+    """필요한 크기에 맞는 배율로 clip 영역만 렌더링 (회색조면 처음부터 Gray 버퍼)"""
+    area = clip or page.rect
+    zoom = min(target_size[0] / area.width, target_size[1] / area.height)
+    colorspace = fitz.csGRAY if gray else fitz.csRGB
+    return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip,
+                           colorspace=colorspace, alpha=False)
+
+
+def make_thumbnail(page, target_size, clip=None, gray=False, source=None):
+    """썸네일 PIL 이미지와 사용한 원본 종류
+
+    target_size: 필요한 픽셀 크기 (너비, 높이)
+                 렌더링은 정확히 이 크기에 맞는 배율로, 디코딩한 원본은
+                 REDUCE_SLACK배보다 클 때만 이 크기로 줄임 (키우지는 않음)
+    clip: 페이지에서 사용할 영역 (표지 오른쪽 절반 등, 표시 좌표)
+    gray: 회색조 썸네일 ('L' 모드, RGB 버퍼를 만들지 않음)
+    """
+    from PIL import Image
+
+    source = source or select_source(page, target_size, clip)
+    mode = 'L' if gray else 'RGB'
+    img = None
+    if source['kind'] != SOURCE_RENDER:
+        try:
+            img = _decode(page, source, target_size, clip, mode)
+        except Exception as e:
+            if cfg.DEBUG_MODE:
+                print(f"    - {source['kind']} 디코딩 실패, 렌더링 사용: {e}")
+            img = None
+    if img is None:
+        return pixmap_to_image(render_thumbnail(page, target_size, clip, gray)), SOURCE_RENDER
+
+    if img.mode != mode:
+        img = img.convert(mode)
+    # 필요한 크기보다 조금 큰 정도면 그대로 둠 (삽입할 때 어차피 배율이 적용되고, 1:1에 가까운 LANCZOS는 비쌈)
+    if img.width > target_size[0] * REDUCE_SLACK or img.height > target_size[1] * REDUCE_SLACK:
+        img.thumbnail((int(target_size[0]), int(target_size[1])), Image.Resampling.LANCZOS,
+                      reducing_gap=2.0)
+    return img, source['kind']
+
+
+def jpeg_passthrough(page, source, target_size):
+    """원본 JPEG을 다시 압축하지 않고 그대로 쓸 수 있으면 그 바이트 (아니면 None)
+
+    필요한 크기의 PASSTHROUGH_LIMIT배 이하인 RGB/Gray JPEG만 사용
+    잘라내기나 효과를 적용할 때는 디코딩이 필요하므로 호출하는 쪽에서 제외
+    """
+    if not source.get('jpeg'):
+        return None
+    width, height = source['size']
+    if width > target_size[0] * PASSTHROUGH_LIMIT or height > target_size[1] * PASSTHROUGH_LIMIT:
+        return None
+    return page.parent.xref_stream_raw(source['xref'])
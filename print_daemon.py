@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+인쇄 자동화 상주 작업자 (데몬)
+한 번 실행해 두면 F3 작업마다 파이썬/PyMuPDF 초기화 비용을 다시 내지 않도록
+작업을 로컬 소켓(Windows는 명명된 파이프)으로 받아 처리
+
+사용법:
+  python print_daemon.py --serve          # 작업자 시작
+  python print_daemon.py --status         # 작업자 상태 확인
+  python print_daemon.py --stop           # 작업자 종료
+  python print_daemon.py [파일들...]      # 작업 전달 (작업자가 없으면 직접 처리)
+  python print_daemon.py --save-profile fast [파일들...]  # 저장 방식을 지정해 작업 전달
+"""
+
+import os
+import sys
+import time
+
+# 통신 주소: POSIX는 사용자 전용 폴더(0700)의 유닉스 소켓, Windows는 사용자별 명명된 파이프
+# PRINT_DAEMON_PORT 환경 변수를 지정하면 127.0.0.1 TCP 포트 사용
+DAEMON_PORT = os.environ.get('PRINT_DAEMON_PORT')
+DAEMON_PIPE = r'\\.\pipe\print_automation_{user}'
+SOCKET_NAME = 'daemon.sock'
+# 연결 인증 키: 작업자를 시작할 때마다 새로 만들어 사용자만 읽을 수 있는 파일에 저장
+# (메시지는 pickle이므로 키를 모르는 프로세스는 인증 단계에서 끊어야 함)
+KEY_FILE = 'daemon.key'
+KEY_BYTES = 32
+
+
+def runtime_dir():
+    """작업자 키/소켓을 두는 사용자 전용 폴더 (없으면 만들고, 다른 사용자가 접근할 수 있으면 오류)"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        folder = os.path.join(base, 'print_automation')
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    base = os.environ.get('XDG_RUNTIME_DIR') or os.path.expanduser('~')
+    folder = os.path.join(base, '.print_automation')
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    info = os.stat(folder)
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"작업자 폴더의 소유자가 다릅니다: {folder}")
+    if info.st_mode & 0o077:
+        os.chmod(folder, 0o700)
+    return folder
+
+
+def get_address():
+    """플랫폼별 작업자 주소 반환"""
+    if DAEMON_PORT:
+        return ('127.0.0.1', int(DAEMON_PORT))
+    if sys.platform == 'win32':
+        import getpass
+        user = ''.join(c if c.isalnum() else '_' for c in getpass.getuser())
+        return DAEMON_PIPE.format(user=user)
+    return os.path.join(runtime_dir(), SOCKET_NAME)
+
+
+def create_key():
+    """새 인증 키를 만들어 사용자만 읽을 수 있는 파일에 저장"""
+    import secrets
+    key = secrets.token_bytes(KEY_BYTES)
+    path = os.path.join(runtime_dir(), KEY_FILE)
+    temp = path + '.tmp'
+    if os.path.exists(temp):
+        os.remove(temp)
+    fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    os.replace(temp, path)
+    return key
+
+
+def read_key():
+    """작업자가 저장한 인증 키 (작업자를 시작한 적이 없으면 None)"""
+    try:
+        with open(os.path.join(runtime_dir(), KEY_FILE), 'rb') as f:
+            key = f.read()
+    except OSError:
+        return None
+    return key if len(key) == KEY_BYTES else None
+
+
+def remove_key(key):
+    """작업자를 끝낼 때 키 파일 삭제 (그사이 다른 작업자가 새 키를 저장했으면 그대로 둠)"""
+    if read_key() != key:
+        return
+    try:
+        os.remove(os.path.join(runtime_dir(), KEY_FILE))
+    except OSError:
+        pass
+
+
+def _connect(address=None):
+    """작업자에 연결 (실행 중이 아니거나 인증에 실패하면 None)"""
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Client
+    key = read_key()
+    if key is None:
+        return None
+    try:
+        return Client(address or get_address(), authkey=key)
+    except (OSError, AuthenticationError):
+        return None
+
+
+def submit(files, out=None, address=None, save_profile=None):
+    """파일 목록을 작업자에게 넘기고 출력을 그대로 전달받음
+
+    save_profile: 이번 작업의 저장 방식 (None이면 설정값)
+
+    반환값: 처리 성공 여부 (작업자가 실행 중이 아니면 None)
+    """
+    out = out or sys.stdout
+    conn = _connect(address)
+    if conn is None:
+        return None
+
+    with conn:
+        conn.send({
+            'cmd': 'process',
+            'files': [os.path.abspath(f) for f in files],
+            'cwd': os.getcwd(),
+            'save_profile': save_profile
+        })
+
+        while True:
+            try:
+                kind, payload = conn.recv()
+            except (EOFError, OSError):
+                print("오류: 작업자와의 연결이 끊어졌습니다.")
+                return False
+
+            if kind == 'out':
+                out.write(payload)
+                out.flush()
+            elif kind == 'done':
+                return bool(payload)
+
+
+def send_command(cmd, address=None):
+    """작업자에 단순 명령(ping/stop) 전송"""
+    conn = _connect(address)
+    if conn is None:
+        return None
+
+    with conn:
+        conn.send({'cmd': cmd})
+        try:
+            kind, payload = conn.recv()
+        except (EOFError, OSError):
+            return None
+        return payload
+
+
+class _ConnectionWriter:
+    """작업 중 print 출력을 클라이언트로 흘려보내는 stdout 대체 객체"""
+
+    def __init__(self, conn, echo=None):
+        self.conn = conn
+        self.echo = echo
+        self.connected = True
+
+    def write(self, text):
+        if self.echo:
+            self.echo.write(text)
+        if self.connected and text:
+            try:
+                self.conn.send(('out', text))
+            except (OSError, EOFError):
+                # 클라이언트가 먼저 종료되어도 작업은 끝까지 진행
+                self.connected = False
+        return len(text)
+
+    def flush(self):
+        if self.echo:
+            self.echo.flush()
+
+
+class PrintDaemon:
+    """무거운 모듈을 한 번만 로드해 두고 작업을 순서대로 처리하는 작업자"""
+
+    def __init__(self, module=None):
+        # module: PrintProcessor와 reload_settings를 제공하는 모듈 (기본: print_core)
+        if module is None:
+            import print_core as module
+        self.module = module
+        self.preload()
+        self.settings_mtimes = {}
+        self.job_count = 0
+        self.started_at = time.time()
+
+    def preload(self):
+        """첫 작업도 빠르도록 처리 엔진과 이미지 모듈을 미리 로드"""
+        self.module.PrintProcessor
+        try:
+            import PIL.Image  # noqa: F401
+        except ImportError:
+            pass
+
+    def refresh_settings(self):
+        """settings.json이 바뀐 경우에만 설정 다시 로드"""
+        settings_path = os.path.abspath("settings.json")
+        try:
+            mtime = os.path.getmtime(settings_path)
+        except OSError:
+            mtime = None
+
+        if self.settings_mtimes.get(settings_path, 'unknown') != mtime:
+            self.module.reload_settings()
+            self.settings_mtimes[settings_path] = mtime
+
+    def run_job(self, conn, request):
+        """작업 1건 처리 (출력은 클라이언트로 전달)"""
+        writer = _ConnectionWriter(conn, echo=sys.__stdout__)
+        old_stdout, old_stderr = sys.stdout, sys.stderr
+        old_cwd = os.getcwd()
+        success = False
+
+        try:
+            sys.stdout = sys.stderr = writer
+            if request.get('cwd') and os.path.isdir(request['cwd']):
+                os.chdir(request['cwd'])
+
+            self.refresh_settings()
+
+            files = [f for f in request.get('files', []) if os.path.exists(f)]
+            if not files:
+                print("오류: 처리할 파일이 없습니다.")
+            else:
+                processor = self.module.PrintProcessor()
+                processor.save_profile = request.get('save_profile')
+                success = processor.process_files_cli(files)
+        except Exception as e:
+            print(f"작업자 처리 중 오류: {e}")
+        finally:
+            sys.stdout, sys.stderr = old_stdout, old_stderr
+            os.chdir(old_cwd)
+
+        self.job_count += 1
+        try:
+            conn.send(('done', success))
+        except (OSError, EOFError):
+            pass
+
+    def serve(self, address=None):
+        """연결을 받아 작업을 순서대로 처리"""
+        from multiprocessing.connection import Listener
+        from multiprocessing import AuthenticationError
+
+        address = address or get_address()
+        if isinstance(address, str) and sys.platform != 'win32' and os.path.exists(address):
+            # 이전 작업자가 강제 종료되어 남은 소켓 파일
+            os.remove(address)
+        key = create_key()
+        try:
+            listener = Listener(address, authkey=key)
+        except BaseException:
+            remove_key(key)
+            raise
+        print(f"인쇄 자동화 작업자 대기 중: {address}")
+        print("종료하려면 Ctrl+C 또는 'python print_daemon.py --stop'")
+
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    continue
+
+                with conn:
+                    try:
+                        request = conn.recv()
+                    except (OSError, EOFError):
+                        continue
+
+                    cmd = request.get('cmd') if isinstance(request, dict) else None
+                    if cmd == 'process':
+                        self.run_job(conn, request)
+                    elif cmd == 'ping':
+                        conn.send(('done', {
+                            'pid': os.getpid(),
+                            'jobs': self.job_count,
+                            'uptime': time.time() - self.started_at
+                        }))
+                    elif cmd == 'stop':
+                        conn.send(('done', True))
+                        print("작업자를 종료합니다.")
+                        break
+        except KeyboardInterrupt:
+            print("\n작업자를 종료합니다.")
+        finally:
+            # 끝난 작업자의 키/소켓이 남으면 클라이언트가 없는 작업자에 연결을 시도함
+            listener.close()
+            remove_key(key)
+            if isinstance(address, str) and sys.platform != 'win32':
+                try:
+                    os.remove(address)
+                except OSError:
+                    pass
+
+
+def serve(module=None, address=None):
+    """작업자 실행 (print_automation --daemon에서도 호출)"""
+    PrintDaemon(module).serve(address)
+
+
+def main():
+    args = sys.argv[1:]
+
+    if "--serve" in args:
+        from print_core.cli import check_dependencies
+        if not check_dependencies():
+            sys.exit(1)
+        serve()
+        return
+
+    if "--stop" in args:
+        result = send_command('stop')
+        print("작업자를 종료했습니다." if result else "실행 중인 작업자가 없습니다.")
+        return
+
+    if "--status" in args:
+        info = send_command('ping')
+        if info:
+            print(f"작업자 실행 중 (PID {info['pid']}, 처리 {info['jobs']}건, "
+                  f"가동 {info['uptime']:.0f}초)")
+        else:
+            print("실행 중인 작업자가 없습니다.")
+        return
+
+    if not any(os.path.exists(arg) for arg in args):
+        print(__doc__)
+        sys.exit(1)
+
+    # 작업자가 없으면 기존 방식대로 직접 처리
+    from print_core.cli import main as cli_main
+    sys.exit(cli_main(args))
+
+
+if __name__ == "__main__":
+    main()
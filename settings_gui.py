@@ -6,6 +6,8 @@ import json
 import os
 from pathlib import Path
 
+from print_core.pixbridge import pixmap_to_image
+
 class SettingsGUI:
     def __init__(self, parent=None):
         self.parent = parent
@@ -209,11 +211,9 @@ class SettingsGUI:
                 # 이미지 생성
                 mat = fitz.Matrix(scale, scale)
                 pix = page.get_pixmap(matrix=mat, alpha=False)
-                img_data = pix.pil_tobytes(format="PNG")
                 
-                # PIL Image로 변환
-                from io import BytesIO
-                img = Image.open(BytesIO(img_data))
+                # PIL Image로 변환 (PNG 인코딩 없이 픽셀 버퍼 사용)
+                img = pixmap_to_image(pix)
                 
                 # 회전이 필요한 경우
                 if page.rect.width < page.rect.height and page.rotation in [90, 270]:
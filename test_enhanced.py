@@ -45,7 +45,9 @@ def test_files():
         ('enhanced_print_processor.py', '향상된 처리 엔진'),
         ('print_automation_enhanced.py', '통합 GUI'),
         ('print_automation.py', '기본 프로그램'),
-        ('settings_gui.py', '기본 설정 GUI')
+        ('settings_gui.py', '기본 설정 GUI'),
+        ('print_core/__init__.py', 'GUI 없는 핵심 모듈'),
+        ('print_daemon.py', '상주 작업자')
     ]
     
     all_ok = True
@@ -125,12 +127,167 @@ def test_processor():
             else:
                 print(f"✗ {method:30} - 미구현")
         
+        stats = processor.get_performance_stats()
+        print(f"✓ 백지 감지 캐시: {stats['cache_size']}개 항목, "
+              f"{stats['cache_memory_mb']:.2f}/{stats['cache_limit_mb']:.0f}MB")
+        
         return True
         
     except Exception as e:
         print(f"✗ 처리 엔진 테스트 실패: {e}")
         return False
 
+def test_core():
+    """GUI 없는 핵심 모듈 테스트"""
+    print("\n" + "=" * 60)
+    print("핵심 모듈 (print_core) 테스트")
+    print("=" * 60)
+    
+    try:
+        import print_core
+        from print_core import PrintProcessor, load_settings
+        print("✓ print_core 임포트 성공")
+        
+        settings = load_settings()
+        for key in ('THUMBNAIL_CONFIG', 'QR_CONFIG', 'PROCESSING_CONFIG', 'BLANK_DETECTION'):
+            if key in settings:
+                print(f"✓ {key:30} - 로드됨")
+            else:
+                print(f"✗ {key:30} - 없음")
+        
+        # CLI 경로는 GUI 모듈을 불러오지 않아야 함
+        if 'tkinter' in sys.modules and 'print_automation' not in sys.modules:
+            print("✗ print_core가 tkinter를 로드합니다")
+            return False
+        print("✓ GUI 모듈 의존성 없음")
+        
+        # NumPy 등 무거운 모듈은 처음 사용할 때 불러옴 (새 인터프리터에서 print_core.processor만 import)
+        from print_core import importtime
+        entries = importtime.collect_import_times()
+        deferred = importtime.loaded_modules(entries, importtime.DEFERRED_MODULES)
+        if not entries or deferred:
+            print(f"✗ print_core.processor import 시 로드됨: {', '.join(deferred[:3]) or '측정 실패'}")
+            return False
+        print(f"✓ 시작 시 {', '.join(importtime.DEFERRED_MODULES)} 로드하지 않음")
+        
+        from print_core import normalize
+        mode = normalize.get_normalize_mode()
+        print(f"✓ 정규화 방식: {mode} (가능: {', '.join(normalize.NORMALIZE_MODES)})")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 핵심 모듈 테스트 실패: {e}")
+        return False
+
+def test_raster():
+    """래스터 페이지 분류 테스트"""
+    print("\n" + "=" * 60)
+    print("래스터 분류 테스트")
+    print("=" * 60)
+    
+    try:
+        import fitz
+        from print_core import raster
+        from print_core.pixbridge import pixmap_to_array
+        
+        doc = fitz.open()
+        page = doc.new_page()
+        for i in range(30):
+            page.insert_text((60, 100 + i * 20), "print automation order form " * 2, fontsize=9)
+        pix = page.get_pixmap(dpi=200)
+        kind, _ = raster.classify(pixmap_to_array(pix))
+        if kind != raster.KIND_BILEVEL:
+            print(f"✗ 글자만 있는 페이지: {kind}")
+            return False
+        print("✓ 글자만 있는 페이지 - 흑백(1비트)")
+        
+        # 연한 음영(밝기 약 234)은 면적이 작아도 흑백으로 바꾸면 사라짐
+        page.draw_rect(fitz.Rect(60, 700, 300, 710), color=None, fill=(0.92, 0.92, 0.92))
+        pix = page.get_pixmap(dpi=200)
+        kind, _ = raster.classify(pixmap_to_array(pix))
+        if kind == raster.KIND_BILEVEL:
+            print("✗ 연한 음영이 흑백(1비트)으로 분류됨")
+            return False
+        print(f"✓ 연한 음영 페이지 - {raster.KIND_NAMES[kind]}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 래스터 분류 테스트 실패: {e}")
+        return False
+
+def test_rotated_overlay():
+    """정규화하지 않는 회전 페이지의 썸네일/QR 위치 테스트 (합성 경로 켬/끔)"""
+    print("\n" + "=" * 60)
+    print("회전 페이지 오버레이 테스트")
+    print("=" * 60)
+    
+    import tempfile
+    
+    try:
+        import fitz
+        import print_core.settings as cfg
+        from print_core import PrintProcessor
+        
+        saved = {key: cfg.PROCESSING_CONFIG.get(key)
+                 for key in ('auto_normalize', 'fused_raster', 'rasterize_final', 'overwrite_original')}
+        try:
+            with tempfile.TemporaryDirectory() as folder:
+                # 가로형 용지를 90/270도 회전해 세로로 보이는 페이지 (항목은 회전 전 좌표)
+                order_path = os.path.join(folder, "회전_의뢰서.pdf")
+                order = fitz.open()
+                for rotation in (90, 270):
+                    page = order.new_page(width=842, height=595)
+                    page.insert_text((40, 60), f"rotate {rotation}", fontsize=20)
+                    page.set_rotation(rotation)
+                order.save(order_path)
+                order.close()
+                
+                art_path = os.path.join(folder, "artwork.pdf")
+                art = fitz.open()
+                art_page = art.new_page(width=160, height=250)
+                art_page.draw_rect(art_page.rect, color=None, fill=(0, 0, 0))
+                art.save(art_path)
+                art.close()
+                
+                qr_path = os.path.join(folder, "qr.png")
+                qr = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 50, 50), False)
+                qr.clear_with(0)
+                qr.save(qr_path)
+                
+                # 썸네일/QR 칸의 가운데 (회전 전 좌표)
+                centers = [(pos['x'] + cfg.THUMBNAIL_CONFIG['max_width'] / 2,
+                            pos['y'] + cfg.THUMBNAIL_CONFIG['max_height'] / 2)
+                           for pos in cfg.THUMBNAIL_CONFIG['positions']]
+                centers += [(pos['x'] + cfg.QR_CONFIG['max_width'] / 2, pos['y'] + cfg.QR_CONFIG['max_height'] / 2)
+                            for pos in cfg.QR_CONFIG['positions']]
+                
+                cfg.PROCESSING_CONFIG.update(auto_normalize=False, rasterize_final=True, overwrite_original=False)
+                for fused in (True, False):
+                    cfg.PROCESSING_CONFIG['fused_raster'] = fused
+                    PrintProcessor().process_files_cli([order_path, art_path, qr_path])
+                    label = "합성 경로" if fused else "기존 경로"
+                    with fitz.open(order_path) as src, \
+                            fitz.open(os.path.join(folder, "회전_의뢰서_processed.pdf")) as result:
+                        for page_num, page in enumerate(result):
+                            pix = page.get_pixmap(dpi=72)
+                            for center in centers:
+                                point = fitz.Point(center) * src[page_num].rotation_matrix
+                                if pix.pixel(int(point.x), int(point.y))[0] > 128:
+                                    print(f"✗ {label} 페이지 {page_num + 1}: {center} 위치에 항목 없음")
+                                    return False
+                    print(f"✓ {label} - 회전 페이지 {len(centers)}개 항목 모두 표시")
+            
+        finally:
+            cfg.PROCESSING_CONFIG.update(saved)
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 회전 페이지 오버레이 테스트 실패: {e}")
+        return False
+
 def test_integration():
     """통합 테스트"""
     print("\n" + "=" * 60)
@@ -183,6 +340,9 @@ def main():
     results.append(("파일 존재", test_files()))
     results.append(("향상된 설정", test_enhanced_settings()))
     results.append(("처리 엔진", test_processor()))
+    results.append(("핵심 모듈", test_core()))
+    results.append(("래스터 분류", test_raster()))
+    results.append(("회전 페이지 오버레이", test_rotated_overlay()))
     results.append(("통합", test_integration()))
     
     # 결과 요약